@@ -0,0 +1,108 @@
+"""add shape fingerprint to chords
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+import re
+from collections.abc import Iterable, Mapping, Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: str | None = "a7b8c9d0e1f2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Frozen copy of music.chords as of this revision, so later changes to the app's
+# fingerprint do not change what this migration backfills.
+_NOTE_CLASSES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+_ACCIDENTALS = {"": 0, "#": 1, "b": -1}
+_TUNING_NOTE = re.compile(r"([A-G])([#b]?)")
+_LOWEST_STRING_FLOOR = 36
+
+
+def _parse_tuning(tuning: str) -> list[int]:
+    pitches: list[int] = []
+    for match in _TUNING_NOTE.finditer(tuning):
+        letter, accidental = match.groups()
+        pitch_class = (_NOTE_CLASSES[letter] + _ACCIDENTALS[accidental]) % 12
+        floor = pitches[-1] + 1 if pitches else _LOWEST_STRING_FLOOR
+        pitches.append(floor + (pitch_class - floor) % 12)
+    return pitches
+
+
+def _shape_fingerprint(
+    markers: Iterable[Mapping], tuning: str, string_count: int
+) -> tuple[str, int] | None:
+    open_strings = _parse_tuning(tuning)[:string_count]
+    frets: list[int | None] = [None] * len(open_strings)
+    for marker in markers:
+        index = string_count - 1 - marker["string"]
+        if 0 <= index < len(frets) and marker["fret"] >= 0:
+            frets[index] = max(frets[index] or 0, marker["fret"])
+    sounded = [fret for fret in frets if fret is not None]
+    if not sounded:
+        return None
+    offset = min(sounded)
+    shape = ".".join("x" if fret is None else str(fret - offset) for fret in frets)
+    return f"{'.'.join(map(str, open_strings))}/{shape}", offset
+
+
+chords = sa.table(
+    "chords",
+    sa.column("id"),
+    sa.column("markers", sa.JSON),
+    sa.column("tuning"),
+    sa.column("string_count"),
+    sa.column("shape_fingerprint"),
+    sa.column("shape_offset"),
+)
+
+
+def upgrade() -> None:
+    op.add_column("chords", sa.Column("shape_fingerprint", sa.Text(), nullable=True))
+    op.add_column("chords", sa.Column("shape_offset", sa.Integer(), nullable=True))
+
+    conn = op.get_bind()
+    update = (
+        chords.update()
+        .where(chords.c.id == sa.bindparam("b_id"))
+        .values(
+            shape_fingerprint=sa.bindparam("b_fingerprint"),
+            shape_offset=sa.bindparam("b_offset"),
+        )
+    )
+    last_id = None
+    while True:
+        stmt = sa.select(
+            chords.c.id, chords.c.markers, chords.c.tuning, chords.c.string_count
+        ).order_by(chords.c.id)
+        if last_id is not None:
+            stmt = stmt.where(chords.c.id > last_id)
+        rows = conn.execute(stmt.limit(BACKFILL_BATCH_SIZE)).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            shape = _shape_fingerprint(row.markers or [], row.tuning, row.string_count)
+            if shape is not None:
+                params.append({"b_id": row.id, "b_fingerprint": shape[0], "b_offset": shape[1]})
+        if params:
+            conn.execute(update, params)
+        last_id = rows[-1].id
+
+    op.create_index("ix_chords_shape", "chords", ["shape_fingerprint", "shape_offset", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chords_shape", "chords")
+    op.drop_column("chords", "shape_offset")
+    op.drop_column("chords", "shape_fingerprint")
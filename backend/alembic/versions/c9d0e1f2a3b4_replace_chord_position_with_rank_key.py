@@ -0,0 +1,97 @@
+"""replace chord position with rank key
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+
+import string
+from collections.abc import Sequence
+from itertools import groupby
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: str | None = "b8c9d0e1f2a3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+chords = sa.table(
+    "chords",
+    sa.column("id"),
+    sa.column("song_id"),
+    sa.column("position", sa.Integer),
+    sa.column("rank_key", sa.String),
+)
+
+# Frozen copy of database.chord_ranks.spread_ranks as of this revision.
+_DIGITS = string.digits + string.ascii_uppercase + string.ascii_lowercase
+_BASE = len(_DIGITS)
+
+
+def _spread_ranks(count: int) -> list[str]:
+    """``count`` evenly spaced, equal-length keys in the lower half of the key space."""
+    width = 1
+    while _BASE**width // 2 // (count + 1) < _BASE:
+        width += 1
+    step = _BASE**width // 2 // (count + 1)
+    keys = []
+    for index in range(1, count + 1):
+        value = index * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, _BASE)
+            digits.append(_DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip(_DIGITS[0]))
+    return keys
+
+
+def upgrade() -> None:
+    op.add_column("chords", sa.Column("rank_key", sa.String(64, collation="C"), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(chords.c.id, chords.c.song_id).order_by(
+            chords.c.song_id, chords.c.position, chords.c.id
+        )
+    ).all()
+    params = []
+    for _, song_rows in groupby(rows, key=lambda row: row.song_id):
+        song_ids = [row.id for row in song_rows]
+        params.extend(
+            {"b_id": chord_id, "b_rank_key": key}
+            for chord_id, key in zip(song_ids, _spread_ranks(len(song_ids)), strict=True)
+        )
+    if params:
+        conn.execute(
+            chords.update()
+            .where(chords.c.id == sa.bindparam("b_id"))
+            .values(rank_key=sa.bindparam("b_rank_key")),
+            params,
+        )
+
+    op.alter_column("chords", "rank_key", nullable=False)
+    op.drop_index("ix_chords_song_id_position", "chords")
+    op.drop_column("chords", "position")
+    op.create_index("ix_chords_song_id_rank_key", "chords", ["song_id", "rank_key"], unique=True)
+
+
+def downgrade() -> None:
+    op.add_column("chords", sa.Column("position", sa.Integer(), nullable=False, server_default="0"))
+    ranked = (
+        sa.select(
+            chords.c.id,
+            (
+                sa.func.row_number().over(partition_by=chords.c.song_id, order_by=chords.c.rank_key)
+                - 1
+            ).label("position"),
+        )
+    ).subquery()
+    op.execute(chords.update().where(chords.c.id == ranked.c.id).values(position=ranked.c.position))
+    op.drop_index("ix_chords_song_id_rank_key", "chords")
+    op.drop_column("chords", "rank_key")
+    op.create_index("ix_chords_song_id_position", "chords", ["song_id", "position", "id"])
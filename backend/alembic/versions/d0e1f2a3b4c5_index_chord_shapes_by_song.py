@@ -0,0 +1,29 @@
+"""index chord shapes by song
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: str | None = "c9d0e1f2a3b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_chords_shape", "chords")
+    op.create_index(
+        "ix_chords_song_shape", "chords", ["song_id", "shape_fingerprint", "shape_offset"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chords_song_shape", "chords")
+    op.create_index("ix_chords_shape", "chords", ["shape_fingerprint", "shape_offset", "id"])
@@ -0,0 +1,31 @@
+"""add project listing indexes
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: str | None = "d4e5f6a7b8c9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_projects_user_id_updated_at", "projects", ["user_id", "updated_at", "id"])
+    op.create_index(
+        "ix_project_collaborators_invitee_id_status",
+        "project_collaborators",
+        ["invitee_id", "status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_project_collaborators_invitee_id_status", "project_collaborators")
+    op.drop_index("ix_projects_user_id_updated_at", "projects")
@@ -0,0 +1,33 @@
+"""add list pagination indexes
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: str | None = "e5f6a7b8c9d0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_songs_project_id_updated_at", "songs", ["project_id", "updated_at", "id"])
+    op.create_index("ix_chords_song_id_position", "chords", ["song_id", "position", "id"])
+    op.create_index(
+        "ix_project_collaborators_project_id_created_at",
+        "project_collaborators",
+        ["project_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_project_collaborators_project_id_created_at", "project_collaborators")
+    op.drop_index("ix_chords_song_id_position", "chords")
+    op.drop_index("ix_songs_project_id_updated_at", "songs")
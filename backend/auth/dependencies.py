@@ -1,17 +1,57 @@
+import os
 import uuid
+from contextvars import ContextVar
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
-from auth.tokens import decode_token
+from auth.tokens import decode_token, get_role_claims
+from cache.ttl_cache import TTLCache
 from database.session import get_db
+from models.collaborator import ProjectRole
 from models.user import User
 
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
 security = HTTPBearer()
 
+# Keyed by the token's `sub`. Each entry is a detached User snapshot (a handful of short
+# columns), so the entry cap bounds the cache's memory footprint.
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS)
+
+# Project role claims of the access token authenticating the current request, if any.
+token_role_claims: ContextVar[tuple[int, dict[str, ProjectRole]] | None] = ContextVar(
+    "token_role_claims", default=None
+)
+
+
+def _snapshot(user: User) -> User:
+    """Copy the loaded columns of ``user`` into a detached instance safe to share."""
+    snapshot = User(
+        id=user.id,
+        email=user.email,
+        password_hash=user.password_hash,
+        membership_version=user.membership_version,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+# Mapper events only see ORM flushes. Core statements such as update(User) bypass them, so
+# every Core write to users must invalidate the cache itself after committing (see
+# auth.project_access.bump_membership_versions and invalidate_role).
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    user_cache.invalidate(str(target.id))
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -45,6 +85,13 @@ async def get_current_user(
             detail="Invalid token",
         )
 
+    token_role_claims.set(get_role_claims(payload))
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        # Attach a per-request copy to this session without emitting a SELECT.
+        return await db.merge(cached, load=False)
+
     result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
     user = result.scalar_one_or_none()
 
@@ -54,4 +101,5 @@ async def get_current_user(
             detail="User not found",
         )
 
+    user_cache.set(user_id, _snapshot(user))
     return user
@@ -1,4 +1,18 @@
+"""bcrypt helpers plus a bounded worker pool that keeps hashing off the event loop."""
+
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
 import bcrypt
+from fastapi import HTTPException, status
+
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
 
 
 def hash_password(password: str) -> str:
@@ -7,3 +21,100 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+
+
+def _timed_call(
+    fn: Callable[..., Any], submitted_at: float, *args: Any
+) -> tuple[Any, float, float]:
+    """Run ``fn`` in a worker and report (result, queue wait, run time) in seconds."""
+    started_at = time.monotonic()
+    result = fn(*args)
+    return result, started_at - submitted_at, time.monotonic() - started_at
+
+
+class PasswordHasherPool:
+    """Runs bcrypt calls on a thread or process pool with a bounded backlog.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more wait for a
+    worker. Calls beyond that are rejected with 503 instead of piling up behind a burst.
+    """
+
+    def __init__(self, kind: str, max_workers: int, max_queue: int) -> None:
+        if kind not in ("thread", "process"):
+            msg = f"Unknown password hash executor: {kind!r}"
+            raise ValueError(msg)
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self._get_executor().submit(_timed_call, fn, time.monotonic(), *args)
+        self.in_flight += 1
+        # The call holds its slot until the worker is done with it, even if the awaiting
+        # request is cancelled first (say, the client disconnects).
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(self._finished, done))
+        result, _, _ = await asyncio.wrap_future(future)
+        return result
+
+    def _finished(self, future: Future) -> None:
+        self.in_flight -= 1
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, wait, run = future.result()
+        self.completed += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        self.total_run_seconds += run
+
+    def stats(self) -> dict[str, int | float | str]:
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.total_wait_seconds / self.completed if self.completed else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+            "avg_run_seconds": self.total_run_seconds / self.completed if self.completed else 0.0,
+        }
+
+
+password_pool = PasswordHasherPool(
+    PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
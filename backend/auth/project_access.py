@@ -1,17 +1,129 @@
 """Reusable project access dependency for role-based permissions."""
 
+import os
 import uuid
 
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import CompoundSelect, Select, and_, literal, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from auth.dependencies import get_current_user
+from auth.dependencies import get_current_user, token_role_claims, user_cache
+from auth.tokens import ACCESS_TOKEN_MAX_PROJECT_CLAIMS
+from cache.ttl_cache import TTLCache
 from database.session import get_db
+from models.chord import Chord
 from models.collaborator import CollaboratorStatus, ProjectCollaborator, ProjectRole
 from models.project import Project
+from models.song import Song
 from models.user import User
 
+ROLE_CACHE_TTL_SECONDS = float(os.getenv("ROLE_CACHE_TTL_SECONDS", "60"))
+ROLE_CACHE_MAX_ENTRIES = int(os.getenv("ROLE_CACHE_MAX_ENTRIES", "50000"))
+
+# (user_id, project_id) -> ProjectRole. Writes that change membership invalidate entries
+# explicitly; the TTL only bounds staleness across worker processes.
+role_cache = TTLCache(maxsize=ROLE_CACHE_MAX_ENTRIES, ttl=ROLE_CACHE_TTL_SECONDS)
+
+
+def invalidate_role(user_id: uuid.UUID, project_id: uuid.UUID) -> None:
+    """Forget the cached role of one user on one project.
+
+    The user's cached row is dropped too so a bumped membership_version is seen at once.
+    """
+    role_cache.invalidate((user_id, project_id))
+    user_cache.invalidate(str(user_id))
+
+
+def invalidate_project_roles(project_id: uuid.UUID, member_ids: list[uuid.UUID]) -> None:
+    """Forget every cached role on a project along with its members' cached rows."""
+    role_cache.invalidate_where(lambda key: key[1] == project_id)
+    for user_id in member_ids:
+        user_cache.invalidate(str(user_id))
+
+
+async def bump_membership_versions(db: AsyncSession, user_ids: list[uuid.UUID]) -> None:
+    """Revoke the role claims in tokens already minted for these users.
+
+    Runs inside the caller's transaction; follow the commit with invalidate_role or
+    invalidate_project_roles so cached users pick up the new version.
+    """
+    await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(membership_version=User.membership_version + 1)
+    )
+
+
+async def load_project_roles(user_id: uuid.UUID, db: AsyncSession) -> dict[uuid.UUID, ProjectRole]:
+    """Return the user's roles on their most recently updated projects, for token claims."""
+    owned = select(
+        Project.id.label("project_id"),
+        literal(ProjectRole.owner.value).label("role"),
+        Project.updated_at,
+    ).where(Project.user_id == user_id)
+    shared = (
+        select(ProjectCollaborator.project_id, ProjectCollaborator.role, Project.updated_at)
+        .join(Project, Project.id == ProjectCollaborator.project_id)
+        .where(
+            ProjectCollaborator.invitee_id == user_id,
+            ProjectCollaborator.status == CollaboratorStatus.accepted,
+        )
+    )
+    memberships = union_all(owned, shared).subquery()
+    result = await db.execute(
+        select(memberships.c.project_id, memberships.c.role)
+        .order_by(memberships.c.updated_at.desc())
+        .limit(ACCESS_TOKEN_MAX_PROJECT_CLAIMS)
+    )
+    return {project_id: ProjectRole(role) for project_id, role in result.all()}
+
+
+def accessible_project_ids(user_id: uuid.UUID) -> CompoundSelect:
+    """Select the ids of projects the user owns or has accepted an invitation to."""
+    owned = select(Project.id).where(Project.user_id == user_id)
+    shared = select(ProjectCollaborator.project_id).where(
+        ProjectCollaborator.invitee_id == user_id,
+        ProjectCollaborator.status == CollaboratorStatus.accepted,
+    )
+    return union_all(owned, shared)
+
+
+def _claimed_role(project_id: uuid.UUID, current_user: User) -> ProjectRole | None:
+    """Return the role embedded in the request's access token, if it is still current."""
+    claims = token_role_claims.get()
+    if claims is None:
+        return None
+
+    version, roles = claims
+    if version != current_user.membership_version:
+        return None
+    return roles.get(project_id.hex)
+
+
+def _join_caller_membership(stmt: Select, current_user: User) -> Select:
+    """Outer-join the caller's accepted collaborator row onto a query that selects Project."""
+    return stmt.outerjoin(
+        ProjectCollaborator,
+        and_(
+            ProjectCollaborator.project_id == Project.id,
+            ProjectCollaborator.invitee_id == current_user.id,
+            ProjectCollaborator.status == CollaboratorStatus.accepted,
+        ),
+    )
+
+
+def _resolve_role(project: Project, collab_role: str | None, current_user: User) -> ProjectRole:
+    """Derive the caller's role from the project owner and their collaborator row, if any."""
+    if project.user_id == current_user.id:
+        role = ProjectRole.owner
+    elif collab_role is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    else:
+        role = ProjectRole(collab_role)
+
+    role_cache.set((current_user.id, project.id), role)
+    return role
+
 
 async def check_project_access(
     project_id: uuid.UUID,
@@ -19,27 +131,83 @@ async def check_project_access(
     db: AsyncSession,
 ) -> tuple[Project, ProjectRole]:
     """Return (project, role) for the current user or raise 403/404."""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+    role = _claimed_role(project_id, current_user)
+    if role is not None:
+        project = await db.get(Project, project_id)
+        if not project:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        return project, role
 
-    if not project:
+    stmt = select(Project, ProjectCollaborator.role).where(Project.id == project_id)
+    result = await db.execute(_join_caller_membership(stmt, current_user))
+    row = result.one_or_none()
+
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
-    if project.user_id == current_user.id:
-        return project, ProjectRole.owner
+    project, collab_role = row
+    return project, _resolve_role(project, collab_role, current_user)
 
-    collab_result = await db.execute(
-        select(ProjectCollaborator).where(
-            ProjectCollaborator.project_id == project_id,
-            ProjectCollaborator.invitee_id == current_user.id,
-            ProjectCollaborator.status == CollaboratorStatus.accepted,
-        )
+
+async def check_project_role(
+    project_id: uuid.UUID,
+    current_user: User,
+    db: AsyncSession,
+) -> ProjectRole:
+    """Return the caller's role on a project, skipping the database on a claim or cache hit."""
+    role = _claimed_role(project_id, current_user)
+    if role is not None:
+        return role
+
+    role = role_cache.get((current_user.id, project_id))
+    if role is not None:
+        return role
+
+    _, role = await check_project_access(project_id, current_user, db)
+    return role
+
+
+async def check_song_access(
+    song_id: uuid.UUID,
+    current_user: User,
+    db: AsyncSession,
+) -> tuple[Song, Project, ProjectRole]:
+    """Return (song, project, role) for the current user in one query or raise 403/404."""
+    stmt = (
+        select(Song, Project, ProjectCollaborator.role)
+        .join(Project, Project.id == Song.project_id)
+        .where(Song.id == song_id)
     )
-    collab = collab_result.scalar_one_or_none()
-    if not collab:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    result = await db.execute(_join_caller_membership(stmt, current_user))
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
+
+    song, project, collab_role = row
+    return song, project, _resolve_role(project, collab_role, current_user)
+
+
+async def check_chord_access(
+    chord_id: uuid.UUID,
+    current_user: User,
+    db: AsyncSession,
+) -> tuple[Chord, Project, ProjectRole]:
+    """Return (chord, project, role) for the current user in one query or raise 403/404."""
+    stmt = (
+        select(Chord, Project, ProjectCollaborator.role)
+        .join(Song, Song.id == Chord.song_id)
+        .join(Project, Project.id == Song.project_id)
+        .where(Chord.id == chord_id)
+    )
+    result = await db.execute(_join_caller_membership(stmt, current_user))
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chord not found")
 
-    return project, ProjectRole(collab.role)
+    chord, project, collab_role = row
+    return chord, project, _resolve_role(project, collab_role, current_user)
 
 
 async def get_project_access(
@@ -4,19 +4,44 @@ from datetime import UTC, datetime, timedelta
 
 import jwt
 
+from models.collaborator import ProjectRole
+
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+# When enabled, access tokens embed the caller's project roles (see create_access_token).
+ACCESS_TOKEN_ROLE_CLAIMS = os.getenv("ACCESS_TOKEN_ROLE_CLAIMS", "false").lower() == "true"
+ACCESS_TOKEN_MAX_PROJECT_CLAIMS = int(os.getenv("ACCESS_TOKEN_MAX_PROJECT_CLAIMS", "50"))
+
+_ROLE_CODES = {
+    ProjectRole.owner: "o",
+    ProjectRole.admin: "a",
+    ProjectRole.editor: "e",
+    ProjectRole.viewer: "v",
+}
+_ROLES_BY_CODE = {code: role for role, code in _ROLE_CODES.items()}
+
 
+def create_access_token(
+    user_id: uuid.UUID,
+    project_roles: dict[uuid.UUID, ProjectRole] | None = None,
+    membership_version: int | None = None,
+) -> str:
+    """Mint an access token, optionally embedding a compact project -> role map.
 
-def create_access_token(user_id: uuid.UUID) -> str:
+    Role claims are only trusted while ``membership_version`` still matches the user's
+    current version, so they must be minted together.
+    """
     expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
         "sub": str(user_id),
         "exp": expire,
         "type": "access",
     }
+    if project_roles is not None and membership_version is not None:
+        payload["prj"] = {pid.hex: _ROLE_CODES[role] for pid, role in project_roles.items()}
+        payload["mv"] = membership_version
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -32,3 +57,14 @@ def create_refresh_token(user_id: uuid.UUID) -> str:
 
 def decode_token(token: str) -> dict:
     return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def get_role_claims(payload: dict) -> tuple[int, dict[str, ProjectRole]] | None:
+    """Return (membership_version, {project_id.hex: role}) from a decoded access token."""
+    claims = payload.get("prj")
+    version = payload.get("mv")
+    if not isinstance(claims, dict) or not isinstance(version, int):
+        return None
+    return version, {
+        pid: _ROLES_BY_CODE[code] for pid, code in claims.items() if code in _ROLES_BY_CODE
+    }
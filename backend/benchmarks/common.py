@@ -0,0 +1,58 @@
+"""Shared setup for the benchmark scripts.
+
+Benchmarks run against ``BENCH_DATABASE_URL`` (in-memory sqlite by default) with a fresh
+schema, so numbers are comparable between the before and after code paths but not
+across databases.
+"""
+
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from models import Base, Project, Sequence, Song, User
+from schemas.sequence import SequenceBeatIn, SequenceMeasureIn
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite://")
+
+
+async def create_engine() -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(BENCH_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def create_sequence(session: AsyncSession) -> Sequence:
+    """Create a user, project, song and empty sequence and return the sequence."""
+    user = User(id=uuid.uuid4(), email=f"bench-{uuid.uuid4().hex}@test.com", password_hash="x")
+    project = Project(id=uuid.uuid4(), user_id=user.id, name="Bench")
+    song = Song(id=uuid.uuid4(), project_id=project.id, name="Bench")
+    sequence = Sequence(id=uuid.uuid4(), song_id=song.id)
+    session.add_all([user, project, song, sequence])
+    await session.commit()
+    return sequence
+
+
+def make_measures(count: int, beats_per_measure: int = 4) -> list[SequenceMeasureIn]:
+    return [
+        SequenceMeasureIn(
+            position=position,
+            beats=[SequenceBeatIn(beat_position=beat) for beat in range(1, beats_per_measure + 1)],
+        )
+        for position in range(count)
+    ]
+
+
+async def timed(fn: Callable[[], Awaitable[None]]) -> float:
+    start = time.perf_counter()
+    await fn()
+    return time.perf_counter() - start
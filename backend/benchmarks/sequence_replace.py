@@ -0,0 +1,77 @@
+"""Rows per second for the full-replace sequence save, per-object ORM vs bulk insert.
+
+Usage (from backend/): python -m benchmarks.sequence_replace [measures ...]
+"""
+
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import create_engine, create_sequence, make_measures, timed
+from database.sequence_writes import replace_measures
+from models import SequenceBeat, SequenceMeasure
+from schemas.sequence import SequenceMeasureIn
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+
+
+async def replace_measures_orm(
+    db: AsyncSession, sequence_id: uuid.UUID, measures: list[SequenceMeasureIn]
+) -> None:
+    """The previous PUT implementation: one ORM object and db.add per row."""
+    await db.execute(
+        delete(SequenceBeat).where(
+            SequenceBeat.measure_id.in_(
+                select(SequenceMeasure.id).where(SequenceMeasure.sequence_id == sequence_id)
+            )
+        )
+    )
+    await db.execute(delete(SequenceMeasure).where(SequenceMeasure.sequence_id == sequence_id))
+    for measure_data in measures:
+        new_measure_id = uuid.uuid4()
+        db.add(
+            SequenceMeasure(
+                id=new_measure_id,
+                sequence_id=sequence_id,
+                position=measure_data.position,
+                repeat_start=measure_data.repeat_start,
+                repeat_end=measure_data.repeat_end,
+                ending_number=measure_data.ending_number,
+            )
+        )
+        for beat_data in measure_data.beats:
+            db.add(
+                SequenceBeat(
+                    measure_id=new_measure_id,
+                    beat_position=beat_data.beat_position,
+                    chord_id=beat_data.chord_id,
+                )
+            )
+
+
+async def main(sizes: list[int]) -> None:
+    engine, sessionmaker = await create_engine()
+    print(f"{'measures':>9} {'rows':>7} {'orm rows/s':>12} {'bulk rows/s':>12} {'speedup':>8}")
+    for size in sizes:
+        measures = make_measures(size)
+        rows = size + sum(len(m.beats) for m in measures)
+        results = []
+        for replace in (replace_measures_orm, replace_measures):
+            async with sessionmaker() as session:
+                sequence = await create_sequence(session)
+
+                async def save(session=session, sequence=sequence, replace=replace) -> None:
+                    await replace(session, sequence.id, measures)
+                    await session.commit()
+
+                results.append(await timed(save))
+        orm, bulk = results
+        print(f"{size:>9} {rows:>7} {rows / orm:>12,.0f} {rows / bulk:>12,.0f} {orm / bulk:>7.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES)))
@@ -0,0 +1,69 @@
+"""Latency of rendering GET /songs/{song_id}/sequence, ORM + pydantic vs column reads + orjson.
+
+Usage (from backend/): python -m benchmarks.sequence_serialize [beats ...]
+"""
+
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import create_engine, create_sequence, make_measures, timed
+from database.sequence_reads import load_sequence_document, render_sequence_document
+from database.sequence_writes import insert_measures
+from models import Sequence, SequenceMeasure
+from schemas.sequence import SequenceResponse
+
+DEFAULT_SIZES = (1_000, 10_000)
+BEATS_PER_MEASURE = 4
+ROUNDS = 5
+
+
+async def render_orm(db: AsyncSession, song_id: uuid.UUID) -> bytes:
+    """The previous path: hydrate the ORM tree, then validate it through SequenceResponse."""
+    sequence = await db.scalar(
+        select(Sequence)
+        .where(Sequence.song_id == song_id)
+        .options(selectinload(Sequence.measures).selectinload(SequenceMeasure.beats))
+    )
+    return SequenceResponse.model_validate(sequence).model_dump_json().encode()
+
+
+async def render_columns(db: AsyncSession, song_id: uuid.UUID) -> bytes:
+    document = await load_sequence_document(db, song_id)
+    return render_sequence_document(document)  # type: ignore[arg-type]
+
+
+async def main(sizes: list[int]) -> None:
+    engine, sessionmaker = await create_engine()
+    print(f"{'beats':>7} {'orm ms':>9} {'columns ms':>11} {'speedup':>8}")
+    for size in sizes:
+        async with sessionmaker() as session:
+            sequence = await create_sequence(session)
+            await insert_measures(
+                session, sequence.id, make_measures(size // BEATS_PER_MEASURE, BEATS_PER_MEASURE)
+            )
+            await session.commit()
+
+        results = []
+        for render in (render_orm, render_columns):
+            best = float("inf")
+            for _ in range(ROUNDS):
+                # A fresh session per round so the ORM path cannot reuse its identity map.
+                async with sessionmaker() as session:
+
+                    async def run(session=session, render=render) -> None:
+                        await render(session, sequence.song_id)
+
+                    best = min(best, await timed(run))
+            results.append(best)
+        orm, columns = results
+        print(f"{size:>7} {orm * 1000:>9.1f} {columns * 1000:>11.1f} {orm / columns:>7.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES)))
@@ -0,0 +1,88 @@
+"""Content-addressed on-disk cache for rendered files, filled while they stream."""
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Hashable, Iterable, Iterator
+from pathlib import Path
+
+
+class FileCache:
+    """Files under ``directory`` named by a hash of their cache key.
+
+    Entries are written to a temporary file while they stream to the first client and
+    only renamed into place once complete, so readers never see partial files. When the
+    directory grows past ``max_bytes`` the least recently used files are removed. Safe to
+    share between threads and worker processes: renames are atomic and a concurrent miss
+    just renders the same file twice.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, suffix: str = "") -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: Iterable[Hashable]) -> Path:
+        digest = hashlib.sha256(repr(tuple(key)).encode()).hexdigest()
+        return self.directory / f"{digest}{self.suffix}"
+
+    def get(self, key: Iterable[Hashable]) -> Path | None:
+        """Path of the cached file for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def write_through(self, key: Iterable[Hashable], chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield ``chunks`` unchanged while saving them as the entry for ``key``.
+
+        If the consumer stops early the partial file is discarded.
+        """
+        path = self._path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    tmp.write(chunk)
+                    yield chunk
+            os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        self._prune()
+
+    def _prune(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix) and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int | float | str]:
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.directory),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,266 @@
+"""Fractional rank keys that order a song's chords.
+
+A chord's place in its song is ``Chord.rank_key``, a base-62 string compared byte by
+byte: a key can always be made between two neighbours, so moving, inserting or
+deleting a chord writes only that chord's row. Keys lengthen as one gap is split again
+and again; ``rebalance_chord_ranks`` respaces a song's keys when one grows past
+``CHORD_RANK_MAX_LENGTH``.
+"""
+
+import asyncio
+import os
+import string
+import uuid
+import weakref
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from models.chord import Chord
+
+# In ASCII order, so byte-wise string comparison matches numeric order.
+DIGITS = string.digits + string.ascii_uppercase + string.ascii_lowercase
+_BASE = len(DIGITS)
+
+CHORD_RANK_MAX_LENGTH = int(os.getenv("CHORD_RANK_MAX_LENGTH", "24"))
+
+# Per-song locks for writers in this process; see song_rank_lock.
+_song_locks: weakref.WeakValueDictionary[uuid.UUID, asyncio.Lock] = weakref.WeakValueDictionary()
+
+
+def _midpoint(low: str, high: str | None) -> str:
+    """A key strictly between ``low`` ("" for the start) and ``high`` (None for the end).
+
+    Neither bound may end in "0", and nor does the result, so there is always room for
+    another key on either side.
+    """
+    if high is not None:
+        shared = 0
+        while (low[shared] if shared < len(low) else DIGITS[0]) == high[shared]:
+            shared += 1
+        if shared:
+            return high[:shared] + _midpoint(low[shared:], high[shared:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else _BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def _key_after(low: str) -> str:
+    """The shortest key after ``low``: appends add a digit only every 61 steps."""
+    digit = DIGITS.index(low[0]) if low else 0
+    if digit < _BASE - 1:
+        return DIGITS[digit + 1]
+    return low[0] + _key_after(low[1:])
+
+
+def _key_before(high: str) -> str:
+    """The shortest key before ``high``, stepping down a digit like ``_key_after``."""
+    digit = DIGITS.index(high[0])
+    if digit > 1:
+        return DIGITS[digit - 1]
+    if digit == 1:
+        return high[0] if len(high) > 1 else DIGITS[0] + DIGITS[-1]
+    return high[0] + _key_before(high[1:])
+
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """A rank key sorting after ``before`` and before ``after``; None leaves that end open.
+
+    Keys at either open end step by one digit rather than halving the gap, so a song built
+    by repeated appends (or prepends) keeps short keys.
+    """
+    if before is None and after is None:
+        return DIGITS[_BASE // 2]
+    if after is None:
+        return _key_after(before)
+    if before is None:
+        return _key_before(after)
+    if before >= after:
+        raise ValueError(f"Rank keys out of order: {before!r} >= {after!r}")
+    return _midpoint(before, after)
+
+
+def _key_value(key: str, width: int) -> int:
+    """``key`` read as a ``width``-digit base-62 number, padded with trailing zeros."""
+    value = 0
+    for digit in key.ljust(width, DIGITS[0]):
+        value = value * _BASE + DIGITS.index(digit)
+    return value
+
+
+def _key_from_value(value: int, width: int) -> str:
+    """The key of a ``width``-digit base-62 number, without trailing zeros."""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, _BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip(DIGITS[0])
+
+
+def spread_ranks(count: int) -> list[str]:
+    """``count`` evenly spaced, equal-length keys.
+
+    They fill the lower half of the key space, leaving the upper half for appends.
+    """
+    width = 1
+    while _BASE**width // 2 // (count + 1) < _BASE:
+        width += 1
+    step = _BASE**width // 2 // (count + 1)
+    return [_key_from_value(index * step, width) for index in range(1, count + 1)]
+
+
+def _spread_between(
+    before: str | None, after: str | None, count: int, taken: set[str]
+) -> list[str]:
+    """``count`` increasing keys evenly spaced between ``before`` and ``after``, none in ``taken``.
+
+    The keys share the bounds' width plus just enough digits to space them (and step
+    around every taken key), so their length grows with the logarithm of ``count``
+    rather than with ``count`` itself.
+    """
+    width = max(len(before or ""), len(after or ""))
+    while True:
+        width += 1
+        low = _key_value(before or "", width)
+        high = _key_value(after, width) if after is not None else _BASE**width
+        step = (high - low) // (count + 1)
+        if step > len(taken):
+            break
+    keys = []
+    for index in range(1, count + 1):
+        key = _key_from_value(low + index * step, width)
+        while key in taken:
+            low += 1
+            key = _key_from_value(low + index * step, width)
+        keys.append(key)
+    return keys
+
+
+def rerank(current: Sequence[str], taken: set[str]) -> list[str | None]:
+    """New keys for a reordering, or None where a chord's current key can stay.
+
+    ``current`` holds the chords' keys in their new order. The longest run already in
+    increasing order keeps its keys; each run of other chords gets keys spread evenly
+    between its kept neighbours and not in ``taken``, so rows can be updated one at a
+    time without two ever sharing a key.
+    """
+    kept = _longest_increasing(current)
+    keys: list[str | None] = [None] * len(current)
+    before = None
+    run: list[int] = []
+    for index, key in enumerate([*current, None]):
+        if index < len(current) and index not in kept:
+            run.append(index)
+            continue
+        if run:
+            new_keys = _spread_between(before, key, len(run), taken)
+            for moved, new_key in zip(run, new_keys, strict=True):
+                keys[moved] = new_key
+            run = []
+        before = key
+    return keys
+
+
+def _longest_increasing(keys: Sequence[str]) -> set[int]:
+    """Indexes of a longest strictly increasing subsequence of ``keys`` (patience sort)."""
+    tails: list[int] = []
+    previous: list[int | None] = [None] * len(keys)
+    for index, key in enumerate(keys):
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if keys[tails[middle]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        previous[index] = tails[low - 1] if low else None
+        if low == len(tails):
+            tails.append(index)
+        else:
+            tails[low] = index
+
+    indexes = set()
+    index = tails[-1] if tails else None
+    while index is not None:
+        indexes.add(index)
+        index = previous[index]
+    return indexes
+
+
+@asynccontextmanager
+async def song_rank_lock(db: AsyncSession, song_id: uuid.UUID) -> AsyncIterator[None]:
+    """Let one writer at a time pick rank keys in a song; commit before leaving the block.
+
+    Two writers reading the same neighbours would otherwise pick the same key. Within a
+    process an asyncio.Lock queues them; on PostgreSQL a transaction-scoped advisory lock
+    on the song does the same across workers and is released by the commit.
+    """
+    lock = _song_locks.setdefault(song_id, asyncio.Lock())
+    async with lock:
+        if db.bind.dialect.name == "postgresql":
+            lock_id = int.from_bytes(song_id.bytes[:8], "big", signed=True)
+            await db.execute(select(func.pg_advisory_xact_lock(lock_id)))
+        yield
+
+
+async def last_rank(db: AsyncSession, song_id: uuid.UUID) -> str | None:
+    """The song's highest rank key, read from the top of ``ix_chords_song_id_rank_key``."""
+    result = await db.execute(
+        select(Chord.rank_key)
+        .where(Chord.song_id == song_id)
+        .order_by(Chord.rank_key.desc())
+        .limit(1)
+    )
+    return result.scalar()
+
+
+async def chord_position(db: AsyncSession, song_id: uuid.UUID, rank_key: str) -> int:
+    """The 0-based position of the chord holding ``rank_key``: how many chords rank first."""
+    result = await db.execute(
+        select(func.count())
+        .select_from(Chord)
+        .where(Chord.song_id == song_id, Chord.rank_key < rank_key)
+    )
+    return result.scalar_one()
+
+
+async def rebalance_chord_ranks(bind: AsyncEngine | AsyncConnection, song_id: uuid.UUID) -> int:
+    """Respace a song's rank keys, keeping their order; returns the number of chords.
+
+    Opens its own session on ``bind`` so it can run as a background task after the
+    request's session is gone. Every row is first moved to a key past any real one so
+    the unique index never sees two chords share a key mid-update.
+    """
+    async with AsyncSession(bind, expire_on_commit=False) as db, song_rank_lock(db, song_id):
+        result = await db.execute(
+            select(Chord.id).where(Chord.song_id == song_id).order_by(Chord.rank_key)
+        )
+        chord_ids = list(result.scalars())
+        if not chord_ids:
+            return 0
+
+        chord_table = Chord.__table__
+        stmt = (
+            update(chord_table)
+            .where(chord_table.c.id == bindparam("b_id"))
+            .values(rank_key=bindparam("b_rank_key"))
+        )
+        await db.execute(
+            stmt, [{"b_id": chord_id, "b_rank_key": f"~{chord_id.hex}"} for chord_id in chord_ids]
+        )
+        await db.execute(
+            stmt,
+            [
+                {"b_id": chord_id, "b_rank_key": key}
+                for chord_id, key in zip(chord_ids, spread_ranks(len(chord_ids)), strict=True)
+            ],
+        )
+        await db.commit()
+        return len(chord_ids)
@@ -0,0 +1,99 @@
+"""Set-based writes for applying many chord edits to one song at once."""
+
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.chord_ranks import last_rank, rank_between
+from database.sequence_writes import bump_versions_for_deleted_chords
+from models.chord import Chord
+from music.chords import shape_fingerprint
+from schemas.chord import ChordOp, CreateChordOp, DeleteChordOp, UpdateChordOp
+
+_CHORD_FIELDS = ("name", "markers", "string_count", "tuning", "starting_fret")
+
+
+def _shape_values(values: dict) -> dict:
+    """The derived shape columns, as the ORM listener on Chord would set them."""
+    shape = shape_fingerprint(values["markers"], values["tuning"], values["string_count"])
+    fingerprint, offset = shape or (None, None)
+    return {"shape_fingerprint": fingerprint, "shape_offset": offset}
+
+
+async def apply_chord_ops(
+    db: AsyncSession, song_id: uuid.UUID, ops: list[ChordOp]
+) -> tuple[list[dict], int, int]:
+    """Apply a batch of chord edits with one statement per kind of operation.
+
+    Every update and delete target is checked against the song in a single query
+    before anything is written: an unknown chord raises 404 and a chord targeted twice
+    raises 400. Creates are appended in request order, so call this inside
+    ``song_rank_lock``. Returns (created rows, updated count, deleted count).
+    """
+    creates = [op for op in ops if isinstance(op, CreateChordOp)]
+    updates = [op for op in ops if isinstance(op, UpdateChordOp)]
+    deletes = [op for op in ops if isinstance(op, DeleteChordOp)]
+
+    targeted = [op.id for op in updates] + [op.id for op in deletes]
+    if len(set(targeted)) != len(targeted):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each chord may be updated or deleted only once per request",
+        )
+
+    chord_table = Chord.__table__
+    stored: dict[uuid.UUID, dict] = {}
+    if targeted:
+        result = await db.execute(
+            select(chord_table.c.id, *(chord_table.c[field] for field in _CHORD_FIELDS)).where(
+                chord_table.c.song_id == song_id, chord_table.c.id.in_(targeted)
+            )
+        )
+        stored = {row.id: {field: row._mapping[field] for field in _CHORD_FIELDS} for row in result}
+        if len(stored) != len(targeted):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chord not found")
+
+    if deletes:
+        deleted_ids = [op.id for op in deletes]
+        await bump_versions_for_deleted_chords(db, deleted_ids)
+        await db.execute(delete(chord_table).where(chord_table.c.id.in_(deleted_ids)))
+
+    if updates:
+        update_rows = []
+        for op in updates:
+            values = stored[op.id] | op.model_dump(include=set(_CHORD_FIELDS), exclude_none=True)
+            update_rows.append({"b_id": op.id, **values, **_shape_values(values)})
+        await db.execute(
+            update(chord_table)
+            .where(chord_table.c.id == bindparam("b_id"))
+            .values(updated_at=func.now()),
+            update_rows,
+        )
+
+    created: list[dict] = []
+    if creates:
+        rank_key = await last_rank(db, song_id)
+        for op in creates:
+            rank_key = rank_between(rank_key, None)
+            values = op.model_dump(include=set(_CHORD_FIELDS))
+            created.append(
+                {
+                    "id": uuid.uuid4(),
+                    "song_id": song_id,
+                    "rank_key": rank_key,
+                    **values,
+                    **_shape_values(values),
+                }
+            )
+        result = await db.execute(
+            insert(chord_table).returning(
+                chord_table.c.created_at, chord_table.c.updated_at, sort_by_parameter_order=True
+            ),
+            created,
+        )
+        for row, (created_at, updated_at) in zip(created, result.all(), strict=True):
+            row.update(created_at=created_at, updated_at=updated_at)
+
+    return created, len(updates), len(deletes)
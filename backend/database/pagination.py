@@ -0,0 +1,61 @@
+"""Keyset pagination helpers shared by the list endpoints."""
+
+import base64
+import json
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, and_, or_
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last row on a page into an opaque cursor."""
+    payload = json.dumps([_jsonable(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> tuple:
+    """Unpack a cursor produced by ``encode_cursor``, parsing each value in turn."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parse(value) for parse, value in zip(parsers, values, strict=True))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_after(
+    columns: Sequence[ColumnElement], values: Sequence[Any], descending: bool = False
+) -> ColumnElement[bool]:
+    """Match rows that sort strictly after ``values`` under ``ORDER BY columns``.
+
+    Expanded to ``(a > x) OR (a = x AND b > y) ...`` rather than a row-value comparison
+    so it works on every backend.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values, strict=True)):
+        tail = column < value if descending else column > value
+        equal_prefix = [c == v for c, v in zip(columns[:i], values[:i], strict=True)]
+        clauses.append(and_(*equal_prefix, tail))
+    return or_(*clauses)
+
+
+def split_page(rows: list, limit: int, sort_key: Callable[[Any], tuple]) -> tuple[list, str | None]:
+    """Trim a ``limit + 1`` fetch to one page and build the cursor for the next one."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*sort_key(rows[-1]))
@@ -0,0 +1,66 @@
+"""A connection pool that records how long requests wait for a connection."""
+
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+class PoolMetrics:
+    """Checkout counters shared by a pool and the pools it is recreated as."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that times every checkout and counts checkout timeouts.
+
+    A wait covers everything before the caller gets a connection: queueing for a free
+    one, opening a new one while the pool may still grow, and any pre-ping, so it shows
+    both pool exhaustion and slow connects. ``stats()`` reports them alongside the
+    pool's current occupancy for ``/api/metrics``.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.monotonic()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            wait = time.monotonic() - started_at
+            self.metrics.total_wait_seconds += wait
+            self.metrics.max_wait_seconds = max(self.metrics.max_wait_seconds, wait)
+        self.metrics.checkouts += 1
+        return connection
+
+    def recreate(self) -> "MeteredQueuePool":
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict[str, int | float]:
+        metrics = self.metrics
+        attempts = metrics.checkouts + metrics.timeouts
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            # Negative while the pool has not yet opened pool_size connections
+            "overflow": max(self.overflow(), 0),
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "avg_wait_seconds": metrics.total_wait_seconds / attempts if attempts else 0.0,
+            "max_wait_seconds": metrics.max_wait_seconds,
+        }
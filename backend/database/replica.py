@@ -0,0 +1,197 @@
+"""Optional read replica for read-only endpoints.
+
+With ``REPLICA_DATABASE_URL`` set, routes that depend on ``get_read_db`` read from the
+replica unless the client wrote within the last ``REPLICA_STICKY_SECONDS`` (so users see
+their own writes) or the replica has fallen more than ``REPLICA_MAX_LAG_SECONDS`` behind.
+Otherwise, and always without a replica, ``get_read_db`` yields the request's ``get_db``
+session itself, so a handler that depends on both holds one primary connection.
+
+Stickiness travels in a cookie set on successful writes, so it holds whichever worker
+process serves the next request.
+
+Handlers check access to a project, song or chord on the primary session and only read
+the data itself from the replica. Listings whose query is the access check (the caller's
+projects, pending invitations) run entirely on the replica, so they can show a project
+for up to ``REPLICA_MAX_LAG_SECONDS`` after the caller's access was revoked.
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import AsyncGenerator, Callable
+
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from database.session import engine_options, get_db
+
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL", "")
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Also bounds how long the replica-only listings above can trail a revoked membership.
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "1"))
+# How long one lag measurement is trusted before the replica is asked again.
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1"))
+
+STICKY_COOKIE = "read_primary_until"
+
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# Zero when the replica has replayed everything it received, including when the primary
+# is idle and the last replayed transaction is old; NULL-safe on a server that is not a
+# standby, where it reports no lag.
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaLagMonitor:
+    """Measures replica lag at most once per ``interval`` seconds.
+
+    A failed measurement counts as unbounded lag, so reads fall back to the primary while
+    the replica is unreachable.
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, interval: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.engine = engine
+        self.interval = interval
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._checked_at: float | None = None
+        self.lag_seconds = 0.0
+        self.failures = 0
+
+    async def _measure(self) -> float:
+        if self.engine.dialect.name != "postgresql":
+            return 0.0
+        async with self.engine.connect() as conn:
+            return float((await conn.execute(_LAG_QUERY)).scalar_one())
+
+    async def lag(self) -> float:
+        async with self._lock:
+            now = self._clock()
+            if self._checked_at is None or now - self._checked_at >= self.interval:
+                try:
+                    self.lag_seconds = await self._measure()
+                except Exception:
+                    self.failures += 1
+                    self.lag_seconds = float("inf")
+                self._checked_at = now
+            return self.lag_seconds
+
+
+class ReplicaRouter:
+    """Chooses the replica or the primary for each read session and counts the choices."""
+
+    def __init__(
+        self,
+        replica_session: async_sessionmaker[AsyncSession] | None,
+        monitor: ReplicaLagMonitor | None,
+        max_lag: float,
+    ) -> None:
+        self.replica_session = replica_session
+        self.monitor = monitor
+        self.max_lag = max_lag
+        self.replica_reads = 0
+        self.sticky_reads = 0
+        self.lagging_reads = 0
+
+    async def replica_for(self, request: Request) -> async_sessionmaker[AsyncSession] | None:
+        """The replica's session factory if ``request`` may read from it, else None."""
+        if self.replica_session is None:
+            return None
+        if _sticky_until(request) > time.time():
+            self.sticky_reads += 1
+            return None
+        if await self.monitor.lag() > self.max_lag:
+            self.lagging_reads += 1
+            return None
+        self.replica_reads += 1
+        return self.replica_session
+
+    def stats(self) -> dict[str, int | float | bool]:
+        return {
+            "enabled": self.replica_session is not None,
+            "replica_reads": self.replica_reads,
+            "sticky_primary_reads": self.sticky_reads,
+            "lagging_primary_reads": self.lagging_reads,
+            "lag_seconds": self.monitor.lag_seconds if self.monitor else 0.0,
+            "lag_check_failures": self.monitor.failures if self.monitor else 0,
+        }
+
+
+def _sticky_until(request: Request) -> float:
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+
+if REPLICA_DATABASE_URL:
+    replica_engine: AsyncEngine | None = create_async_engine(
+        REPLICA_DATABASE_URL, echo=False, **engine_options(REPLICA_DATABASE_URL)
+    )
+    replica_router = ReplicaRouter(
+        async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False),
+        ReplicaLagMonitor(replica_engine, REPLICA_LAG_CHECK_SECONDS),
+        REPLICA_MAX_LAG_SECONDS,
+    )
+else:
+    replica_engine = None
+    replica_router = ReplicaRouter(None, None, REPLICA_MAX_LAG_SECONDS)
+
+
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """A session for read-only handlers: the replica when it is safe to use, else ``db``.
+
+    ``db`` is the request's own ``get_db`` session (FastAPI resolves it once per request),
+    so falling back to the primary never opens a second connection.
+    """
+    replica_session = await replica_router.replica_for(request)
+    if replica_session is None:
+        yield db
+        return
+    async with replica_session() as session:
+        yield session
+
+
+class ReplicaStickinessMiddleware:
+    """Marks a client as having just written so its reads stay on the primary.
+
+    Any successful POST, PUT, PATCH or DELETE sets ``STICKY_COOKIE`` to the time until
+    which that client's reads skip the replica.
+    """
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float = REPLICA_STICKY_SECONDS) -> None:
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.sticky_seconds) + 1};"
+                    " Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
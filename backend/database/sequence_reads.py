@@ -0,0 +1,180 @@
+"""Column-level read paths for a stored sequence that skip ORM hydration."""
+
+import os
+import uuid
+
+import numpy as np
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache.ttl_cache import TTLCache
+from models.sequence import Sequence, SequenceBeat, SequenceMeasure
+from music.playback import expand_repeats
+from music.timeline import Timeline, build_timeline, chord_grid_from_beats
+
+PLAYBACK_CACHE_TTL_SECONDS = float(os.getenv("PLAYBACK_CACHE_TTL_SECONDS", "3600"))
+PLAYBACK_CACHE_MAX_ENTRIES = int(os.getenv("PLAYBACK_CACHE_MAX_ENTRIES", "1000"))
+# Longest playback order, repeats unrolled, that a sequence may expand to; longer ones
+# (deeply nested repeats) are refused with 422 rather than built.
+PLAYBACK_MAX_MEASURES = int(os.getenv("PLAYBACK_MAX_MEASURES", "100000"))
+
+# Keyed by (sequence_id, version): a new version is a new key, so entries never go stale
+# and the TTL only bounds how long unused orders stay in memory.
+playback_cache = TTLCache(maxsize=PLAYBACK_CACHE_MAX_ENTRIES, ttl=PLAYBACK_CACHE_TTL_SECONDS)
+
+_SEQUENCE_COLUMNS = (
+    Sequence.id,
+    Sequence.song_id,
+    Sequence.time_signature_numerator,
+    Sequence.time_signature_denominator,
+    Sequence.measures_per_line,
+    Sequence.version,
+    Sequence.created_at,
+    Sequence.updated_at,
+)
+_MEASURE_COLUMNS = (
+    SequenceMeasure.id,
+    SequenceMeasure.sequence_id,
+    SequenceMeasure.position,
+    SequenceMeasure.repeat_start,
+    SequenceMeasure.repeat_end,
+    SequenceMeasure.ending_number,
+)
+_BEAT_COLUMNS = (
+    SequenceBeat.id,
+    SequenceBeat.measure_id,
+    SequenceBeat.beat_position,
+    SequenceBeat.chord_id,
+)
+
+
+async def load_sequence_document(db: AsyncSession, song_id: uuid.UUID) -> dict | None:
+    """Load a song's sequence as the plain dict shape of ``SequenceResponse``.
+
+    Three column selects (sequence, measures, beats) stitched together in Python; no ORM
+    instances are created and nothing is validated, so callers must keep the column
+    lists above in step with the response schema.
+    """
+    result = await db.execute(select(*_SEQUENCE_COLUMNS).where(Sequence.song_id == song_id))
+    row = result.mappings().one_or_none()
+    if row is None:
+        return None
+    document = dict(row)
+
+    measures: dict[uuid.UUID, dict] = {}
+    result = await db.execute(
+        select(*_MEASURE_COLUMNS)
+        .where(SequenceMeasure.sequence_id == document["id"])
+        .order_by(SequenceMeasure.position)
+    )
+    for measure in result.mappings():
+        measures[measure["id"]] = {**measure, "beats": []}
+
+    result = await db.execute(
+        select(*_BEAT_COLUMNS)
+        .join(SequenceMeasure, SequenceMeasure.id == SequenceBeat.measure_id)
+        .where(SequenceMeasure.sequence_id == document["id"])
+        .order_by(SequenceBeat.measure_id, SequenceBeat.beat_position)
+    )
+    for beat in result.mappings():
+        measures[beat["measure_id"]]["beats"].append(dict(beat))
+
+    document["measures"] = list(measures.values())
+    return document
+
+
+def render_sequence_document(document: dict) -> bytes:
+    """Encode a sequence document exactly as FastAPI would encode ``SequenceResponse``."""
+    return orjson.dumps(document, option=orjson.OPT_UTC_Z)
+
+
+async def _load_playback(
+    db: AsyncSession, sequence_id: uuid.UUID, version: int
+) -> tuple[list[int], list[int]]:
+    """The stored measure positions in order, and the playback order as indexes into them.
+
+    Repeats and endings are unrolled. Indexes run 0..n-1 however sparse the stored
+    positions are, so arrays sized by them stay as small as the sequence. Raises 422 if
+    the playback order is longer than ``PLAYBACK_MAX_MEASURES``.
+    """
+    key = (sequence_id, version)
+    playback = playback_cache.get(key)
+    if playback is None:
+        result = await db.execute(
+            select(
+                SequenceMeasure.position,
+                SequenceMeasure.repeat_start,
+                SequenceMeasure.repeat_end,
+                SequenceMeasure.ending_number,
+            )
+            .where(SequenceMeasure.sequence_id == sequence_id)
+            .order_by(SequenceMeasure.position)
+        )
+        measures = result.all()
+        try:
+            order = expand_repeats(measures, PLAYBACK_MAX_MEASURES)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        playback = ([measure.position for measure in measures], order)
+        playback_cache.set(key, playback)
+    return playback
+
+
+async def load_playback_positions(
+    db: AsyncSession, sequence_id: uuid.UUID, version: int
+) -> list[int]:
+    """Measure positions in playback order, with repeats and endings unrolled."""
+    positions, order = await _load_playback(db, sequence_id, version)
+    return [positions[index] for index in order]
+
+
+async def load_sequence_timeline(
+    db: AsyncSession,
+    sequence: Row,
+    tempo: float,
+    tempo_changes: dict[int, float],
+) -> tuple[Timeline, list[uuid.UUID | None]]:
+    """Build the beat timeline of ``sequence`` and the chord id behind each timeline code.
+
+    Only the columns of beats that carry a chord are read; empty beats come from the
+    time signature. ``tempo_changes`` is keyed by stored position; one that is not a
+    measure of the sequence raises 422.
+    """
+    positions, order = await _load_playback(db, sequence.id, sequence.version)
+    index_of = {position: index for index, position in enumerate(positions)}
+    unknown = sorted(set(tempo_changes) - index_of.keys())
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Tempo change at position {unknown[0]}, which is not a measure",
+        )
+
+    result = await db.execute(
+        select(SequenceMeasure.position, SequenceBeat.beat_position, SequenceBeat.chord_id)
+        .join(SequenceMeasure, SequenceMeasure.id == SequenceBeat.measure_id)
+        .where(SequenceMeasure.sequence_id == sequence.id, SequenceBeat.chord_id.is_not(None))
+    )
+    rows = result.all()
+
+    chord_ids: dict[uuid.UUID, int] = {}
+    codes = np.fromiter(
+        (chord_ids.setdefault(row.chord_id, len(chord_ids)) for row in rows), dtype=np.int64
+    )
+    grid = chord_grid_from_beats(
+        np.fromiter((index_of[row.position] for row in rows), dtype=np.int64, count=len(rows)),
+        np.fromiter((row.beat_position for row in rows), dtype=np.int64, count=len(rows)),
+        codes,
+        measure_count=len(positions),
+        numerator=sequence.time_signature_numerator,
+    )
+    timeline = build_timeline(
+        np.array(order, dtype=np.int64),
+        grid,
+        denominator=sequence.time_signature_denominator,
+        tempo=tempo,
+        tempo_changes={index_of[position]: bpm for position, bpm in tempo_changes.items()},
+        positions=np.array(positions, dtype=np.int64),
+    )
+    return timeline, list(chord_ids)
@@ -0,0 +1,469 @@
+"""Targeted write statements for editing a stored sequence in place."""
+
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import Table, bindparam, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.sequence import Sequence, SequenceBeat, SequenceMeasure
+from schemas.sequence import (
+    ClearBeatOp,
+    DeleteMeasureOp,
+    InsertMeasureOp,
+    MoveMeasureOp,
+    SequenceMeasureIn,
+    SequenceOp,
+    SetBeatOp,
+    SetEndingOp,
+    SetRepeatOp,
+)
+
+# Where a moving measure waits while its neighbours shift; never produced by _shift_measures.
+_PARKED_POSITION = -(2**31)
+
+_NO_SYNC = {"synchronize_session": False}
+
+# Ids per DELETE ... IN statement, well below asyncpg's 32767 bind parameters.
+_DELETE_CHUNK_SIZE = 5000
+
+
+def _measure_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Measure not found")
+
+
+def _position_out_of_range(count: int, upper: int) -> HTTPException:
+    # A literal 422: Starlette renamed its constant for it, and requirements.txt still
+    # allows releases that only have the old name.
+    return HTTPException(
+        status_code=422,
+        detail=f"Measure position must be between 0 and {upper}; the sequence has {count}",
+    )
+
+
+def _measure_id_at(sequence_id: uuid.UUID, position: int):
+    return (
+        select(SequenceMeasure.id)
+        .where(SequenceMeasure.sequence_id == sequence_id, SequenceMeasure.position == position)
+        .scalar_subquery()
+    )
+
+
+async def bump_sequence_version(
+    db: AsyncSession, sequence_id: uuid.UUID, expected_version: int | None = None
+) -> None:
+    """Increment the sequence version, failing with 412 if it is no longer ``expected_version``.
+
+    The check and the increment are one conditional UPDATE, so of two writers holding the
+    same version only the first to commit succeeds. Left synchronized so a Sequence
+    already in the session picks up the new version.
+    """
+    stmt = (
+        update(Sequence)
+        .where(Sequence.id == sequence_id)
+        .values(version=Sequence.version + 1, updated_at=func.now())
+    )
+    if expected_version is not None:
+        stmt = stmt.where(Sequence.version == expected_version)
+    result = await db.execute(stmt)
+    if not result.rowcount:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Sequence has been modified",
+        )
+
+
+async def bump_versions_for_deleted_chords(db: AsyncSession, chord_ids: list[uuid.UUID]) -> None:
+    """Bump the version of every sequence with a beat on one of ``chord_ids``.
+
+    Call before deleting the chords: the delete clears those beats through the
+    ON DELETE SET NULL foreign key, which leaves the sequence version (and so its ETag)
+    untouched otherwise.
+    """
+    referencing = (
+        select(SequenceMeasure.sequence_id)
+        .join(SequenceBeat, SequenceBeat.measure_id == SequenceMeasure.id)
+        .where(SequenceBeat.chord_id.in_(chord_ids))
+    )
+    await db.execute(
+        update(Sequence)
+        .where(Sequence.id.in_(referencing))
+        .values(version=Sequence.version + 1, updated_at=func.now())
+        .execution_options(**_NO_SYNC)
+    )
+
+
+async def _shift_measures(
+    db: AsyncSession,
+    sequence_id: uuid.UUID,
+    delta: int,
+    start: int,
+    end: int | None = None,
+) -> None:
+    """Add ``delta`` to the position of every measure in ``[start, end]``.
+
+    uq_sequence_measure_position is checked row by row, so the rows are first moved to
+    unique negative positions and then flipped back, rather than shifted in place.
+    """
+    in_range = [SequenceMeasure.sequence_id == sequence_id, SequenceMeasure.position >= start]
+    if end is not None:
+        in_range.append(SequenceMeasure.position <= end)
+
+    await db.execute(
+        update(SequenceMeasure)
+        .where(*in_range)
+        .values(position=-(SequenceMeasure.position + delta) - 1)
+        .execution_options(**_NO_SYNC)
+    )
+    await db.execute(
+        update(SequenceMeasure)
+        .where(
+            SequenceMeasure.sequence_id == sequence_id,
+            SequenceMeasure.position < 0,
+            SequenceMeasure.position != _PARKED_POSITION,
+        )
+        .values(position=-SequenceMeasure.position - 1)
+        .execution_options(**_NO_SYNC)
+    )
+
+
+async def insert_measures(
+    db: AsyncSession, sequence_id: uuid.UUID, measures: list[SequenceMeasureIn]
+) -> None:
+    """Bulk-insert measures and their beats without building ORM objects.
+
+    Ids are generated here so beats can reference their measure before it is flushed;
+    each table is then written with one executemany, which the dialect batches into
+    multi-row INSERT ... VALUES statements.
+    """
+    if not measures:
+        return
+    measure_rows = []
+    beat_rows = []
+    for measure in measures:
+        measure_id = uuid.uuid4()
+        measure_rows.append(
+            {
+                "id": measure_id,
+                "sequence_id": sequence_id,
+                "position": measure.position,
+                "repeat_start": measure.repeat_start,
+                "repeat_end": measure.repeat_end,
+                "ending_number": measure.ending_number,
+            }
+        )
+        beat_rows.extend(
+            {
+                "id": uuid.uuid4(),
+                "measure_id": measure_id,
+                "beat_position": beat.beat_position,
+                "chord_id": beat.chord_id,
+            }
+            for beat in measure.beats
+        )
+
+    await db.execute(insert(SequenceMeasure.__table__), measure_rows)
+    if beat_rows:
+        await db.execute(insert(SequenceBeat.__table__), beat_rows)
+
+
+async def replace_measures(
+    db: AsyncSession, sequence_id: uuid.UUID, measures: list[SequenceMeasureIn]
+) -> int:
+    """Delete every measure and beat of the sequence and bulk-insert ``measures``.
+
+    Returns the number of rows deleted and inserted.
+    """
+    deleted_beats = await db.execute(
+        delete(SequenceBeat)
+        .where(
+            SequenceBeat.measure_id.in_(
+                select(SequenceMeasure.id).where(SequenceMeasure.sequence_id == sequence_id)
+            )
+        )
+        .execution_options(**_NO_SYNC)
+    )
+    deleted_measures = await db.execute(
+        delete(SequenceMeasure)
+        .where(SequenceMeasure.sequence_id == sequence_id)
+        .execution_options(**_NO_SYNC)
+    )
+    await insert_measures(db, sequence_id, measures)
+    return (
+        deleted_beats.rowcount
+        + deleted_measures.rowcount
+        + len(measures)
+        + sum(len(measure.beats) for measure in measures)
+    )
+
+
+async def _set_beat(db: AsyncSession, sequence_id: uuid.UUID, op: SetBeatOp | ClearBeatOp) -> None:
+    chord_id = op.chord_id if isinstance(op, SetBeatOp) else None
+    result = await db.execute(
+        update(SequenceBeat)
+        .where(
+            SequenceBeat.measure_id == _measure_id_at(sequence_id, op.measure_position),
+            SequenceBeat.beat_position == op.beat_position,
+        )
+        .values(chord_id=chord_id, updated_at=func.now())
+        .execution_options(**_NO_SYNC)
+    )
+    if result.rowcount:
+        return
+
+    # No beat row yet: create it under the measure, if that measure exists.
+    measure = select(
+        literal(uuid.uuid4(), SequenceBeat.id.type),
+        SequenceMeasure.id,
+        literal(op.beat_position),
+        literal(chord_id, SequenceBeat.chord_id.type),
+    ).where(
+        SequenceMeasure.sequence_id == sequence_id,
+        SequenceMeasure.position == op.measure_position,
+    )
+    result = await db.execute(
+        insert(SequenceBeat).from_select(["id", "measure_id", "beat_position", "chord_id"], measure)
+    )
+    if not result.rowcount:
+        raise _measure_not_found()
+
+
+async def _insert_measure(
+    db: AsyncSession, sequence_id: uuid.UUID, op: InsertMeasureOp, count: int
+) -> None:
+    if op.position > count:
+        raise _position_out_of_range(count, count)
+    await _shift_measures(db, sequence_id, 1, op.position)
+    measure = SequenceMeasureIn.model_validate(op.model_dump(exclude={"op"}))
+    await insert_measures(db, sequence_id, [measure])
+
+
+async def _delete_measure(db: AsyncSession, sequence_id: uuid.UUID, op: DeleteMeasureOp) -> None:
+    measure_id = _measure_id_at(sequence_id, op.position)
+    await db.execute(
+        delete(SequenceBeat)
+        .where(SequenceBeat.measure_id == measure_id)
+        .execution_options(**_NO_SYNC)
+    )
+    result = await db.execute(
+        delete(SequenceMeasure)
+        .where(
+            SequenceMeasure.sequence_id == sequence_id,
+            SequenceMeasure.position == op.position,
+        )
+        .execution_options(**_NO_SYNC)
+    )
+    if not result.rowcount:
+        raise _measure_not_found()
+    await _shift_measures(db, sequence_id, -1, op.position + 1)
+
+
+async def _move_measure(
+    db: AsyncSession, sequence_id: uuid.UUID, op: MoveMeasureOp, count: int
+) -> None:
+    if op.to_position >= count:
+        raise _position_out_of_range(count, count - 1)
+    if op.from_position == op.to_position:
+        return
+
+    result = await db.execute(
+        update(SequenceMeasure)
+        .where(
+            SequenceMeasure.sequence_id == sequence_id,
+            SequenceMeasure.position == op.from_position,
+        )
+        .values(position=_PARKED_POSITION)
+        .execution_options(**_NO_SYNC)
+    )
+    if not result.rowcount:
+        raise _measure_not_found()
+
+    if op.from_position < op.to_position:
+        await _shift_measures(db, sequence_id, -1, op.from_position + 1, op.to_position)
+    else:
+        await _shift_measures(db, sequence_id, 1, op.to_position, op.from_position - 1)
+
+    await db.execute(
+        update(SequenceMeasure)
+        .where(
+            SequenceMeasure.sequence_id == sequence_id,
+            SequenceMeasure.position == _PARKED_POSITION,
+        )
+        .values(position=op.to_position, updated_at=func.now())
+        .execution_options(**_NO_SYNC)
+    )
+
+
+async def _update_measure(
+    db: AsyncSession, sequence_id: uuid.UUID, position: int, values: dict
+) -> None:
+    if not values:
+        return
+    result = await db.execute(
+        update(SequenceMeasure)
+        .where(SequenceMeasure.sequence_id == sequence_id, SequenceMeasure.position == position)
+        .values(**values, updated_at=func.now())
+        .execution_options(**_NO_SYNC)
+    )
+    if not result.rowcount:
+        raise _measure_not_found()
+
+
+async def apply_sequence_ops(
+    db: AsyncSession, sequence_id: uuid.UUID, ops: list[SequenceOp]
+) -> None:
+    """Apply a batch of edit operations in order, each as a few targeted statements.
+
+    Runs inside the caller's transaction; an operation that targets a missing measure
+    raises 404, one that would leave a gap in the positions raises 422, and the caller's
+    session rolls the whole batch back.
+    """
+    result = await db.execute(
+        select(func.count())
+        .select_from(SequenceMeasure)
+        .where(SequenceMeasure.sequence_id == sequence_id)
+    )
+    # Inserts and moves may not reach past the end of the sequence, tracked as ops run
+    count = result.scalar_one()
+    for op in ops:
+        match op:
+            case SetBeatOp() | ClearBeatOp():
+                await _set_beat(db, sequence_id, op)
+            case InsertMeasureOp():
+                await _insert_measure(db, sequence_id, op, count)
+                count += 1
+            case DeleteMeasureOp():
+                await _delete_measure(db, sequence_id, op)
+                count -= 1
+            case MoveMeasureOp():
+                await _move_measure(db, sequence_id, op, count)
+            case SetRepeatOp():
+                values = {
+                    key: value
+                    for key, value in (
+                        ("repeat_start", op.repeat_start),
+                        ("repeat_end", op.repeat_end),
+                    )
+                    if value is not None
+                }
+                await _update_measure(db, sequence_id, op.position, values)
+            case SetEndingOp():
+                await _update_measure(
+                    db, sequence_id, op.position, {"ending_number": op.ending_number}
+                )
+
+
+_MEASURE_FIELDS = ("repeat_start", "repeat_end", "ending_number")
+
+
+async def _delete_by_id(db: AsyncSession, table: Table, ids: list[uuid.UUID]) -> None:
+    """Delete rows of ``table`` by id, ``_DELETE_CHUNK_SIZE`` ids per statement."""
+    for start in range(0, len(ids), _DELETE_CHUNK_SIZE):
+        chunk = ids[start : start + _DELETE_CHUNK_SIZE]
+        await db.execute(delete(table).where(table.c.id.in_(chunk)))
+
+
+async def save_measures_diff(
+    db: AsyncSession, sequence_id: uuid.UUID, measures: list[SequenceMeasureIn]
+) -> int:
+    """Bring the stored measures in line with ``measures``, writing only what differs.
+
+    Measures are matched on ``position`` and beats on ``beat_position``. Changes are
+    grouped into one executemany per statement kind, and the number of rows inserted,
+    updated or deleted is returned.
+    """
+    measure_table = SequenceMeasure.__table__
+    beat_table = SequenceBeat.__table__
+
+    stored_measures = {
+        row.position: row
+        for row in await db.execute(
+            select(
+                measure_table.c.id,
+                measure_table.c.position,
+                *(measure_table.c[field] for field in _MEASURE_FIELDS),
+            ).where(measure_table.c.sequence_id == sequence_id)
+        )
+    }
+    stored_beats: dict[uuid.UUID, dict[int, tuple[uuid.UUID, uuid.UUID | None]]] = {}
+    for row in await db.execute(
+        select(
+            beat_table.c.id,
+            beat_table.c.measure_id,
+            beat_table.c.beat_position,
+            beat_table.c.chord_id,
+        )
+        .join(measure_table, measure_table.c.id == beat_table.c.measure_id)
+        .where(measure_table.c.sequence_id == sequence_id)
+    ):
+        stored_beats.setdefault(row.measure_id, {})[row.beat_position] = (row.id, row.chord_id)
+
+    new_measures: list[SequenceMeasureIn] = []
+    measure_updates: list[dict] = []
+    beat_inserts: list[dict] = []
+    beat_updates: list[dict] = []
+    deleted_beat_ids: list[uuid.UUID] = []
+
+    for measure in measures:
+        stored = stored_measures.pop(measure.position, None)
+        if stored is None:
+            new_measures.append(measure)
+            continue
+
+        values = {field: getattr(measure, field) for field in _MEASURE_FIELDS}
+        if any(getattr(stored, field) != value for field, value in values.items()):
+            measure_updates.append({"b_id": stored.id, **values})
+
+        beats = stored_beats.get(stored.id, {})
+        for beat in measure.beats:
+            existing = beats.pop(beat.beat_position, None)
+            if existing is None:
+                beat_inserts.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "measure_id": stored.id,
+                        "beat_position": beat.beat_position,
+                        "chord_id": beat.chord_id,
+                    }
+                )
+            elif existing[1] != beat.chord_id:
+                beat_updates.append({"b_id": existing[0], "chord_id": beat.chord_id})
+        deleted_beat_ids.extend(beat_id for beat_id, _ in beats.values())
+
+    deleted_measure_ids = [row.id for row in stored_measures.values()]
+    deleted_beat_ids.extend(
+        beat_id
+        for measure_id in deleted_measure_ids
+        for beat_id, _ in stored_beats.get(measure_id, {}).values()
+    )
+
+    await _delete_by_id(db, beat_table, deleted_beat_ids)
+    await _delete_by_id(db, measure_table, deleted_measure_ids)
+    if measure_updates:
+        await db.execute(
+            update(measure_table)
+            .where(measure_table.c.id == bindparam("b_id"))
+            .values(updated_at=func.now()),
+            measure_updates,
+        )
+    if beat_updates:
+        await db.execute(
+            update(beat_table)
+            .where(beat_table.c.id == bindparam("b_id"))
+            .values(updated_at=func.now()),
+            beat_updates,
+        )
+    if beat_inserts:
+        await db.execute(insert(beat_table), beat_inserts)
+    await insert_measures(db, sequence_id, new_measures)
+
+    written = (
+        len(deleted_beat_ids)
+        + len(deleted_measure_ids)
+        + len(measure_updates)
+        + len(beat_updates)
+        + len(beat_inserts)
+        + len(new_measures)
+        + sum(len(measure.beats) for measure in new_measures)
+    )
+    return written
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 
+from database.replica import ReplicaStickinessMiddleware, replica_engine
 from routers.auth import router as auth_router
 from routers.chords import router as chords_router
 from routers.collaborators import router as collaborators_router
@@ -11,6 +12,9 @@ from routers.songs import router as songs_router
 
 app = FastAPI(title="Chord Tracker API", version="0.1.0")
 
+if replica_engine is not None:
+    app.add_middleware(ReplicaStickinessMiddleware)
+
 app.include_router(health_router, prefix="/api", tags=["health"])
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(projects_router, prefix="/api/projects", tags=["projects"])
@@ -2,4 +2,6 @@ from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
-    pass
+    # Fetch server-generated columns (created_at, updated_at, ...) with RETURNING as part
+    # of the INSERT or UPDATE itself, so handlers need no refresh after commit.
+    __mapper_args__ = {"eager_defaults": True}
@@ -1,23 +1,38 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, event, func
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from music.chords import shape_fingerprint
+
 from .base import Base
 
 
 class Chord(Base):
     __tablename__ = "chords"
+    __table_args__ = (
+        Index("ix_chords_song_id_rank_key", "song_id", "rank_key", unique=True),
+        Index("ix_chords_song_shape", "song_id", "shape_fingerprint", "shape_offset"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     markers: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
-    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Orders the song's chords; see database.chord_ranks. Compared byte-wise, hence the
+    # "C" collation on PostgreSQL.
+    rank_key: Mapped[str] = mapped_column(
+        String(64).with_variant(String(64, collation="C"), "postgresql"), nullable=False
+    )
     string_count: Mapped[int] = mapped_column(Integer, nullable=False, default=6)
     tuning: Mapped[str] = mapped_column(String(50), nullable=False, default="EADGBE")
     starting_fret: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Derived from markers, tuning and string_count on every ORM flush; see
+    # music.chords.shape_fingerprint. Null for a chord with no markers. Unbounded: it
+    # grows with the tuning's string count and the frets played.
+    shape_fingerprint: Mapped[str | None] = mapped_column(Text, nullable=True)
+    shape_offset: Mapped[int | None] = mapped_column(Integer, nullable=True)
     song_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("songs.id", ondelete="CASCADE"),
@@ -31,4 +46,17 @@ class Chord(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
+    # Index in the song's rank_key order. Not stored: routers fill it in on the chords they
+    # return (ChordResponse.position).
+    position = 0
+
     song: Mapped["Song"] = relationship(back_populates="chords")  # noqa: F821
+
+
+@event.listens_for(Chord, "before_insert")
+@event.listens_for(Chord, "before_update")
+def _set_shape(mapper, connection, chord: Chord) -> None:
+    shape = shape_fingerprint(
+        chord.markers or [], chord.tuning or "EADGBE", chord.string_count or 6
+    )
+    chord.shape_fingerprint, chord.shape_offset = shape or (None, None)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from enum import StrEnum
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,7 +30,11 @@ class CollaboratorStatus(StrEnum):
 
 class ProjectCollaborator(Base):
     __tablename__ = "project_collaborators"
-    __table_args__ = (UniqueConstraint("project_id", "invitee_id", name="uq_project_collaborator"),)
+    __table_args__ = (
+        UniqueConstraint("project_id", "invitee_id", name="uq_project_collaborator"),
+        Index("ix_project_collaborators_invitee_id_status", "invitee_id", "status"),
+        Index("ix_project_collaborators_project_id_created_at", "project_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(
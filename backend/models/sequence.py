@@ -22,6 +22,8 @@ class Sequence(Base):
     time_signature_numerator: Mapped[int] = mapped_column(Integer, nullable=False, default=4)
     time_signature_denominator: Mapped[int] = mapped_column(Integer, nullable=False, default=4)
     measures_per_line: Mapped[int] = mapped_column(Integer, nullable=False, default=4)
+    # Incremented on every write to the sequence or its measures; exposed as the ETag.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -0,0 +1,79 @@
+"""Turn stored chord diagrams into MIDI pitches."""
+
+import re
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+
+_NOTE_CLASSES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+_ACCIDENTALS = {"": 0, "#": 1, "b": -1}
+_TUNING_NOTE = re.compile(r"([A-G])([#b]?)")
+
+# MIDI range the lowest open string is placed in (C2-B2), which puts standard EADGBE
+# guitar tuning at its usual E2-E4.
+_LOWEST_STRING_FLOOR = 36
+
+
+def note_class(name: str) -> int:
+    """Pitch class (C=0 .. B=11) of a note name such as "E", "F#" or "Bb"."""
+    match = _TUNING_NOTE.fullmatch(name)
+    if match is None:
+        raise ValueError(f"Invalid note name: {name!r}")
+    letter, accidental = match.groups()
+    return (_NOTE_CLASSES[letter] + _ACCIDENTALS[accidental]) % 12
+
+
+@lru_cache(maxsize=256)
+def parse_tuning(tuning: str) -> tuple[int, ...]:
+    """MIDI pitches of the open strings, lowest string first.
+
+    ``tuning`` lists note names from the lowest string up ("EADGBE", "DADF#AD"). Each
+    string is pitched at the first octave above the string before it.
+    """
+    pitches: list[int] = []
+    for match in _TUNING_NOTE.finditer(tuning):
+        pitch_class = note_class(match.group())
+        floor = pitches[-1] + 1 if pitches else _LOWEST_STRING_FLOOR
+        pitches.append(floor + (pitch_class - floor) % 12)
+    return tuple(pitches)
+
+
+def chord_pitches(markers: Iterable[Mapping], tuning: str, string_count: int) -> list[int]:
+    """Sorted MIDI pitches sounded by a chord's markers.
+
+    Marker ``string`` 0 is the highest-pitched string, so it maps to the last tuning
+    note; ``fret`` is absolute (0 is the open string) and independent of the
+    diagram's ``starting_fret`` window. Markers on strings the tuning does not cover are
+    skipped.
+    """
+    open_strings = parse_tuning(tuning)[:string_count]
+    pitches = set()
+    for marker in markers:
+        index = string_count - 1 - marker["string"]
+        if 0 <= index < len(open_strings) and marker["fret"] >= 0:
+            pitches.add(open_strings[index] + marker["fret"])
+    return sorted(pitches)
+
+
+def shape_fingerprint(
+    markers: Iterable[Mapping], tuning: str, string_count: int
+) -> tuple[str, int] | None:
+    """Normalized (fingerprint, offset) of a chord's fretboard shape, or None if empty.
+
+    The fingerprint is the open-string pitches followed by each string's fret relative to
+    the lowest sounded fret ("x" for a muted string), lowest string first; ``offset`` is
+    that lowest fret. Two diagrams are the same shape when their fingerprints match and
+    the same chord when their offsets match too, so a shape moved along the neck keeps
+    its fingerprint. Open strings count as fret 0 and move with the shape.
+    """
+    open_strings = parse_tuning(tuning)[:string_count]
+    frets: list[int | None] = [None] * len(open_strings)
+    for marker in markers:
+        index = string_count - 1 - marker["string"]
+        if 0 <= index < len(frets) and marker["fret"] >= 0:
+            frets[index] = max(frets[index] or 0, marker["fret"])
+    sounded = [fret for fret in frets if fret is not None]
+    if not sounded:
+        return None
+    offset = min(sounded)
+    shape = ".".join("x" if fret is None else str(fret - offset) for fret in frets)
+    return f"{'.'.join(map(str, open_strings))}/{shape}", offset
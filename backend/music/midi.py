@@ -0,0 +1,163 @@
+"""Standard MIDI File (format 0) writer that emits the file as a stream of chunks."""
+
+import struct
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+from music.timeline import NO_CHORD, Timeline
+
+TICKS_PER_QUARTER = 480
+# General MIDI program 26, "Acoustic Guitar (steel)", zero-based.
+DEFAULT_PROGRAM = 25
+DEFAULT_VELOCITY = 80
+
+_CHUNK_BYTES = 64 * 1024
+_END_OF_TRACK = b"\xff\x2f\x00"
+# Largest microseconds-per-quarter a 3-byte tempo event holds.
+_MAX_QUARTER_US = 0xFFFFFF
+# Powers of two that divide a whole note into whole ticks.
+_DENOMINATORS = frozenset(2**exponent for exponent in range(8))
+
+
+def _varlen(value: int) -> bytes:
+    """Encode a MIDI variable-length quantity."""
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def _tempo_event(microseconds_per_quarter: int) -> bytes:
+    return b"\xff\x51\x03" + microseconds_per_quarter.to_bytes(3, "big")
+
+
+def _quarter_microseconds(timeline: Timeline, denominator: int) -> np.ndarray:
+    """Each beat's tempo as microseconds per quarter note."""
+    return np.rint(timeline.duration * 1_000_000 * denominator / 4).astype(np.int64)
+
+
+def check_midi_range(
+    timeline: Timeline,
+    chord_pitches: Sequence[Sequence[int]],
+    numerator: int,
+    denominator: int,
+) -> None:
+    """Raise ValueError if the tempos, pitches or time signature cannot be written as MIDI.
+
+    A tempo event holds microseconds per quarter in 3 bytes, so nothing slower than about
+    3.58 bpm; pitches are data bytes (0-127); the time signature stores the numerator in a
+    byte and the denominator as a power of two, which must also leave whole ticks per
+    beat. ``midi_file_chunks`` is lazy, so callers run this before streaming starts.
+    """
+    if _quarter_microseconds(timeline, denominator).max(initial=0) > _MAX_QUARTER_US:
+        raise ValueError("Tempo is too slow for MIDI: a quarter note must last under 16.8 s")
+    for pitches in chord_pitches:
+        for pitch in pitches:
+            if not 0 <= pitch <= 127:
+                raise ValueError(f"Pitch {pitch} is outside the MIDI range 0-127")
+    if not 1 <= numerator <= 255:
+        raise ValueError(f"Time signature numerator {numerator} is not between 1 and 255")
+    if denominator not in _DENOMINATORS:
+        raise ValueError(
+            f"Time signature denominator {denominator} is not a power of two up to 128"
+        )
+
+
+def _track_events(
+    timeline: Timeline,
+    chord_pitches: Sequence[Sequence[int]],
+    numerator: int,
+    denominator: int,
+    program: int,
+    velocity: int,
+) -> Iterator[bytes]:
+    """Yield the track's events in order, a few bytes per event.
+
+    A chord sounds from its beat until the next beat that carries a chord (or the end
+    of the song); beats without a chord let the previous chord ring. Tempo events are
+    emitted wherever the timeline's beat length changes.
+    """
+    ticks_per_beat = TICKS_PER_QUARTER * 4 // denominator
+    quarter_us = _quarter_microseconds(timeline, denominator)
+
+    time_signature = bytes([numerator, denominator.bit_length() - 1, 24, 8])
+    yield b"\x00\xff\x58\x04" + time_signature
+    yield b"\x00" + bytes([0xC0, program & 0x7F])
+
+    # Each chord's note-ons (and note-offs) as one block of zero-delta events.
+    note_ons = [
+        b"\x00".join(bytes([0x90, pitch, velocity]) for pitch in pitches)
+        for pitches in chord_pitches
+    ]
+    note_offs = [
+        b"\x00".join(bytes([0x80, pitch, 0]) for pitch in pitches) for pitches in chord_pitches
+    ]
+
+    chord_beats = np.flatnonzero(timeline.chord != NO_CHORD)
+    tempo_beats = np.flatnonzero(np.diff(quarter_us, prepend=-1))
+    events = np.union1d(chord_beats, tempo_beats)
+    event_rows = zip(
+        events.tolist(),
+        np.where(np.isin(events, chord_beats), timeline.chord[events], NO_CHORD).tolist(),
+        np.where(np.isin(events, tempo_beats), quarter_us[events], 0).tolist(),
+        strict=True,
+    )
+    sounding = NO_CHORD
+    last_tick = 0
+
+    for beat, chord, tempo in event_rows:
+        tick = beat * ticks_per_beat
+        delta = tick - last_tick
+        last_tick = tick
+        if tempo:
+            yield _varlen(delta) + _tempo_event(tempo)
+            delta = 0
+        if chord != NO_CHORD:
+            block = b"\x00".join(
+                messages
+                for messages in (
+                    note_offs[sounding] if sounding != NO_CHORD else b"",
+                    note_ons[chord],
+                )
+                if messages
+            )
+            if block:
+                yield _varlen(delta) + block
+            sounding = chord
+
+    delta = len(timeline.chord) * ticks_per_beat - last_tick
+    if sounding != NO_CHORD and note_offs[sounding]:
+        yield _varlen(delta) + note_offs[sounding]
+        delta = 0
+    yield _varlen(delta) + _END_OF_TRACK
+
+
+def midi_file_chunks(
+    timeline: Timeline,
+    chord_pitches: Sequence[Sequence[int]],
+    numerator: int,
+    denominator: int,
+    program: int = DEFAULT_PROGRAM,
+    velocity: int = DEFAULT_VELOCITY,
+) -> Iterator[bytes]:
+    """Yield a complete .mid file in chunks of about 64 KiB.
+
+    ``chord_pitches[code]`` are the MIDI pitches of timeline chord ``code``, already
+    checked by ``check_midi_range``. The track
+    length must precede its events, so events are generated twice: once to measure
+    them and once to emit them. Neither pass holds more than one chunk in memory.
+    """
+    args = (timeline, chord_pitches, numerator, denominator, program, velocity)
+    track_length = sum(map(len, _track_events(*args)))
+
+    buffer = bytearray(b"MThd" + struct.pack(">IHHH", 6, 0, 1, TICKS_PER_QUARTER))
+    buffer += b"MTrk" + struct.pack(">I", track_length)
+    for event in _track_events(*args):
+        buffer += event
+        if len(buffer) >= _CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    yield bytes(buffer)
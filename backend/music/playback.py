@@ -0,0 +1,77 @@
+"""Unroll repeat barlines and numbered endings into the order measures are played."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Protocol
+
+
+class RepeatMarks(Protocol):
+    repeat_start: bool
+    repeat_end: bool
+    ending_number: int | None
+
+
+@dataclass
+class _Repeat:
+    start: int
+    passes: int = 1
+    # repeat_end indices that already sent playback back to ``start``.
+    jumped_from: set[int] = field(default_factory=set)
+    last_end: int = -1
+
+
+def expand_repeats(measures: Sequence[RepeatMarks], limit: int | None = None) -> list[int]:
+    """Return indices into ``measures`` in playback order.
+
+    - A ``repeat_end`` sends playback back to the innermost open ``repeat_start``, or,
+      if none is open, to the measure after the previous repeated section.
+    - Each ``repeat_end`` jumps back once per visit to its section. A section with 1st
+      and 2nd endings that both end in ``repeat_end`` is therefore played three times.
+    - A measure with ``ending_number`` n is only played on pass n of the innermost
+      section, and its ``repeat_end`` is ignored on passes where it is skipped.
+    - A section closes at the first measure without an ending after its last jump.
+      Repeats nested inside an outer section are played again on each outer pass.
+
+    Runs in time linear in the length of the result; each measure visit is O(1). Nested
+    repeats multiply, so the result can grow exponentially with nesting depth: with
+    ``limit`` set, a ValueError is raised as soon as the result would exceed it.
+    """
+    order: list[int] = []
+    stack: list[_Repeat] = []
+    section_start = 0
+    i = 0
+    while i < len(measures):
+        measure = measures[i]
+
+        while (
+            stack
+            and measure.ending_number is None
+            and stack[-1].jumped_from
+            and i > stack[-1].last_end
+        ):
+            section_start = stack.pop().last_end + 1
+
+        if measure.repeat_start and not (stack and stack[-1].start == i):
+            stack.append(_Repeat(start=i))
+
+        if stack and measure.ending_number not in (None, stack[-1].passes):
+            i += 1
+            continue
+
+        if len(order) == limit:
+            raise ValueError(f"Playback is longer than {limit} measures")
+        order.append(i)
+
+        if measure.repeat_end:
+            if not stack:
+                stack.append(_Repeat(start=section_start))
+            repeat = stack[-1]
+            if i not in repeat.jumped_from:
+                repeat.jumped_from.add(i)
+                repeat.last_end = max(repeat.last_end, i)
+                repeat.passes += 1
+                i = repeat.start
+                continue
+        i += 1
+
+    return order
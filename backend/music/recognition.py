@@ -0,0 +1,138 @@
+"""Name a chord voicing (root, quality, extensions, inversion) from its pitches.
+
+Every combination of pitch-class set and bass note is resolved once, at import, into
+a flat table indexed by ``mask * 12 + bass``; identifying a voicing is then a bitmask
+build plus one list lookup.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+from music.chords import chord_pitches
+
+NOTE_NAMES = ("C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B")
+
+# (suffix, intervals above the root), simplest first: when a pitch-class set can be
+# spelled several ways, the earlier quality wins unless a later one puts its root in the
+# bass. Entries without a 5th cover the common guitar voicings that omit it.
+QUALITIES: tuple[tuple[str, tuple[int, ...]], ...] = (
+    ("", (0, 4, 7)),
+    ("m", (0, 3, 7)),
+    ("5", (0, 7)),
+    ("7", (0, 4, 7, 10)),
+    ("m7", (0, 3, 7, 10)),
+    ("maj7", (0, 4, 7, 11)),
+    ("sus4", (0, 5, 7)),
+    ("sus2", (0, 2, 7)),
+    ("dim", (0, 3, 6)),
+    ("aug", (0, 4, 8)),
+    ("6", (0, 4, 7, 9)),
+    ("m6", (0, 3, 7, 9)),
+    ("m7b5", (0, 3, 6, 10)),
+    ("dim7", (0, 3, 6, 9)),
+    ("7sus4", (0, 5, 7, 10)),
+    ("add9", (0, 2, 4, 7)),
+    ("madd9", (0, 2, 3, 7)),
+    ("mMaj7", (0, 3, 7, 11)),
+    ("aug7", (0, 4, 8, 10)),
+    ("9", (0, 2, 4, 7, 10)),
+    ("m9", (0, 2, 3, 7, 10)),
+    ("maj9", (0, 2, 4, 7, 11)),
+    ("6/9", (0, 2, 4, 7, 9)),
+    ("7b9", (0, 1, 4, 7, 10)),
+    ("7#9", (0, 3, 4, 7, 10)),
+    ("11", (0, 2, 4, 5, 7, 10)),
+    ("m11", (0, 2, 3, 5, 7, 10)),
+    ("13", (0, 2, 4, 7, 9, 10)),
+    ("maj13", (0, 2, 4, 7, 9, 11)),
+    ("7", (0, 4, 10)),
+    ("m7", (0, 3, 10)),
+    ("maj7", (0, 4, 11)),
+    ("9", (0, 2, 4, 10)),
+    ("13", (0, 4, 9, 10)),
+)
+
+# Preferring a spelling with its root in the bass is worth this many places in QUALITIES.
+_ROOT_IN_BASS_BONUS = 12
+
+# Inversion implied by the bass note's interval above the root.
+_INVERSIONS = {0: 0, 3: 1, 4: 1, 6: 2, 7: 2, 8: 2, 9: 3, 10: 3, 11: 3}
+_SUSPENDED_INVERSION = 1
+_ADDED_TONE_INVERSION = 4
+
+
+def _inversion(suffix: str, interval: int) -> int:
+    if interval in _INVERSIONS:
+        return _INVERSIONS[interval]
+    return _SUSPENDED_INVERSION if "sus" in suffix else _ADDED_TONE_INVERSION
+
+
+@dataclass(frozen=True)
+class ChordIdentity:
+    root: int
+    quality: str
+    bass: int
+    # 0 root position; 1 third (or suspended tone), 2 fifth, 3 sixth or seventh in the
+    # bass; 4 an added tone such as the 9th in the bass.
+    inversion: int
+
+    @property
+    def symbol(self) -> str:
+        name = NOTE_NAMES[self.root] + self.quality
+        return name if self.bass == self.root else f"{name}/{NOTE_NAMES[self.bass]}"
+
+
+def _mask(pitch_classes: Iterable[int]) -> int:
+    mask = 0
+    for pitch_class in pitch_classes:
+        mask |= 1 << pitch_class
+    return mask
+
+
+def _rotate(mask: int, root: int) -> int:
+    """Re-express ``mask`` relative to ``root`` (bit 0 becomes the root)."""
+    return ((mask >> root) | (mask << (12 - root))) & 0xFFF
+
+
+def _build_table() -> list[ChordIdentity | None]:
+    qualities: dict[int, tuple[int, str]] = {}
+    for rank, (suffix, intervals) in enumerate(QUALITIES):
+        qualities.setdefault(_mask(intervals), (rank, suffix))
+
+    table: list[ChordIdentity | None] = [None] * (4096 * 12)
+    for mask in range(1, 4096):
+        spellings = [
+            (root, qualities[rotated])
+            for root in range(12)
+            if mask >> root & 1 and (rotated := _rotate(mask, root)) in qualities
+        ]
+        if not spellings:
+            continue
+        for bass in range(12):
+            if not mask >> bass & 1:
+                continue
+            root, (_, suffix) = min(
+                spellings,
+                key=lambda s, bass=bass: s[1][0] - _ROOT_IN_BASS_BONUS * (s[0] == bass),
+            )
+            inversion = _inversion(suffix, (bass - root) % 12)
+            table[mask * 12 + bass] = ChordIdentity(root, suffix, bass, inversion)
+    return table
+
+
+_TABLE = _build_table()
+
+
+def identify(pitches: Iterable[int]) -> ChordIdentity | None:
+    """Name the chord formed by MIDI ``pitches``, or None if it matches no known quality."""
+    pitches = list(pitches)
+    if not pitches:
+        return None
+    return _TABLE[_mask(pitch % 12 for pitch in pitches) * 12 + min(pitches) % 12]
+
+
+def identify_voicing(
+    markers: Iterable[Mapping], tuning: str, string_count: int
+) -> ChordIdentity | None:
+    """Name a stored chord diagram."""
+    return identify(chord_pitches(markers, tuning, string_count))
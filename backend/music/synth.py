@@ -0,0 +1,117 @@
+"""Plucked-string (Karplus-Strong) rendering of a timeline to 16-bit mono PCM."""
+
+import struct
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+from music.timeline import NO_CHORD, Timeline
+
+DEFAULT_SAMPLE_RATE = 22050
+# How long a pluck is synthesized; after this the string is treated as silent.
+RING_SECONDS = 4.0
+STRUM_SECONDS = 0.012
+DECAY = 0.996
+FADE_SECONDS = 0.005
+
+_CHUNK_SAMPLES = 16384
+# Strums kept per render, least recently used evicted; each is RING_SECONDS of samples.
+_STRUM_CACHE_SIZE = 16
+
+
+def pluck(pitch: int, length: int, sample_rate: int) -> np.ndarray:
+    """Karplus-Strong string: a noise burst recirculated through a decaying average.
+
+    Each pass over the delay line is one NumPy operation on a period-sized buffer, so
+    the Python loop runs once per period rather than once per sample. The noise is
+    seeded by pitch, so renders are reproducible and safe to cache by content.
+    """
+    frequency = 440.0 * 2 ** ((pitch - 69) / 12)
+    period = max(2, round(sample_rate / frequency))
+    block = np.random.default_rng(pitch).uniform(-1.0, 1.0, period)
+    out = np.empty(-(-length // period) * period)
+    for start in range(0, len(out), period):
+        out[start : start + period] = block
+        block = DECAY * 0.5 * (block + np.roll(block, 1))
+    return out[:length]
+
+
+def strum(pitches: Sequence[int], sample_rate: int) -> np.ndarray:
+    """The ring of a chord strummed low string to high, ``RING_SECONDS`` long."""
+    length = int(RING_SECONDS * sample_rate)
+    out = np.zeros(length)
+    offset = int(STRUM_SECONDS * sample_rate)
+    for index, pitch in enumerate(sorted(pitches)):
+        start = min(index * offset, length)
+        out[start:] += pluck(pitch, length - start, sample_rate)
+    return out * (0.5 / np.sqrt(max(len(pitches), 1)))
+
+
+def _to_pcm(samples: np.ndarray) -> bytes:
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def sample_count(timeline: Timeline, sample_rate: int) -> int:
+    return round(timeline.total_duration * sample_rate)
+
+
+def pcm_chunks(
+    timeline: Timeline, chord_pitches: Sequence[Sequence[int]], sample_rate: int
+) -> Iterator[bytes]:
+    """Yield the song as little-endian 16-bit mono PCM, a bounded chunk at a time.
+
+    A chord rings from its beat until the next chord, which damps it with a short
+    fade; beats without a chord let the previous one ring on. Strums are reused from a
+    small LRU cache, so memory stays flat however long the song or however many chords
+    it has.
+    """
+    total = sample_count(timeline, sample_rate)
+    chord_beats = np.flatnonzero(timeline.chord != NO_CHORD)
+    boundaries = np.rint(timeline.start[chord_beats] * sample_rate).astype(np.int64).tolist()
+    codes = timeline.chord[chord_beats].tolist()
+    fade = np.linspace(1.0, 0.0, int(FADE_SECONDS * sample_rate))
+    strums: OrderedDict[int, np.ndarray] = OrderedDict()
+
+    silence_until = boundaries[0] if boundaries else total
+    for start in range(0, silence_until, _CHUNK_SAMPLES):
+        yield bytes(2 * min(_CHUNK_SAMPLES, silence_until - start))
+
+    for index, (begin, code) in enumerate(zip(boundaries, codes, strict=True)):
+        end = boundaries[index + 1] if index + 1 < len(boundaries) else total
+        if code in strums:
+            strums.move_to_end(code)
+        else:
+            strums[code] = strum(chord_pitches[code], sample_rate)
+            if len(strums) > _STRUM_CACHE_SIZE:
+                strums.popitem(last=False)
+        ring = strums[code][: end - begin].copy()
+        if end < total and len(ring) == end - begin and len(ring) >= len(fade):
+            ring[-len(fade) :] *= fade
+        for start in range(0, end - begin, _CHUNK_SAMPLES):
+            piece = ring[start : start + _CHUNK_SAMPLES]
+            stop = min(start + _CHUNK_SAMPLES, end - begin)
+            if len(piece) < stop - start:
+                piece = np.concatenate((piece, np.zeros(stop - start - len(piece))))
+            yield _to_pcm(piece)
+
+
+def wav_header(samples: int, sample_rate: int) -> bytes:
+    """RIFF/WAVE header for ``samples`` frames of 16-bit mono PCM."""
+    data_bytes = samples * 2
+    return (
+        b"RIFF"
+        + struct.pack("<I", 36 + data_bytes)
+        + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data"
+        + struct.pack("<I", data_bytes)
+    )
+
+
+def wav_chunks(
+    timeline: Timeline, chord_pitches: Sequence[Sequence[int]], sample_rate: int
+) -> Iterator[bytes]:
+    """Yield a complete .wav file; its size is known from the timeline up front."""
+    yield wav_header(sample_count(timeline, sample_rate), sample_rate)
+    yield from pcm_chunks(timeline, chord_pitches, sample_rate)
@@ -0,0 +1,96 @@
+"""Absolute beat timestamps for a sequence, computed over whole-song NumPy arrays."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+NO_CHORD = -1
+
+
+@dataclass(frozen=True)
+class Timeline:
+    """One entry per played beat, as parallel arrays in playback order."""
+
+    measure_index: np.ndarray  # index of the measure in playback order
+    position: np.ndarray  # stored measure position
+    beat_position: np.ndarray  # 1-based beat within the measure
+    start: np.ndarray  # seconds from the start of the song
+    duration: np.ndarray  # seconds
+    chord: np.ndarray  # row of the chord grid's code, or NO_CHORD
+
+    @property
+    def total_duration(self) -> float:
+        return float(self.start[-1] + self.duration[-1]) if len(self.start) else 0.0
+
+
+def build_timeline(
+    order: np.ndarray,
+    chord_grid: np.ndarray,
+    denominator: int,
+    tempo: float,
+    tempo_changes: Mapping[int, float] | None = None,
+    positions: np.ndarray | None = None,
+) -> Timeline:
+    """Lay out every beat of the played measures on an absolute time axis.
+
+    Measures are addressed by index, 0..n-1 for the n rows of ``chord_grid``.
+    ``order`` is the measure indexes in playback order (see music.playback) and
+    ``chord_grid[index, beat - 1]`` the chord code on each beat, so its width is the
+    time signature numerator. ``tempo`` is in quarter notes per minute; a beat lasts
+    ``60 / tempo * 4 / denominator`` seconds. ``tempo_changes`` maps a measure index to
+    the tempo that applies from the start of that measure, each time it is played,
+    until the next change. ``positions`` gives each measure's stored position for
+    ``Timeline.position``; without it the index is used.
+
+    Raises ValueError for an index in ``order`` or ``tempo_changes`` outside 0..n-1.
+    """
+    measure_count, numerator = chord_grid.shape
+    order = np.asarray(order, dtype=np.int64)
+    if len(order) and not (0 <= order.min() and order.max() < measure_count):
+        raise ValueError("Playback order refers to a measure outside the chord grid")
+
+    measure_tempo = np.full(len(order), float(tempo))
+    if tempo_changes:
+        changed_positions = np.fromiter(tempo_changes.keys(), dtype=np.int64)
+        changed_tempos = np.fromiter(tempo_changes.values(), dtype=np.float64)
+        if not (0 <= changed_positions.min() and changed_positions.max() < measure_count):
+            raise ValueError("Tempo change refers to a measure outside the chord grid")
+        lookup = np.full(measure_count, -1)
+        lookup[changed_positions] = np.arange(len(changed_positions))
+        change = lookup[order]
+        # Forward-fill: each measure takes the most recent change at or before it.
+        latest = np.maximum.accumulate(np.where(change >= 0, np.arange(len(order)), -1))
+        has_change = latest >= 0
+        measure_tempo[has_change] = changed_tempos[change[latest[has_change]]]
+
+    beat_seconds = 60.0 / measure_tempo * 4.0 / denominator
+    measure_start = np.concatenate(([0.0], np.cumsum(beat_seconds * numerator)[:-1]))
+    beat_offsets = np.arange(numerator)
+
+    return Timeline(
+        measure_index=np.repeat(np.arange(len(order)), numerator),
+        position=np.repeat(order if positions is None else positions[order], numerator),
+        beat_position=np.tile(beat_offsets + 1, len(order)),
+        start=(measure_start[:, None] + beat_offsets[None, :] * beat_seconds[:, None]).ravel(),
+        duration=np.repeat(beat_seconds, numerator),
+        chord=chord_grid[order].ravel(),
+    )
+
+
+def chord_grid_from_beats(
+    positions: np.ndarray,
+    beat_positions: np.ndarray,
+    codes: np.ndarray,
+    measure_count: int,
+    numerator: int,
+) -> np.ndarray:
+    """Scatter stored beats into a ``(measure_count, numerator)`` grid of chord codes.
+
+    ``positions`` are measure indexes, 0..measure_count-1, not stored positions. Beats
+    beyond the numerator (left over from a longer time signature) are dropped.
+    """
+    grid = np.full((measure_count, numerator), NO_CHORD, dtype=np.int64)
+    keep = (beat_positions >= 1) & (beat_positions <= numerator)
+    grid[positions[keep], beat_positions[keep] - 1] = codes[keep]
+    return grid
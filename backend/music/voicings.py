@@ -0,0 +1,181 @@
+"""Enumerate playable voicings of a chord symbol on any tuning.
+
+The search walks the strings from lowest to highest, choosing a fret (or a mute) for
+each one, and abandons a partial fingering as soon as it stretches too far, needs too
+many fingers, or can no longer reach every chord tone. Results are memoized per
+(symbol, tuning, string count, fret window).
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from music.chords import note_class, parse_tuning
+from music.recognition import QUALITIES
+
+# Widest distance between the lowest and highest fretted notes.
+MAX_STRETCH = 3
+MAX_FINGERS = 4
+MIN_SOUNDED_STRINGS = 3
+
+# Highest fret the generator will search up to.
+MAX_FRET = 24
+
+_SYMBOL = re.compile(r"([A-G][#b]?)(.*)")
+# Every spelling of each quality, full chord first; later ones leave out the 5th.
+_SPELLINGS: dict[str, list[tuple[int, ...]]] = {}
+for _suffix, _intervals in QUALITIES:
+    _SPELLINGS.setdefault(_suffix, []).append(_intervals)
+
+
+@dataclass(frozen=True)
+class Voicing:
+    # Fret per string, lowest string first; None for a muted string, 0 for open.
+    frets: tuple[int | None, ...]
+    stretch: int
+    fingers: int
+
+    @property
+    def markers(self) -> list[dict[str, int]]:
+        """Markers in stored chord form: string 0 is the highest-pitched string."""
+        count = len(self.frets)
+        return [
+            {"string": count - 1 - index, "fret": fret}
+            for index, fret in enumerate(self.frets)
+            if fret is not None
+        ]
+
+    @property
+    def starting_fret(self) -> int:
+        """Diagram window that shows every fretted note (five frets wide)."""
+        fretted = [fret for fret in self.frets if fret]
+        if not fretted or max(fretted) <= 5:
+            return 0
+        return min(fretted) - 1
+
+
+def parse_symbol(symbol: str) -> tuple[int, list[tuple[int, ...]], int]:
+    """Split a chord symbol into (root class, spellings, bass class).
+
+    Accepts the suffixes in ``QUALITIES`` and an optional slash bass ("C/E", "Am7/G");
+    ``spellings`` are that suffix's interval sets, full chord first. Raises ValueError
+    for anything else.
+    """
+    match = _SYMBOL.fullmatch(symbol.strip())
+    if match is None:
+        raise ValueError(f"Unknown chord symbol: {symbol!r}")
+    root_name, suffix = match.groups()
+    root = note_class(root_name)
+    bass = root
+    # "6/9" is a quality, not a slash chord.
+    if suffix not in _SPELLINGS and "/" in suffix:
+        suffix, bass_name = suffix.rsplit("/", 1)
+        try:
+            bass = note_class(bass_name)
+        except ValueError:
+            raise ValueError(f"Unknown chord symbol: {symbol!r}") from None
+    if suffix not in _SPELLINGS:
+        raise ValueError(f"Unknown chord symbol: {symbol!r}")
+    return root, _SPELLINGS[suffix], bass
+
+
+def _fingers(frets: list[int | None]) -> int:
+    """Fingers needed to fret ``frets``, barring the lowest fret when it repeats.
+
+    A barre is only possible when no open string lies between its outer strings. Adding a
+    string never lowers the count, so it can prune partial fingerings.
+    """
+    fretted = [(index, fret) for index, fret in enumerate(frets) if fret]
+    if not fretted:
+        return 0
+    lowest = min(fret for _, fret in fretted)
+    barre = [index for index, fret in fretted if fret == lowest]
+    if len(barre) > 1 and 0 not in frets[barre[0] : barre[-1] + 1]:
+        return len(fretted) - len(barre) + 1
+    return len(fretted)
+
+
+def _rank(voicing: Voicing) -> tuple[int, ...]:
+    fretted = [fret for fret in voicing.frets if fret]
+    sounded = sum(fret is not None for fret in voicing.frets)
+    return (voicing.stretch, voicing.fingers, -sounded, min(fretted, default=0))
+
+
+@lru_cache(maxsize=1024)
+def generate_voicings(
+    symbol: str, tuning: str, string_count: int, min_fret: int = 0, max_fret: int = 12
+) -> tuple[Voicing, ...]:
+    """Every playable voicing of ``symbol``, easiest first.
+
+    Fretted notes lie in ``min_fret..max_fret``; open strings are always available. A
+    voicing sounds a contiguous run of strings with the bass note lowest, covers every
+    tone of exactly one of the quality's spellings (so the 5th is only left out where
+    ``QUALITIES`` lists a spelling without it), stretches at most ``MAX_STRETCH`` frets
+    and needs at most ``MAX_FINGERS`` fingers. Ranking is by stretch, then finger count,
+    then more strings sounded, then lower position.
+    """
+    root, spellings, bass = parse_symbol(symbol)
+    open_strings = parse_tuning(tuning)[:string_count]
+    if len(open_strings) < string_count:
+        raise ValueError(f"Tuning {tuning!r} does not cover {string_count} strings")
+    if not 0 <= min_fret <= max_fret <= MAX_FRET:
+        raise ValueError(f"Invalid fret window: {min_fret}..{max_fret}")
+
+    # Pitch-class sets a finished voicing may sound, exactly.
+    targets = [
+        sum(1 << (root + interval) % 12 for interval in intervals) | 1 << bass
+        for intervals in spellings
+    ]
+    tones = {(root + interval) % 12 for interval in spellings[0]} | {bass}
+    min_sounded = min(MIN_SOUNDED_STRINGS, string_count)
+
+    options = [
+        [
+            fret
+            for fret in (0, *range(max(min_fret, 1), max_fret + 1))
+            if (pitch + fret) % 12 in tones
+        ]
+        for pitch in open_strings
+    ]
+
+    found: list[Voicing] = []
+    frets: list[int | None] = [None] * string_count
+
+    def visit(
+        string: int, covered: int, low: int, high: int, sounded: int, lowest_pitch: int
+    ) -> None:
+        missing = min(
+            ((target & ~covered).bit_count() for target in targets if covered & ~target == 0),
+            default=string_count,
+        )
+        # Muting the remaining strings ends a voicing here.
+        if sounded >= min_sounded and not missing:
+            found.append(Voicing(tuple(frets), max(high - low, 0), _fingers(frets)))
+        if string == string_count or missing > string_count - string:
+            return
+
+        for fret in options[string]:
+            pitch = open_strings[string] + fret
+            if (pitch < lowest_pitch) if sounded else (pitch % 12 != bass):
+                continue
+            new_low, new_high = (min(low, fret), max(high, fret)) if fret else (low, high)
+            if new_high - new_low > MAX_STRETCH:
+                continue
+            frets[string] = fret
+            if _fingers(frets[: string + 1]) <= MAX_FINGERS:
+                visit(
+                    string + 1,
+                    covered | 1 << pitch % 12,
+                    new_low,
+                    new_high,
+                    sounded + 1,
+                    lowest_pitch if sounded else pitch,
+                )
+            frets[string] = None
+
+        if not sounded:
+            visit(string + 1, covered, low, high, sounded, lowest_pitch)
+
+    visit(0, 0, MAX_FRET, 0, 0, 0)
+    found.sort(key=_rank)
+    return tuple(found)
@@ -1,11 +1,19 @@
+import uuid
+
 import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from auth.passwords import hash_password, verify_password
-from auth.tokens import create_access_token, create_refresh_token, decode_token
+from auth.passwords import hash_password_async, verify_password_async
+from auth.project_access import load_project_roles
+from auth.tokens import (
+    ACCESS_TOKEN_ROLE_CLAIMS,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+)
 from database.session import get_db
 from models.user import User
 from schemas.user import RefreshRequest, TokenResponse, UserCreate, UserLogin, UserResponse
@@ -13,6 +21,22 @@ from schemas.user import RefreshRequest, TokenResponse, UserCreate, UserLogin, U
 router = APIRouter()
 
 
+async def _issue_access_token(user_id: uuid.UUID, db: AsyncSession) -> str:
+    """Mint an access token, embedding project role claims when that mode is enabled."""
+    if not ACCESS_TOKEN_ROLE_CLAIMS:
+        return create_access_token(user_id)
+
+    user = await db.get(User, user_id)
+    if not user:
+        return create_access_token(user_id)
+
+    # Read the version before the roles: a concurrent change then yields a stale version,
+    # which only sends the token back to the database path.
+    membership_version = user.membership_version
+    project_roles = await load_project_roles(user_id, db)
+    return create_access_token(user_id, project_roles, membership_version)
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)) -> User:
     result = await db.execute(select(User).where(User.email == user_data.email))
@@ -24,11 +48,10 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)) ->
 
     user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
     return user
 
 
@@ -37,20 +60,20 @@ async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)) -> Tok
     result = await db.execute(select(User).where(User.email == user_data.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not user or not await verify_password_async(user_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
     return TokenResponse(
-        access_token=create_access_token(user.id),
+        access_token=await _issue_access_token(user.id, db),
         refresh_token=create_refresh_token(user.id),
     )
 
 
 @router.post("/refresh")
-async def refresh(body: RefreshRequest) -> dict[str, str]:
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_db)) -> dict[str, str]:
     try:
         payload = decode_token(body.refresh_token)
     except jwt.ExpiredSignatureError:
@@ -70,8 +93,8 @@ async def refresh(body: RefreshRequest) -> dict[str, str]:
             detail="Invalid refresh token",
         )
 
-    user_id = payload["sub"]
-    return {"access_token": create_access_token(user_id)}
+    user_id = uuid.UUID(payload["sub"])
+    return {"access_token": await _issue_access_token(user_id, db)}
 
 
 @router.get("/me", response_model=UserResponse)
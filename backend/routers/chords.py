@@ -1,66 +1,249 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import Select, bindparam, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from auth.project_access import ProjectRole, check_project_access
+from auth.project_access import (
+    ProjectRole,
+    accessible_project_ids,
+    check_chord_access,
+    check_project_role,
+    check_song_access,
+)
+from database.chord_ranks import (
+    CHORD_RANK_MAX_LENGTH,
+    chord_position,
+    last_rank,
+    rank_between,
+    rebalance_chord_ranks,
+    rerank,
+    song_rank_lock,
+)
+from database.chord_writes import apply_chord_ops
+from database.pagination import decode_cursor, keyset_after, split_page
+from database.replica import get_read_db
+from database.sequence_writes import bump_versions_for_deleted_chords
 from database.session import get_db
 from models.chord import Chord
 from models.song import Song
 from models.user import User
-from schemas.chord import ChordCreate, ChordResponse, ChordUpdate, ReorderRequest
+from music.chords import shape_fingerprint
+from music.recognition import NOTE_NAMES, identify_voicing
+from music.voicings import MAX_FRET, generate_voicings
+from schemas.chord import (
+    ChordBulkRequest,
+    ChordBulkResponse,
+    ChordCreate,
+    ChordNameResponse,
+    ChordResponse,
+    ChordShapeMatch,
+    ChordShapeSearch,
+    ChordUpdate,
+    MoveChordRequest,
+    ReorderRequest,
+    VoicingResponse,
+)
+from schemas.pagination import Page
 
 router = APIRouter()
 
 _EDITOR_ROLES = {ProjectRole.owner, ProjectRole.admin, ProjectRole.editor}
 
 
-async def _get_song_with_role(
-    song_id: uuid.UUID,
-    current_user: User,
-    db: AsyncSession,
-) -> tuple[Song, ProjectRole]:
-    """Fetch a song and determine caller's role on its project."""
-    result = await db.execute(select(Song).where(Song.id == song_id))
-    song = result.scalar_one_or_none()
+def _numbered(chords: list[Chord], start: int = 0) -> list[Chord]:
+    """Fill in the derived ``position`` of chords listed in rank order from ``start``."""
+    for offset, chord in enumerate(chords):
+        chord.position = start + offset
+    return chords
 
-    if not song:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
 
-    _, role = await check_project_access(song.project_id, current_user, db)
-    return song, role
+def _rebalance_if_needed(
+    background_tasks: BackgroundTasks, db: AsyncSession, song_id: uuid.UUID, *rank_keys: str
+) -> None:
+    """Respace the song's rank keys after the response if a write left one too long."""
+    if any(len(rank_key) > CHORD_RANK_MAX_LENGTH for rank_key in rank_keys):
+        background_tasks.add_task(rebalance_chord_ranks, db.bind, song_id)
 
 
-async def _get_chord_with_role(
-    chord_id: uuid.UUID,
-    current_user: User,
-    db: AsyncSession,
-) -> tuple[Chord, ProjectRole]:
-    """Fetch a chord and determine caller's role through song -> project."""
-    result = await db.execute(select(Chord).where(Chord.id == chord_id))
-    chord = result.scalar_one_or_none()
+@router.get("/songs/{song_id}/chords", response_model=list[ChordResponse] | Page[ChordResponse])
+async def list_chords(
+    song_id: uuid.UUID,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    after: str | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    primary_db: AsyncSession = Depends(get_db),
+) -> list[Chord] | Page[ChordResponse]:
+    """List a song's chords in rank order.
+
+    Without ``limit`` every chord is returned as a plain list. With ``limit`` the response
+    is a page whose ``next_cursor`` is passed back as ``after``. Access is checked on the
+    primary, so a revoked collaborator is refused even while the replica lags.
+    """
+    await check_song_access(song_id, current_user, primary_db)
+
+    stmt = select(Chord).where(Chord.song_id == song_id).order_by(Chord.rank_key)
+    if limit is None:
+        result = await db.execute(stmt)
+        return _numbered(list(result.scalars().all()))
+
+    start = 0
+    if after:
+        keyset = decode_cursor(after, str)
+        stmt = stmt.where(keyset_after((Chord.rank_key,), keyset))
+        result = await db.execute(
+            select(func.count())
+            .select_from(Chord)
+            .where(Chord.song_id == song_id, Chord.rank_key <= keyset[0])
+        )
+        start = result.scalar_one()
+    result = await db.execute(stmt.limit(limit + 1))
+    chords, next_cursor = split_page(
+        list(result.scalars().all()), limit, lambda chord: (chord.rank_key,)
+    )
+    return Page[ChordResponse](items=_numbered(chords, start), next_cursor=next_cursor)
+
+
+_NAMING_COLUMNS = (Chord.id, Chord.markers, Chord.tuning, Chord.string_count)
+
+
+async def _name_chords(stmt: Select, db: AsyncSession) -> list[ChordNameResponse]:
+    """Identify every chord selected by ``stmt`` from its markers, tuning and string count."""
+    result = await db.execute(stmt)
+    names = []
+    for chord in result:
+        identity = identify_voicing(chord.markers, chord.tuning, chord.string_count)
+        if identity is None:
+            names.append(ChordNameResponse(chord_id=chord.id))
+            continue
+        names.append(
+            ChordNameResponse(
+                chord_id=chord.id,
+                symbol=identity.symbol,
+                root=NOTE_NAMES[identity.root],
+                quality=identity.quality,
+                bass=NOTE_NAMES[identity.bass],
+                inversion=identity.inversion,
+            )
+        )
+    return names
 
-    if not chord:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chord not found")
 
-    _, role = await _get_song_with_role(chord.song_id, current_user, db)
-    return chord, role
+@router.get("/songs/{song_id}/chords/names", response_model=list[ChordNameResponse])
+async def name_song_chords(
+    song_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[ChordNameResponse]:
+    """Identify every chord in a song, in position order."""
+    await check_song_access(song_id, current_user, db)
+    stmt = select(*_NAMING_COLUMNS).where(Chord.song_id == song_id).order_by(Chord.rank_key)
+    return await _name_chords(stmt, db)
 
 
-@router.get("/songs/{song_id}/chords", response_model=list[ChordResponse])
-async def list_chords(
-    song_id: uuid.UUID,
+@router.get("/projects/{project_id}/chords/names", response_model=list[ChordNameResponse])
+async def name_project_chords(
+    project_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[Chord]:
-    await _get_song_with_role(song_id, current_user, db)
+) -> list[ChordNameResponse]:
+    """Identify every chord in every song of a project."""
+    await check_project_role(project_id, current_user, db)
+    stmt = (
+        select(*_NAMING_COLUMNS)
+        .join(Song, Song.id == Chord.song_id)
+        .where(Song.project_id == project_id)
+        .order_by(Chord.song_id, Chord.rank_key)
+    )
+    return await _name_chords(stmt, db)
+
+
+@router.get("/chords/voicings", response_model=list[VoicingResponse])
+async def list_voicings(
+    symbol: str,
+    tuning: str = "EADGBE",
+    string_count: int = Query(default=6, ge=1, le=12),
+    min_fret: int = Query(default=0, ge=0, le=MAX_FRET),
+    max_fret: int = Query(default=12, ge=0, le=MAX_FRET),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+) -> list[VoicingResponse]:
+    """Playable fingerings of a chord symbol on any tuning, easiest first."""
+    try:
+        voicings = generate_voicings(symbol, tuning, string_count, min_fret, max_fret)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return [
+        VoicingResponse(
+            name=symbol,
+            markers=voicing.markers,
+            string_count=string_count,
+            tuning=tuning,
+            starting_fret=voicing.starting_fret,
+            stretch=voicing.stretch,
+            fingers=voicing.fingers,
+        )
+        for voicing in voicings[:limit]
+    ]
 
+
+@router.post("/chords/search", response_model=list[ChordShapeMatch])
+async def search_chords_by_shape(
+    data: ChordShapeSearch,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[ChordShapeMatch]:
+    """Find chords with this shape in every project the caller can access.
+
+    Each accessible song is looked up in the ``ix_chords_song_shape`` index; matches are
+    ordered by fret position then id, and only the songs they fall in are ranked for
+    ``position``.
+    """
+    shape = shape_fingerprint(
+        [m.model_dump() for m in data.markers], data.tuning, data.string_count
+    )
+    if shape is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Shape has no markers")
+    fingerprint, offset = shape
+
+    found = (
+        select(Chord.id, Chord.song_id, Song.project_id)
+        .join(Song, Song.id == Chord.song_id)
+        .where(
+            Song.project_id.in_(accessible_project_ids(current_user.id)),
+            Chord.shape_fingerprint == fingerprint,
+        )
+        .order_by(Chord.shape_offset, Chord.id)
+        .limit(data.limit)
+    )
+    if not data.transposed:
+        found = found.where(Chord.shape_offset == offset)
+    found = found.subquery()
+    rank = func.row_number().over(partition_by=Chord.song_id, order_by=Chord.rank_key)
+    ranked = (
+        select(Chord.id, (rank - 1).label("position"))
+        .where(Chord.song_id.in_(select(found.c.song_id)))
+        .subquery()
+    )
     result = await db.execute(
-        select(Chord).where(Chord.song_id == song_id).order_by(Chord.position)
+        select(Chord, found.c.project_id, ranked.c.position)
+        .join(found, found.c.id == Chord.id)
+        .join(ranked, ranked.c.id == Chord.id)
+        .order_by(Chord.shape_offset, Chord.id)
     )
-    return list(result.scalars().all())
+    matches = []
+    for chord, project_id, position in result:
+        chord.position = position
+        matches.append(
+            ChordShapeMatch(
+                **ChordResponse.model_validate(chord).model_dump(),
+                project_id=project_id,
+                fret_offset=chord.shape_offset - offset,
+            )
+        )
+    return matches
 
 
 @router.post(
@@ -71,36 +254,67 @@ async def list_chords(
 async def create_chord(
     song_id: uuid.UUID,
     data: ChordCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Chord:
-    _, role = await _get_song_with_role(song_id, current_user, db)
+    _, _, role = await check_song_access(song_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    # Auto-assign next position
-    result = await db.execute(
-        select(func.coalesce(func.max(Chord.position), -1)).where(Chord.song_id == song_id)
-    )
-    next_position = result.scalar() + 1
-
     markers_data = [m.model_dump() for m in data.markers]
     chord = Chord(
         name=data.name,
         markers=markers_data,
-        position=next_position,
         string_count=data.string_count,
         tuning=data.tuning,
         starting_fret=data.starting_fret,
         song_id=song_id,
     )
-    db.add(chord)
-    await db.commit()
-    await db.refresh(chord)
+
+    # Append after the current last chord; concurrent appends queue on the song
+    async with song_rank_lock(db, song_id):
+        chord.rank_key = rank_between(await last_rank(db, song_id), None)
+        db.add(chord)
+        await db.commit()
+    chord.position = await chord_position(db, song_id, chord.rank_key)
+    _rebalance_if_needed(background_tasks, db, song_id, chord.rank_key)
     return chord
 
 
+@router.post("/songs/{song_id}/chords/bulk", response_model=ChordBulkResponse)
+async def bulk_chords(
+    song_id: uuid.UUID,
+    data: ChordBulkRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> ChordBulkResponse:
+    """Create, update and delete many chords of a song in one transaction.
+
+    Access is checked once and every operation is validated before any is written;
+    creates are appended in request order.
+    """
+    _, _, role = await check_song_access(song_id, current_user, db)
+
+    if role not in _EDITOR_ROLES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    async with song_rank_lock(db, song_id):
+        created, updated, deleted = await apply_chord_ops(db, song_id, data.ops)
+        await db.commit()
+
+    responses = []
+    if created:
+        start = await chord_position(db, song_id, created[0]["rank_key"])
+        responses = [
+            ChordResponse(**row, position=start + offset) for offset, row in enumerate(created)
+        ]
+        _rebalance_if_needed(background_tasks, db, song_id, created[-1]["rank_key"])
+    return ChordBulkResponse(created=responses, updated=updated, deleted=deleted)
+
+
 @router.put("/chords/{chord_id}", response_model=ChordResponse)
 async def update_chord(
     chord_id: uuid.UUID,
@@ -108,7 +322,7 @@ async def update_chord(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Chord:
-    chord, role = await _get_chord_with_role(chord_id, current_user, db)
+    chord, _, role = await check_chord_access(chord_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
@@ -125,7 +339,56 @@ async def update_chord(
         chord.starting_fret = data.starting_fret
 
     await db.commit()
-    await db.refresh(chord)
+    chord.position = await chord_position(db, chord.song_id, chord.rank_key)
+    return chord
+
+
+@router.put("/chords/{chord_id}/move", response_model=ChordResponse)
+async def move_chord(
+    chord_id: uuid.UUID,
+    data: MoveChordRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Chord:
+    """Move one chord within its song, rewriting only that chord's rank key."""
+    chord, _, role = await check_chord_access(chord_id, current_user, db)
+
+    if role not in _EDITOR_ROLES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    async with song_rank_lock(db, chord.song_id):
+        # A rebalance may have re-keyed the chord since it was loaded
+        await db.refresh(chord, ["rank_key"])
+        before = None
+        if data.after_id is not None:
+            result = await db.execute(
+                select(Chord.rank_key).where(
+                    Chord.id == data.after_id, Chord.song_id == chord.song_id, Chord.id != chord.id
+                )
+            )
+            before = result.scalar()
+            if before is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="after_id must be another chord in the same song",
+                )
+
+        stmt = select(Chord.rank_key).where(Chord.song_id == chord.song_id, Chord.id != chord.id)
+        if before is not None:
+            stmt = stmt.where(Chord.rank_key > before)
+        result = await db.execute(stmt.order_by(Chord.rank_key).limit(1))
+        after = result.scalar()
+
+        in_place = (before is None or before < chord.rank_key) and (
+            after is None or chord.rank_key < after
+        )
+        if not in_place:
+            chord.rank_key = rank_between(before, after)
+        await db.commit()
+    if not in_place:
+        _rebalance_if_needed(background_tasks, db, chord.song_id, chord.rank_key)
+    chord.position = await chord_position(db, chord.song_id, chord.rank_key)
     return chord
 
 
@@ -135,25 +398,14 @@ async def delete_chord(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    chord, role = await _get_chord_with_role(chord_id, current_user, db)
+    chord, _, role = await check_chord_access(chord_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    song_id = chord.song_id
-    deleted_position = chord.position
-
+    # Later chords keep their rank keys; their derived positions close the gap.
+    await bump_versions_for_deleted_chords(db, [chord.id])
     await db.delete(chord)
-
-    # Re-normalize positions for remaining chords
-    result = await db.execute(
-        select(Chord)
-        .where(Chord.song_id == song_id, Chord.position > deleted_position)
-        .order_by(Chord.position)
-    )
-    for c in result.scalars().all():
-        c.position -= 1
-
     await db.commit()
 
 
@@ -164,33 +416,53 @@ async def delete_chord(
 async def reorder_chords(
     song_id: uuid.UUID,
     data: ReorderRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[Chord]:
-    _, role = await _get_song_with_role(song_id, current_user, db)
+    """Put a song's chords in the given order, rewriting only the chords that moved."""
+    _, _, role = await check_song_access(song_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    # Fetch all chords for this song
-    result = await db.execute(select(Chord).where(Chord.song_id == song_id))
-    chords = {c.id: c for c in result.scalars().all()}
-
-    # Validate that all chord_ids belong to this song
-    if set(data.chord_ids) != set(chords.keys()):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="chord_ids must contain exactly all chords in the song",
+    async with song_rank_lock(db, song_id):
+        # Fetch all rank keys for this song
+        result = await db.execute(select(Chord.id, Chord.rank_key).where(Chord.song_id == song_id))
+        rank_keys = dict(result.all())
+
+        # Validate that all chord_ids belong to this song
+        if len(data.chord_ids) != len(rank_keys) or set(data.chord_ids) != rank_keys.keys():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="chord_ids must contain exactly all chords in the song",
+            )
+
+        # Re-key the chords outside the longest run already in order
+        new_keys = rerank(
+            [rank_keys[chord_id] for chord_id in data.chord_ids], set(rank_keys.values())
         )
-
-    # Update positions
-    for position, chord_id in enumerate(data.chord_ids):
-        chords[chord_id].position = position
-
-    await db.commit()
+        moved = [
+            {"b_id": chord_id, "rank_key": rank_key}
+            for chord_id, rank_key in zip(data.chord_ids, new_keys, strict=True)
+            if rank_key is not None
+        ]
+        if moved:
+            chord_table = Chord.__table__
+            await db.execute(
+                update(chord_table)
+                .where(chord_table.c.id == bindparam("b_id"))
+                .values(updated_at=func.now()),
+                moved,
+            )
+        await db.commit()
+    _rebalance_if_needed(background_tasks, db, song_id, *(row["rank_key"] for row in moved))
 
     # Return in new order
     result = await db.execute(
-        select(Chord).where(Chord.song_id == song_id).order_by(Chord.position)
+        select(Chord)
+        .where(Chord.song_id == song_id)
+        .order_by(Chord.rank_key)
+        .execution_options(populate_existing=True)
     )
-    return list(result.scalars().all())
+    return _numbered(list(result.scalars().all()))
@@ -1,12 +1,21 @@
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from auth.dependencies import get_current_user
-from auth.project_access import ProjectRole, check_project_access
+from auth.project_access import (
+    ProjectRole,
+    bump_membership_versions,
+    check_project_access,
+    check_project_role,
+    invalidate_role,
+)
+from database.pagination import decode_cursor, keyset_after, split_page
+from database.replica import get_read_db
 from database.session import get_db
 from models.collaborator import CollaboratorStatus, ProjectCollaborator
 from models.user import User
@@ -18,6 +27,7 @@ from schemas.collaborator import (
     CollaboratorStatusUpdateRequest,
     PendingInvitationResponse,
 )
+from schemas.pagination import Page
 
 router = APIRouter()
 status_router = APIRouter()
@@ -36,7 +46,7 @@ async def invite_collaborator(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> ProjectCollaborator:
-    project, role = await check_project_access(project_id, current_user, db)
+    role = await check_project_role(project_id, current_user, db)
 
     if role not in _ADMIN_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
@@ -72,7 +82,7 @@ async def invite_collaborator(
     )
     db.add(collaborator)
     await db.commit()
-    await db.refresh(collaborator)
+    invalidate_role(invitee.id, project_id)
     return collaborator
 
 
@@ -102,15 +112,16 @@ async def update_collaborator_status(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
     collab.status = data.status
+    await bump_membership_versions(db, [collab.invitee_id])
     await db.commit()
-    await db.refresh(collab)
+    invalidate_role(collab.invitee_id, collab.project_id)
     return collab
 
 
 @status_router.get("/collaborators/pending", response_model=list[PendingInvitationResponse])
 async def list_pending_invitations(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[PendingInvitationResponse]:
     result = await db.execute(
         select(ProjectCollaborator)
@@ -139,24 +150,48 @@ async def list_pending_invitations(
     ]
 
 
-@router.get("/{project_id}/collaborators", response_model=list[CollaboratorDetailResponse])
+@router.get(
+    "/{project_id}/collaborators",
+    response_model=list[CollaboratorDetailResponse] | Page[CollaboratorDetailResponse],
+)
 async def list_collaborators(
     project_id: uuid.UUID,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    after: str | None = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[CollaboratorDetailResponse]:
-    _, role = await check_project_access(project_id, current_user, db)
+) -> list[CollaboratorDetailResponse] | Page[CollaboratorDetailResponse]:
+    """List a project's collaborators in invitation order.
+
+    Without ``limit`` every collaborator is returned as a plain list. With ``limit`` the
+    response is a page whose ``next_cursor`` is passed back as ``after``.
+    """
+    role = await check_project_role(project_id, current_user, db)
 
     if role not in _ADMIN_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    collab_result = await db.execute(
+    stmt = (
         select(ProjectCollaborator)
         .where(ProjectCollaborator.project_id == project_id)
+        .order_by(ProjectCollaborator.created_at, ProjectCollaborator.id)
         .options(selectinload(ProjectCollaborator.invitee))
     )
-    collabs = collab_result.scalars().all()
-    return [
+    if limit is not None:
+        if after:
+            keyset = decode_cursor(after, datetime.fromisoformat, uuid.UUID)
+            stmt = stmt.where(
+                keyset_after((ProjectCollaborator.created_at, ProjectCollaborator.id), keyset)
+            )
+        stmt = stmt.limit(limit + 1)
+
+    collab_result = await db.execute(stmt)
+    collabs = list(collab_result.scalars().all())
+    next_cursor = None
+    if limit is not None:
+        collabs, next_cursor = split_page(collabs, limit, lambda c: (c.created_at, c.id))
+
+    details = [
         CollaboratorDetailResponse(
             id=c.id,
             project_id=c.project_id,
@@ -169,6 +204,9 @@ async def list_collaborators(
         )
         for c in collabs
     ]
+    if limit is None:
+        return details
+    return Page[CollaboratorDetailResponse](items=details, next_cursor=next_cursor)
 
 
 @router.delete(
@@ -205,7 +243,9 @@ async def remove_collaborator(
         )
 
     await db.delete(collab)
+    await bump_membership_versions(db, [collab.invitee_id])
     await db.commit()
+    invalidate_role(collab.invitee_id, project_id)
 
 
 @router.patch("/{project_id}/collaborators/{collaborator_id}", response_model=CollaboratorResponse)
@@ -216,7 +256,7 @@ async def update_collaborator_role(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> ProjectCollaborator:
-    _, role = await check_project_access(project_id, current_user, db)
+    role = await check_project_role(project_id, current_user, db)
 
     if role not in _ADMIN_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
@@ -234,6 +274,7 @@ async def update_collaborator_role(
         )
 
     collab.role = data.role
+    await bump_membership_versions(db, [collab.invitee_id])
     await db.commit()
-    await db.refresh(collab)
+    invalidate_role(collab.invitee_id, project_id)
     return collab
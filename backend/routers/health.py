@@ -1,8 +1,44 @@
-from fastapi import APIRouter
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from auth.dependencies import user_cache
+from auth.passwords import password_pool
+from auth.project_access import role_cache
+from database.replica import replica_router
+from database.sequence_reads import playback_cache
+from database.session import pool_stats
+from routers.sequence import audio_cache, midi_cache
+
+# Shared secret for /api/metrics, sent as X-Metrics-Token. Unset disables the endpoint.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
 
 router = APIRouter()
 
 
+def require_metrics_token(x_metrics_token: str | None = Header(None)) -> None:
+    """Only callers holding ``METRICS_TOKEN`` may read cache, pool and replica internals."""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_metrics_token is None or not hmac.compare_digest(x_metrics_token, METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    return {
+        "user_cache": user_cache.stats(),
+        "password_pool": password_pool.stats(),
+        "role_cache": role_cache.stats(),
+        "playback_cache": playback_cache.stats(),
+        "midi_cache": midi_cache.stats(),
+        "audio_cache": audio_cache.stats(),
+        "db_pool": pool_stats(),
+        "replica": replica_router.stats(),
+    }
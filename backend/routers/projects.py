@@ -1,59 +1,119 @@
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Select, Subquery, literal, null, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from auth.project_access import ProjectRole, check_project_access, get_project_access
+from auth.project_access import (
+    ProjectRole,
+    bump_membership_versions,
+    check_project_access,
+    get_project_access,
+    invalidate_project_roles,
+)
+from database.pagination import keyset_after
+from database.replica import get_read_db
 from database.session import get_db
 from models.collaborator import CollaboratorStatus, ProjectCollaborator
 from models.project import Project
 from models.user import User
+from schemas.pagination import Page
 from schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
 
 router = APIRouter()
 
-
-@router.get("", response_model=list[ProjectResponse])
+_PROJECT_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.user_id,
+    Project.created_at,
+    Project.updated_at,
+)
+
+
+def _parse_after(after: str) -> tuple[datetime, uuid.UUID]:
+    """Parse an ``<updated_at>,<id>`` keyset cursor."""
+    try:
+        updated_at, project_id = after.rsplit(",", 1)
+        return datetime.fromisoformat(updated_at), uuid.UUID(project_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _listing_branch(
+    stmt: Select, after: tuple[datetime, uuid.UUID] | None, limit: int | None
+) -> Subquery:
+    """Apply the keyset predicate, ordering and limit to one side of the listing UNION.
+
+    Bounding each side separately lets the database stop after ``limit`` rows per side
+    instead of materializing every membership before the outer sort.
+    """
+    if after is not None:
+        stmt = stmt.where(keyset_after((Project.updated_at, Project.id), after, descending=True))
+    stmt = stmt.order_by(Project.updated_at.desc(), Project.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt.subquery()
+
+
+@router.get("", response_model=list[ProjectResponse] | Page[ProjectResponse])
 async def list_projects(
+    limit: int | None = Query(default=None, ge=1, le=100),
+    after: str | None = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> list[ProjectResponse]:
-    # Owned projects
-    owned_result = await db.execute(
-        select(Project)
-        .where(Project.user_id == current_user.id)
-        .order_by(Project.updated_at.desc())
+    db: AsyncSession = Depends(get_read_db),
+) -> list[ProjectResponse] | Page[ProjectResponse]:
+    """List owned and accepted shared projects, most recently updated first.
+
+    Without ``limit`` every project is returned as a plain list. With ``limit`` the
+    response is a page whose ``next_cursor`` is passed back as ``after``.
+    """
+    keyset = _parse_after(after) if after else None
+    fetch = limit + 1 if limit is not None else None
+
+    owned = _listing_branch(
+        select(
+            *_PROJECT_COLUMNS,
+            literal(ProjectRole.owner.value).label("my_role"),
+            null().label("shared_by"),
+        ).where(Project.user_id == current_user.id),
+        keyset,
+        fetch,
     )
-    owned_projects = owned_result.scalars().all()
-
-    # Collaborated projects (accepted only) — join inviter User for shared_by email
-    collab_result = await db.execute(
-        select(ProjectCollaborator, Project, User)
+    shared = _listing_branch(
+        select(
+            *_PROJECT_COLUMNS,
+            ProjectCollaborator.role.label("my_role"),
+            User.email.label("shared_by"),
+        )
         .join(Project, Project.id == ProjectCollaborator.project_id)
         .join(User, User.id == ProjectCollaborator.inviter_id)
         .where(
             ProjectCollaborator.invitee_id == current_user.id,
             ProjectCollaborator.status == CollaboratorStatus.accepted,
-        )
+        ),
+        keyset,
+        fetch,
     )
-    collab_rows = collab_result.all()
+    memberships = union_all(select(owned), select(shared)).subquery()
+    stmt = select(memberships).order_by(memberships.c.updated_at.desc(), memberships.c.id.desc())
+    if fetch is not None:
+        stmt = stmt.limit(fetch)
 
-    responses: list[ProjectResponse] = []
-    for p in owned_projects:
-        responses.append(
-            ProjectResponse.model_validate(p).model_copy(update={"my_role": ProjectRole.owner})
-        )
-    for collab, p, inviter in collab_rows:
-        responses.append(
-            ProjectResponse.model_validate(p).model_copy(
-                update={"my_role": ProjectRole(collab.role), "shared_by": inviter.email}
-            )
-        )
+    result = await db.execute(stmt)
+    projects = [ProjectResponse.model_validate(row) for row in result]
+
+    if limit is None:
+        return projects
 
-    responses.sort(key=lambda r: r.updated_at, reverse=True)
-    return responses
+    next_cursor = None
+    if len(projects) > limit:
+        projects = projects[:limit]
+        last = projects[-1]
+        next_cursor = f"{last.updated_at.isoformat()},{last.id}"
+    return Page[ProjectResponse](items=projects, next_cursor=next_cursor)
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -65,7 +125,6 @@ async def create_project(
     project = Project(name=data.name, user_id=current_user.id)
     db.add(project)
     await db.commit()
-    await db.refresh(project)
     return ProjectResponse.model_validate(project).model_copy(
         update={"my_role": ProjectRole.owner}
     )
@@ -93,7 +152,6 @@ async def update_project(
 
     project.name = data.name
     await db.commit()
-    await db.refresh(project)
     return ProjectResponse.model_validate(project).model_copy(update={"my_role": role})
 
 
@@ -108,5 +166,12 @@ async def delete_project(
     if role != ProjectRole.owner:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
+    member_result = await db.execute(
+        select(ProjectCollaborator.invitee_id).where(ProjectCollaborator.project_id == project_id)
+    )
+    member_ids = [project.user_id, *member_result.scalars().all()]
+    await bump_membership_versions(db, member_ids)
+
     await db.delete(project)
     await db.commit()
+    invalidate_project_roles(project_id, member_ids)
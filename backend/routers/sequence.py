@@ -1,37 +1,66 @@
+import os
+import tempfile
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, select
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from auth.dependencies import get_current_user
-from auth.project_access import ProjectRole, check_project_access
+from auth.project_access import ProjectRole, check_song_access
+from cache.file_cache import FileCache
+from database.replica import get_read_db
+from database.sequence_reads import (
+    load_playback_positions,
+    load_sequence_document,
+    load_sequence_timeline,
+    render_sequence_document,
+)
+from database.sequence_writes import (
+    apply_sequence_ops,
+    bump_sequence_version,
+    replace_measures,
+    save_measures_diff,
+)
 from database.session import get_db
-from models.sequence import Sequence, SequenceBeat, SequenceMeasure
-from models.song import Song
+from models.chord import Chord
+from models.sequence import Sequence, SequenceMeasure
 from models.user import User
-from schemas.sequence import SequenceCreate, SequenceResponse, SequenceUpdate
+from music.chords import chord_pitches
+from music.midi import check_midi_range, midi_file_chunks
+from music.synth import DEFAULT_SAMPLE_RATE, pcm_chunks, wav_chunks
+from schemas.sequence import (
+    SequenceCreate,
+    SequencePatch,
+    SequencePlaybackResponse,
+    SequenceResponse,
+    SequenceTimelineResponse,
+    SequenceUpdate,
+)
 
-router = APIRouter()
+MIDI_CACHE_DIR = os.getenv(
+    "MIDI_CACHE_DIR", os.path.join(tempfile.gettempdir(), "chord-tracker", "midi")
+)
+MIDI_CACHE_MAX_BYTES = int(os.getenv("MIDI_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
 
-_EDITOR_ROLES = {ProjectRole.owner, ProjectRole.admin, ProjectRole.editor}
+AUDIO_CACHE_DIR = os.getenv(
+    "AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "chord-tracker", "audio")
+)
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+# Longest render, at the requested tempo, that the audio exports will synthesize. Keep
+# it under about 12 hours: past that a 48 kHz WAV overflows its 32-bit size fields.
+AUDIO_MAX_SECONDS = float(os.getenv("AUDIO_MAX_SECONDS", "3600"))
 
+midi_cache = FileCache(MIDI_CACHE_DIR, MIDI_CACHE_MAX_BYTES, suffix=".mid")
+audio_cache = FileCache(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES)
 
-async def _get_song_with_role(
-    song_id: uuid.UUID,
-    current_user: User,
-    db: AsyncSession,
-) -> tuple[Song, ProjectRole]:
-    """Fetch a song and determine caller's role on its project."""
-    result = await db.execute(select(Song).where(Song.id == song_id))
-    song = result.scalar_one_or_none()
-
-    if not song:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
+router = APIRouter()
 
-    _, role = await check_project_access(song.project_id, current_user, db)
-    return song, role
+_EDITOR_ROLES = {ProjectRole.owner, ProjectRole.admin, ProjectRole.editor}
 
 
 async def _get_sequence_with_measures(
@@ -47,21 +76,327 @@ async def _get_sequence_with_measures(
     return result.scalar_one_or_none()
 
 
+def _etag(sequence_id: uuid.UUID, version: int) -> str:
+    return f'"{sequence_id.hex}-{version}"'
+
+
+def _etag_matches(header: str, etag: str, weak: bool = False) -> bool:
+    """Whether an If-Match / If-None-Match header lists ``etag`` (or ``*``)."""
+    for tag in header.split(","):
+        tag = tag.strip()
+        if weak:
+            tag = tag.removeprefix("W/")
+        if tag in ("*", etag):
+            return True
+    return False
+
+
+def _expected_version(sequence: Sequence | Row, if_match: str | None) -> int | None:
+    """Version a write must apply to, or 412 if the client's copy is already stale."""
+    if if_match is None:
+        return None
+    if not _etag_matches(if_match, _etag(sequence.id, sequence.version)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Sequence has been modified",
+        )
+    return sequence.version
+
+
+async def _sequence_response(
+    song_id: uuid.UUID,
+    db: AsyncSession,
+    status_code: int = status.HTTP_200_OK,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Render the stored sequence straight from its columns, with its ETag.
+
+    Bypasses ``response_model`` validation; the route still declares SequenceResponse so
+    the OpenAPI schema describes what load_sequence_document produces.
+    """
+    document = await load_sequence_document(db, song_id)
+    if document is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sequence not found")
+    return Response(
+        content=render_sequence_document(document),
+        status_code=status_code,
+        media_type="application/json",
+        headers={"ETag": _etag(document["id"], document["version"]), **(headers or {})},
+    )
+
+
 @router.get("/songs/{song_id}/sequence", response_model=SequenceResponse)
 async def get_sequence(
+    song_id: uuid.UUID,
+    if_none_match: str | None = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    primary_db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Return the sequence, or 304 without loading measures if the client's ETag is current.
+
+    Access is checked on the primary, so a revoked collaborator is refused even while the
+    replica lags.
+    """
+    await check_song_access(song_id, current_user, primary_db)
+
+    result = await db.execute(
+        select(Sequence.id, Sequence.version).where(Sequence.song_id == song_id)
+    )
+    current = result.one_or_none()
+    if not current:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sequence not found")
+
+    etag = _etag(current.id, current.version)
+    if if_none_match and _etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    return await _sequence_response(song_id, db)
+
+
+@router.get("/songs/{song_id}/sequence/playback", response_model=SequencePlaybackResponse)
+async def get_sequence_playback(
     song_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> Sequence:
-    await _get_song_with_role(song_id, current_user, db)
+) -> SequencePlaybackResponse:
+    """Measure positions in the order they are played, with repeats and endings unrolled."""
+    await check_song_access(song_id, current_user, db)
 
-    sequence = await _get_sequence_with_measures(song_id, db)
-    if not sequence:
+    result = await db.execute(
+        select(Sequence.id, Sequence.version).where(Sequence.song_id == song_id)
+    )
+    current = result.one_or_none()
+    if not current:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sequence not found")
 
+    positions = await load_playback_positions(db, current.id, current.version)
+    return SequencePlaybackResponse(
+        sequence_id=current.id, version=current.version, positions=positions
+    )
+
+
+async def _get_sequence_timing(song_id: uuid.UUID, db: AsyncSession) -> Row:
+    """The sequence columns a timeline is built from, or 404."""
+    result = await db.execute(
+        select(
+            Sequence.id,
+            Sequence.version,
+            Sequence.time_signature_numerator,
+            Sequence.time_signature_denominator,
+        ).where(Sequence.song_id == song_id)
+    )
+    sequence = result.one_or_none()
+    if not sequence:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sequence not found")
     return sequence
 
 
+async def _load_voicings(song_id: uuid.UUID, db: AsyncSession) -> dict[uuid.UUID, tuple[int, ...]]:
+    """MIDI pitches of every chord in the song, by chord id."""
+    result = await db.execute(
+        select(Chord.id, Chord.markers, Chord.tuning, Chord.string_count).where(
+            Chord.song_id == song_id
+        )
+    )
+    return {
+        chord.id: tuple(chord_pitches(chord.markers, chord.tuning, chord.string_count))
+        for chord in result
+    }
+
+
+def _parse_tempo_changes(values: list[str]) -> dict[int, float]:
+    """Parse ``position:bpm`` query values into a position -> tempo map."""
+    changes = {}
+    for value in values:
+        position, _, bpm = value.partition(":")
+        try:
+            position, bpm = int(position), float(bpm)
+        except ValueError:
+            position, bpm = -1, 0.0
+        if position < 0 or not 0 < bpm <= 1000:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid tempo change"
+            )
+        changes[position] = bpm
+    return changes
+
+
+@router.get("/songs/{song_id}/sequence/timeline", response_model=SequenceTimelineResponse)
+async def get_sequence_timeline(
+    song_id: uuid.UUID,
+    tempo: float = Query(120.0, gt=0, le=1000),
+    tempo_change: list[str] = Query([]),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Start time, duration and chord of every played beat, repeats unrolled.
+
+    ``tempo`` is in quarter notes per minute. Each ``tempo_change=<position>:<bpm>``
+    switches tempo at the start of that measure, every time it is played.
+    """
+    tempo_changes = _parse_tempo_changes(tempo_change)
+    await check_song_access(song_id, current_user, db)
+    sequence = await _get_sequence_timing(song_id, db)
+
+    timeline, chord_ids = await load_sequence_timeline(db, sequence, tempo, tempo_changes)
+    # Code NO_CHORD (-1) picks the trailing None.
+    chord_table = np.array([*chord_ids, None], dtype=object)
+    content = {
+        "sequence_id": sequence.id,
+        "version": sequence.version,
+        "tempo": tempo,
+        "total_duration": timeline.total_duration,
+        "beats": {
+            "measure_index": timeline.measure_index,
+            "position": timeline.position,
+            "beat_position": timeline.beat_position,
+            "start": timeline.start,
+            "duration": timeline.duration,
+            "chord_id": chord_table[timeline.chord].tolist(),
+        },
+    }
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/songs/{song_id}/sequence.mid",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"audio/midi": {}}}},
+)
+async def export_sequence_midi(
+    song_id: uuid.UUID,
+    tempo: float = Query(120.0, gt=0, le=1000),
+    tempo_change: list[str] = Query([]),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Export the sequence as a Standard MIDI File with repeats unrolled.
+
+    Each chord's notes come from its markers and tuning. Files are cached on disk per
+    sequence version, tempo and chord voicings; a miss streams the file as it is
+    written.
+    """
+    tempo_changes = _parse_tempo_changes(tempo_change)
+    await check_song_access(song_id, current_user, db)
+    sequence = await _get_sequence_timing(song_id, db)
+    voicings = await _load_voicings(song_id, db)
+
+    key = (
+        "midi",
+        sequence.id,
+        sequence.version,
+        tempo,
+        tuple(sorted(tempo_changes.items())),
+        tuple(sorted(voicings.items())),
+    )
+    headers = {"Content-Disposition": 'attachment; filename="sequence.mid"'}
+
+    cached = midi_cache.get(key)
+    if cached:
+        return FileResponse(cached, media_type="audio/midi", headers=headers)
+
+    timeline, chord_ids = await load_sequence_timeline(db, sequence, tempo, tempo_changes)
+    chord_pitches = [voicings.get(chord_id, ()) for chord_id in chord_ids]
+    numerator = sequence.time_signature_numerator
+    denominator = sequence.time_signature_denominator
+    try:
+        check_midi_range(timeline, chord_pitches, numerator, denominator)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    chunks = midi_file_chunks(timeline, chord_pitches, numerator=numerator, denominator=denominator)
+    # A sync iterator: Starlette renders and writes it from a worker thread.
+    return StreamingResponse(
+        midi_cache.write_through(key, chunks), media_type="audio/midi", headers=headers
+    )
+
+
+async def _export_audio(
+    song_id: uuid.UUID,
+    container: str,
+    tempo: float,
+    tempo_change: list[str],
+    sample_rate: int,
+    current_user: User,
+    db: AsyncSession,
+) -> Response:
+    tempo_changes = _parse_tempo_changes(tempo_change)
+    await check_song_access(song_id, current_user, db)
+    sequence = await _get_sequence_timing(song_id, db)
+    voicings = await _load_voicings(song_id, db)
+
+    key = (
+        "audio",
+        container,
+        sample_rate,
+        sequence.id,
+        sequence.version,
+        tempo,
+        tuple(sorted(tempo_changes.items())),
+        tuple(sorted(voicings.items())),
+    )
+    media_type = "audio/wav" if container == "wav" else f"audio/L16;rate={sample_rate};channels=1"
+    headers = {"Content-Disposition": f'attachment; filename="sequence.{container}"'}
+
+    cached = audio_cache.get(key)
+    if cached:
+        return FileResponse(cached, media_type=media_type, headers=headers)
+
+    timeline, chord_ids = await load_sequence_timeline(db, sequence, tempo, tempo_changes)
+    if timeline.total_duration > AUDIO_MAX_SECONDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Render would last {timeline.total_duration:.0f} s, over the"
+            f" {AUDIO_MAX_SECONDS:.0f} s limit",
+        )
+    render = wav_chunks if container == "wav" else pcm_chunks
+    chunks = render(timeline, [voicings.get(chord_id, ()) for chord_id in chord_ids], sample_rate)
+    return StreamingResponse(
+        audio_cache.write_through(key, chunks), media_type=media_type, headers=headers
+    )
+
+
+@router.get(
+    "/songs/{song_id}/sequence.wav",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"audio/wav": {}}}},
+)
+async def export_sequence_wav(
+    song_id: uuid.UUID,
+    tempo: float = Query(120.0, gt=0, le=1000),
+    tempo_change: list[str] = Query([]),
+    sample_rate: int = Query(DEFAULT_SAMPLE_RATE, ge=8000, le=48000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Render the sequence to a 16-bit mono WAV with a plucked-string synth.
+
+    Renders are cached on disk by sequence version, tempo, sample rate and chord
+    voicings; a miss streams the file as it is synthesized.
+    """
+    return await _export_audio(song_id, "wav", tempo, tempo_change, sample_rate, current_user, db)
+
+
+@router.get(
+    "/songs/{song_id}/sequence.pcm",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"audio/L16": {}}}},
+)
+async def export_sequence_pcm(
+    song_id: uuid.UUID,
+    tempo: float = Query(120.0, gt=0, le=1000),
+    tempo_change: list[str] = Query([]),
+    sample_rate: int = Query(DEFAULT_SAMPLE_RATE, ge=8000, le=48000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Same render as ``sequence.wav`` as headerless little-endian 16-bit mono PCM."""
+    return await _export_audio(song_id, "pcm", tempo, tempo_change, sample_rate, current_user, db)
+
+
 @router.post(
     "/songs/{song_id}/sequence",
     response_model=SequenceResponse,
@@ -72,8 +407,8 @@ async def create_sequence(
     data: SequenceCreate,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> Sequence:
-    _, role = await _get_song_with_role(song_id, current_user, db)
+) -> Response:
+    _, _, role = await check_song_access(song_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
@@ -94,18 +429,26 @@ async def create_sequence(
     db.add(sequence)
     await db.commit()
 
-    sequence = await _get_sequence_with_measures(song_id, db)
-    return sequence  # type: ignore[return-value]
+    return await _sequence_response(song_id, db, status_code=status.HTTP_201_CREATED)
 
 
 @router.put("/songs/{song_id}/sequence", response_model=SequenceResponse)
 async def update_sequence(
     song_id: uuid.UUID,
     data: SequenceUpdate,
+    replace: bool = Query(False),
+    if_match: str | None = Header(None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> Sequence:
-    _, role = await _get_song_with_role(song_id, current_user, db)
+) -> Response:
+    """Store the full sequence.
+
+    By default only measures and beats that differ from the stored ones are written;
+    ``replace=true`` rewrites every row in bulk instead, which is cheaper for imports.
+    The number of measure and beat rows written is returned in ``X-Rows-Written``.
+    With ``If-Match``, the save is rejected with 412 unless it applies to that version.
+    """
+    _, _, role = await check_song_access(song_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
@@ -115,46 +458,55 @@ async def update_sequence(
     if not sequence:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sequence not found")
 
-    sequence.time_signature_numerator = data.time_signature_numerator
-    sequence.time_signature_denominator = data.time_signature_denominator
-    sequence.measures_per_line = data.measures_per_line
+    expected_version = _expected_version(sequence, if_match)
 
-    # Delete existing beats first (child records), then measures
-    await db.execute(
-        delete(SequenceBeat).where(
-            SequenceBeat.measure_id.in_(
-                select(SequenceMeasure.id).where(SequenceMeasure.sequence_id == sequence.id)
-            )
-        )
+    settings = data.model_dump(exclude={"measures"})
+    settings_changed = any(getattr(sequence, key) != value for key, value in settings.items())
+    for key, value in settings.items():
+        setattr(sequence, key, value)
+
+    if replace:
+        written = await replace_measures(db, sequence.id, data.measures)
+    else:
+        written = await save_measures_diff(db, sequence.id, data.measures)
+    if written or settings_changed:
+        await bump_sequence_version(db, sequence.id, expected_version)
+    await db.commit()
+
+    return await _sequence_response(song_id, db, headers={"X-Rows-Written": str(written)})
+
+
+@router.patch("/songs/{song_id}/sequence", response_model=SequenceResponse)
+async def patch_sequence(
+    song_id: uuid.UUID,
+    data: SequencePatch,
+    if_match: str | None = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Apply edit operations to the sequence without rewriting its measures.
+
+    With ``If-Match``, the operations are rejected with 412 unless they apply to that
+    version.
+    """
+    _, _, role = await check_song_access(song_id, current_user, db)
+
+    if role not in _EDITOR_ROLES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    result = await db.execute(
+        select(Sequence.id, Sequence.version).where(Sequence.song_id == song_id)
     )
-    await db.execute(delete(SequenceMeasure).where(SequenceMeasure.sequence_id == sequence.id))
-
-    # Create new measures and beats.
-    # SQLAlchemy's default=uuid.uuid4 runs at INSERT time, not at Python object construction,
-    # so measure.id would be None if used directly. Generate the UUID explicitly instead.
-    for measure_data in data.measures:
-        new_measure_id = uuid.uuid4()
-        measure = SequenceMeasure(
-            id=new_measure_id,
-            sequence_id=sequence.id,
-            position=measure_data.position,
-            repeat_start=measure_data.repeat_start,
-            repeat_end=measure_data.repeat_end,
-            ending_number=measure_data.ending_number,
-        )
-        db.add(measure)
-        for beat_data in measure_data.beats:
-            beat = SequenceBeat(
-                measure_id=new_measure_id,
-                beat_position=beat_data.beat_position,
-                chord_id=beat_data.chord_id,
-            )
-            db.add(beat)
+    current = result.one_or_none()
+    if not current:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sequence not found")
+    expected_version = _expected_version(current, if_match)
 
+    await apply_sequence_ops(db, current.id, data.ops)
+    await bump_sequence_version(db, current.id, expected_version)
     await db.commit()
 
-    sequence = await _get_sequence_with_measures(song_id, db)
-    return sequence  # type: ignore[return-value]
+    return await _sequence_response(song_id, db)
 
 
 @router.delete("/songs/{song_id}/sequence", status_code=status.HTTP_204_NO_CONTENT)
@@ -163,7 +515,7 @@ async def delete_sequence(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    _, role = await _get_song_with_role(song_id, current_user, db)
+    _, _, role = await check_song_access(song_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
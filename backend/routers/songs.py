@@ -1,14 +1,18 @@
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from auth.project_access import ProjectRole, check_project_access
+from auth.project_access import ProjectRole, check_project_role, check_song_access
+from database.pagination import decode_cursor, keyset_after, split_page
+from database.replica import get_read_db
 from database.session import get_db
 from models.song import Song
 from models.user import User
+from schemas.pagination import Page
 from schemas.song import SongCreate, SongResponse, SongUpdate
 
 router = APIRouter()
@@ -16,34 +20,40 @@ router = APIRouter()
 _EDITOR_ROLES = {ProjectRole.owner, ProjectRole.admin, ProjectRole.editor}
 
 
-async def _get_song_with_role(
-    song_id: uuid.UUID,
-    current_user: User,
-    db: AsyncSession,
-) -> tuple[Song, ProjectRole]:
-    """Fetch a song and determine caller's role on its project."""
-    result = await db.execute(select(Song).where(Song.id == song_id))
-    song = result.scalar_one_or_none()
-
-    if not song:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
-
-    _, role = await check_project_access(song.project_id, current_user, db)
-    return song, role
-
-
-@router.get("/projects/{project_id}/songs", response_model=list[SongResponse])
+@router.get("/projects/{project_id}/songs", response_model=list[SongResponse] | Page[SongResponse])
 async def list_songs(
     project_id: uuid.UUID,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    after: str | None = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> list[Song]:
-    await check_project_access(project_id, current_user, db)
-
-    result = await db.execute(
-        select(Song).where(Song.project_id == project_id).order_by(Song.updated_at.desc())
+    db: AsyncSession = Depends(get_read_db),
+    primary_db: AsyncSession = Depends(get_db),
+) -> list[Song] | Page[SongResponse]:
+    """List a project's songs, most recently updated first.
+
+    Without ``limit`` every song is returned as a plain list. With ``limit`` the response
+    is a page whose ``next_cursor`` is passed back as ``after``. Access is checked on the
+    primary, so a revoked collaborator is refused even while the replica lags.
+    """
+    await check_project_role(project_id, current_user, primary_db)
+
+    stmt = (
+        select(Song)
+        .where(Song.project_id == project_id)
+        .order_by(Song.updated_at.desc(), Song.id.desc())
+    )
+    if limit is None:
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    if after:
+        keyset = decode_cursor(after, datetime.fromisoformat, uuid.UUID)
+        stmt = stmt.where(keyset_after((Song.updated_at, Song.id), keyset, descending=True))
+    result = await db.execute(stmt.limit(limit + 1))
+    songs, next_cursor = split_page(
+        list(result.scalars().all()), limit, lambda song: (song.updated_at, song.id)
     )
-    return list(result.scalars().all())
+    return Page[SongResponse](items=songs, next_cursor=next_cursor)
 
 
 @router.post(
@@ -57,7 +67,7 @@ async def create_song(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Song:
-    _, role = await check_project_access(project_id, current_user, db)
+    role = await check_project_role(project_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
@@ -65,7 +75,6 @@ async def create_song(
     song = Song(name=data.name, project_id=project_id)
     db.add(song)
     await db.commit()
-    await db.refresh(song)
     return song
 
 
@@ -75,7 +84,8 @@ async def get_song(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Song:
-    song, _ = await _get_song_with_role(song_id, current_user, db)
+    # On the primary: the song is the row the access check loads anyway.
+    song, _, _ = await check_song_access(song_id, current_user, db)
     return song
 
 
@@ -86,14 +96,13 @@ async def update_song(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Song:
-    song, role = await _get_song_with_role(song_id, current_user, db)
+    song, _, role = await check_song_access(song_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
     song.name = data.name
     await db.commit()
-    await db.refresh(song)
     return song
 
 
@@ -103,7 +112,7 @@ async def delete_song(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    song, role = await _get_song_with_role(song_id, current_user, db)
+    song, _, role = await check_song_access(song_id, current_user, db)
 
     if role not in _EDITOR_ROLES:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
@@ -1,10 +1,25 @@
 import uuid
 from datetime import datetime
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field
 
+from music.voicings import MAX_FRET
+
+# Most operations accepted by one bulk request.
+CHORD_BULK_MAX_OPS = 1000
+# A tuning (String(50)) names at most 50 strings.
+MAX_STRINGS = 50
+
 
 class MarkerSchema(BaseModel):
+    string: int = Field(ge=0, lt=MAX_STRINGS)
+    fret: int = Field(ge=0, le=MAX_FRET)
+
+
+class StoredMarker(BaseModel):
+    """A marker as stored: unbounded, so chords saved before the limits still load."""
+
     string: int
     fret: int
 
@@ -28,7 +43,7 @@ class ChordUpdate(BaseModel):
 class ChordResponse(BaseModel):
     id: uuid.UUID
     name: str | None
-    markers: list[MarkerSchema]
+    markers: list[StoredMarker]
     position: int
     string_count: int
     tuning: str
@@ -40,5 +55,82 @@ class ChordResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ChordShapeSearch(BaseModel):
+    """A fretboard shape to look for, in ``ChordCreate`` form.
+
+    With ``transposed`` the shape matches anywhere along the neck, not just at its frets.
+    """
+
+    markers: list[MarkerSchema]
+    string_count: int = 6
+    tuning: str = "EADGBE"
+    transposed: bool = False
+    limit: int = Field(default=50, ge=1, le=200)
+
+
+class ChordShapeMatch(ChordResponse):
+    project_id: uuid.UUID
+    # Frets the match sits above (positive) or below the searched shape.
+    fret_offset: int
+
+
+class ChordNameResponse(BaseModel):
+    """A chord's identified name; all fields but ``chord_id`` are null if unrecognized."""
+
+    chord_id: uuid.UUID
+    symbol: str | None = None
+    root: str | None = None
+    quality: str | None = None
+    bass: str | None = None
+    inversion: int | None = None
+
+
+class VoicingResponse(BaseModel):
+    """A generated fingering, shaped like ``ChordCreate`` so it can be saved as-is."""
+
+    name: str
+    markers: list[MarkerSchema]
+    string_count: int
+    tuning: str
+    starting_fret: int
+    stretch: int
+    fingers: int
+
+
+class MoveChordRequest(BaseModel):
+    """Place a chord right after ``after_id``, or first in its song when it is null."""
+
+    after_id: uuid.UUID | None = None
+
+
 class ReorderRequest(BaseModel):
     chord_ids: list[uuid.UUID]
+
+
+class CreateChordOp(ChordCreate):
+    op: Literal["create"]
+
+
+class UpdateChordOp(ChordUpdate):
+    op: Literal["update"]
+    id: uuid.UUID
+
+
+class DeleteChordOp(BaseModel):
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+ChordOp = Annotated[CreateChordOp | UpdateChordOp | DeleteChordOp, Field(discriminator="op")]
+
+
+class ChordBulkRequest(BaseModel):
+    ops: list[ChordOp] = Field(min_length=1, max_length=CHORD_BULK_MAX_OPS)
+
+
+class ChordBulkResponse(BaseModel):
+    """Created chords in request order (appended to the song), and how many were changed."""
+
+    created: list[ChordResponse]
+    updated: int
+    deleted: int
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SequenceBeatResponse(BaseModel):
@@ -31,6 +32,7 @@ class SequenceResponse(BaseModel):
     time_signature_numerator: int
     time_signature_denominator: int
     measures_per_line: int
+    version: int
     created_at: datetime
     updated_at: datetime
     measures: list[SequenceMeasureResponse]
@@ -38,6 +40,31 @@ class SequenceResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class SequencePlaybackResponse(BaseModel):
+    sequence_id: uuid.UUID
+    version: int
+    positions: list[int]
+
+
+class SequenceTimelineBeats(BaseModel):
+    """Parallel arrays with one entry per played beat."""
+
+    measure_index: list[int]
+    position: list[int]
+    beat_position: list[int]
+    start: list[float]
+    duration: list[float]
+    chord_id: list[uuid.UUID | None]
+
+
+class SequenceTimelineResponse(BaseModel):
+    sequence_id: uuid.UUID
+    version: int
+    tempo: float
+    total_duration: float
+    beats: SequenceTimelineBeats
+
+
 class SequenceCreate(BaseModel):
     time_signature_numerator: int = 4
     time_signature_denominator: int = 4
@@ -62,3 +89,61 @@ class SequenceUpdate(BaseModel):
     time_signature_denominator: int = 4
     measures_per_line: int = 4
     measures: list[SequenceMeasureIn] = []
+
+
+class SetBeatOp(BaseModel):
+    op: Literal["set_beat"]
+    measure_position: int
+    beat_position: int
+    chord_id: uuid.UUID | None = None
+
+
+class ClearBeatOp(BaseModel):
+    op: Literal["clear_beat"]
+    measure_position: int
+    beat_position: int
+
+
+class InsertMeasureOp(SequenceMeasureIn):
+    op: Literal["insert_measure"]
+    position: int = Field(ge=0)
+
+
+class DeleteMeasureOp(BaseModel):
+    op: Literal["delete_measure"]
+    position: int
+
+
+class MoveMeasureOp(BaseModel):
+    op: Literal["move_measure"]
+    from_position: int
+    to_position: int = Field(ge=0)
+
+
+class SetRepeatOp(BaseModel):
+    op: Literal["set_repeat"]
+    position: int
+    repeat_start: bool | None = None
+    repeat_end: bool | None = None
+
+
+class SetEndingOp(BaseModel):
+    op: Literal["set_ending"]
+    position: int
+    ending_number: int | None = None
+
+
+SequenceOp = Annotated[
+    SetBeatOp
+    | ClearBeatOp
+    | InsertMeasureOp
+    | DeleteMeasureOp
+    | MoveMeasureOp
+    | SetRepeatOp
+    | SetEndingOp,
+    Field(discriminator="op"),
+]
+
+
+class SequencePatch(BaseModel):
+    ops: list[SequenceOp] = Field(min_length=1)
@@ -3,8 +3,13 @@ from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+import routers.health
+from auth.dependencies import user_cache
+from auth.project_access import role_cache
+from database.sequence_reads import playback_cache
 from database.session import get_db
 from main import app
 from models.base import Base
@@ -32,6 +37,9 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 
 @pytest.fixture(autouse=True)
 async def setup_db() -> AsyncGenerator[None, None]:
+    user_cache.clear()
+    role_cache.clear()
+    playback_cache.clear()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -39,8 +47,35 @@ async def setup_db() -> AsyncGenerator[None, None]:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    """A session on the test database, independent of any request."""
+    async with test_session() as session:
+        yield session
+
+
 @pytest.fixture
 async def client() -> AsyncGenerator[AsyncClient, None]:
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+@pytest.fixture
+def sql_statements() -> Generator[list[str], None, None]:
+    """Record every SQL statement sent to the test database while the test runs."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def metrics_headers(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    """Enable /api/metrics for the test and return the headers that authorize reading it."""
+    monkeypatch.setattr(routers.health, "METRICS_TOKEN", "test-metrics-token")
+    return {"X-Metrics-Token": "test-metrics-token"}
@@ -2,6 +2,7 @@ import jwt
 import pytest
 from httpx import AsyncClient
 
+from auth.passwords import password_pool
 from auth.tokens import ALGORITHM, SECRET_KEY
 
 
@@ -110,3 +111,20 @@ async def test_login_same_error_for_bad_email_and_bad_password(
     )
     assert bad_email.status_code == bad_password.status_code == 401
     assert bad_email.json()["detail"] == bad_password.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_login_verifies_password_on_worker_pool(
+    client: AsyncClient, registered_user: dict, metrics_headers: dict
+) -> None:
+    completed_before = password_pool.completed
+    response = await client.post(
+        "/api/auth/login",
+        json={"email": registered_user["email"], "password": registered_user["password"]},
+    )
+    assert response.status_code == 200
+    assert password_pool.completed == completed_before + 1
+
+    metrics = (await client.get("/api/metrics", headers=metrics_headers)).json()["password_pool"]
+    assert metrics["completed"] == password_pool.completed
+    assert metrics["in_flight"] == 0
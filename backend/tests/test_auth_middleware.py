@@ -4,8 +4,11 @@ from datetime import UTC, datetime, timedelta
 import jwt
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from auth.dependencies import user_cache
 from auth.tokens import ALGORITHM, SECRET_KEY, create_access_token, create_refresh_token
+from models.user import User
 
 
 @pytest.fixture
@@ -115,3 +118,69 @@ async def test_protected_endpoint_returns_user_without_password(
     data = response.json()
     assert "password_hash" not in data
     assert "password" not in data
+
+
+@pytest.mark.asyncio
+async def test_authenticated_user_is_served_from_cache(
+    client: AsyncClient, registered_user: dict, access_token: str
+) -> None:
+    """A warm request should resolve the current user without a database lookup."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    first = await client.get("/api/auth/me", headers=headers)
+    assert first.status_code == 200
+    assert user_cache.misses == 1
+
+    second = await client.get("/api/auth/me", headers=headers)
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert user_cache.hits == 1
+    assert user_cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_invalidated_on_update(
+    client: AsyncClient, registered_user: dict, access_token: str, db_session: AsyncSession
+) -> None:
+    """Updating a user should drop its cache entry."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    await client.get("/api/auth/me", headers=headers)
+    assert registered_user["id"] in user_cache._data
+
+    user = await db_session.get(User, uuid.UUID(registered_user["id"]))
+    user.email = "renamed@test.com"
+    await db_session.commit()
+
+    assert registered_user["id"] not in user_cache._data
+    response = await client.get("/api/auth/me", headers=headers)
+    assert response.json()["email"] == "renamed@test.com"
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_user_cache_counters(
+    client: AsyncClient, registered_user: dict, access_token: str, metrics_headers: dict
+) -> None:
+    """The metrics endpoint should expose the user cache hit/miss counters."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    await client.get("/api/auth/me", headers=headers)
+    await client.get("/api/auth/me", headers=headers)
+
+    response = await client.get("/api/metrics", headers=metrics_headers)
+    assert response.status_code == 200
+    stats = response.json()["user_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_token(client: AsyncClient, metrics_headers: dict) -> None:
+    response = await client.get("/api/metrics", headers={"X-Metrics-Token": "wrong"})
+    assert response.status_code == 403
+    response = await client.get("/api/metrics")
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_metrics_disabled_without_token(client: AsyncClient) -> None:
+    response = await client.get("/api/metrics")
+    assert response.status_code == 404
@@ -1,6 +1,12 @@
+import asyncio
+import threading
+
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
 
+from auth.passwords import password_pool
+
 
 @pytest.mark.asyncio
 async def test_register_success(client: AsyncClient) -> None:
@@ -18,6 +24,21 @@ async def test_register_success(client: AsyncClient) -> None:
     assert "password_hash" not in data
 
 
+@pytest.mark.asyncio
+async def test_register_returns_timestamps_without_refresh(
+    client: AsyncClient, sql_statements: list[str]
+) -> None:
+    """The new user's server-generated columns come back on the INSERT itself."""
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": "returning@example.com", "password": "securepass123"},
+    )
+    assert response.status_code == 201
+    assert response.json()["created_at"]
+    assert sql_statements[-1].startswith("INSERT INTO users")
+    assert "RETURNING" in sql_statements[-1]
+
+
 @pytest.mark.asyncio
 async def test_register_duplicate_email(client: AsyncClient) -> None:
     payload = {"email": "dupe@example.com", "password": "securepass123"}
@@ -69,3 +90,47 @@ async def test_register_password_is_hashed(client: AsyncClient) -> None:
     data = response.json()
     assert data["email"] == "hash@example.com"
     assert "password_hash" not in data
+
+
+@pytest.mark.asyncio
+async def test_register_returns_503_when_password_pool_is_full(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(password_pool, "max_workers", 0)
+    monkeypatch.setattr(password_pool, "max_queue", 0)
+    rejected_before = password_pool.rejected
+
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": "busy@example.com", "password": "securepass123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert password_pool.rejected == rejected_before + 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hash_keeps_its_pool_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A cancelled caller does not free the slot while its hash is still running."""
+    monkeypatch.setattr(password_pool, "max_workers", 1)
+    monkeypatch.setattr(password_pool, "max_queue", 0)
+    release = threading.Event()
+    in_flight_before = password_pool.in_flight
+
+    task = asyncio.create_task(password_pool.run(release.wait))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert password_pool.in_flight == in_flight_before + 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        await password_pool.run(release.wait)
+    assert exc_info.value.status_code == 503
+
+    release.set()
+    for _ in range(100):
+        if password_pool.in_flight == in_flight_before:
+            break
+        await asyncio.sleep(0.01)
+    assert password_pool.in_flight == in_flight_before
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from database.chord_ranks import DIGITS, rank_between, rerank, spread_ranks
+
+
+def test_rank_between_open_ends() -> None:
+    first = rank_between(None, None)
+    assert rank_between(first, None) > first
+    assert rank_between(None, first) < first
+
+
+def test_rank_between_rejects_out_of_order_bounds() -> None:
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+    with pytest.raises(ValueError):
+        rank_between("a", "a")
+
+
+def test_repeated_appends_and_prepends_stay_short() -> None:
+    keys = [rank_between(None, None)]
+    for _ in range(1000):
+        keys.append(rank_between(keys[-1], None))
+        keys.insert(0, rank_between(None, keys[0]))
+    assert keys == sorted(keys)
+    assert max(len(key) for key in keys) <= 20
+
+
+def test_random_inserts_keep_order_and_valid_keys() -> None:
+    generator = random.Random(7)
+    keys: list[str] = []
+    for _ in range(2000):
+        index = generator.randint(0, len(keys))
+        before = keys[index - 1] if index else None
+        after = keys[index] if index < len(keys) else None
+        key = rank_between(before, after)
+        assert not key.endswith(DIGITS[0])
+        keys.insert(index, key)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+@pytest.mark.parametrize("count", [1, 2, 61, 1000, 50_000])
+def test_spread_ranks(count: int) -> None:
+    keys = spread_ranks(count)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == count
+    # Appends after a respaced song still have single-digit room.
+    assert keys[-1][0] < DIGITS[-1]
+
+
+def test_rerank_only_rekeys_moved_chords() -> None:
+    current = spread_ranks(5)
+    # Move the last chord to the front.
+    order = [current[4], *current[:4]]
+    new_keys = rerank(order, set(current))
+    assert new_keys[1:] == [None] * 4
+    assert new_keys[0] < current[0]
+
+
+@pytest.mark.parametrize("count", [380, 1000, 5000])
+def test_rerank_keeps_keys_short_when_reversing(count: int) -> None:
+    current = spread_ranks(count)
+    order = current[::-1]
+    new_keys = rerank(order, set(current))
+    final = [new or old for new, old in zip(new_keys, order, strict=True)]
+    assert final == sorted(final)
+    assert len(set(final)) == count
+    assert max(map(len, final)) <= len(current[0]) + 4
+
+
+def test_rerank_shuffles() -> None:
+    generator = random.Random(3)
+    current = spread_ranks(40)
+    for _ in range(50):
+        order = current[:]
+        generator.shuffle(order)
+        new_keys = rerank(order, set(current))
+        final = [new or old for new, old in zip(new_keys, order, strict=True)]
+        assert final == sorted(final)
+        assert not {key for key in new_keys if key} & set(current)
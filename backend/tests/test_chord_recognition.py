@@ -0,0 +1,61 @@
+import pytest
+
+from music.recognition import NOTE_NAMES, identify, identify_voicing
+
+
+def voicing(*frets: int | None, tuning: str = "EADGBE") -> str | None:
+    """Name a diagram written low string to high, None for a muted string."""
+    count = len(frets)
+    markers = [
+        {"string": count - 1 - index, "fret": fret}
+        for index, fret in enumerate(frets)
+        if fret is not None
+    ]
+    identity = identify_voicing(markers, tuning, count)
+    return identity.symbol if identity else None
+
+
+@pytest.mark.parametrize(
+    ("frets", "symbol"),
+    [
+        ((None, 0, 2, 2, 2, 0), "A"),
+        ((None, 0, 2, 2, 1, 0), "Am"),
+        ((0, 2, 2, 1, 0, 0), "E"),
+        ((None, 3, 2, 0, 1, 0), "C"),
+        ((3, 2, 0, 0, 0, 3), "G"),
+        ((None, None, 0, 2, 3, 2), "D"),
+        ((None, 0, 2, 0, 2, 0), "A7"),
+        ((None, 0, 2, 1, 2, 0), "Amaj7"),
+        ((None, 0, 2, 0, 1, 0), "Am7"),
+        ((None, None, 0, 2, 3, 0), "Dsus2"),
+        ((None, 3, 5, 5, None, None), "C5"),
+        ((None, 3, 2, 3, 1, None), "C7"),
+    ],
+)
+def test_common_open_chords(frets: tuple, symbol: str) -> None:
+    assert voicing(*frets) == symbol
+
+
+def test_bass_note_picks_inversion_and_spelling() -> None:
+    first_inversion = identify([52, 55, 60])  # E G C
+    assert first_inversion.symbol == "C/E"
+    assert first_inversion.inversion == 1
+    # The same pitch classes read as C6 over C and Am7 over A.
+    assert identify([48, 52, 55, 57]).symbol == "C6"
+    assert identify([45, 48, 52, 55]).symbol == "Am7"
+
+
+def test_other_tunings_and_string_counts() -> None:
+    assert voicing(0, 0, 0, 2, 3, 2, tuning="DADGBE") == "D"
+    assert voicing(None, 0, 2, 2, 1, 0, 0, tuning="BEADGBE") == "E"
+
+
+def test_unrecognized_voicings() -> None:
+    assert identify([]) is None
+    assert identify([60]) is None
+    assert identify([60, 61, 62]) is None
+
+
+def test_every_root_is_named() -> None:
+    for root in range(12):
+        assert identify([48 + root, 52 + root, 55 + root]).symbol == NOTE_NAMES[root]
@@ -1,9 +1,20 @@
+import asyncio
 import uuid
+from collections.abc import AsyncGenerator
+from pathlib import Path
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+import routers.chords
 from auth.tokens import create_access_token
+from database.session import get_db
+from main import app
+from models.base import Base
+from models.chord import Chord
+from music.chords import shape_fingerprint
 
 
 @pytest.fixture
@@ -122,6 +133,50 @@ async def test_list_chords_ordered_by_position(
     assert data[1]["position"] == 1
 
 
+@pytest.mark.asyncio
+async def test_list_chords_paginates_by_position(
+    client: AsyncClient, auth_headers: dict, song: dict
+) -> None:
+    """With a limit, chords come back in keyset pages in position order."""
+    for name in ["C0", "C1", "C2", "C3", "C4"]:
+        await client.post(
+            f"/api/songs/{song['id']}/chords",
+            json={"name": name, "markers": SAMPLE_MARKERS},
+            headers=auth_headers,
+        )
+
+    names = []
+    after = None
+    pages = 0
+    while True:
+        params = {"limit": 2} | ({"after": after} if after else {})
+        response = await client.get(
+            f"/api/songs/{song['id']}/chords", params=params, headers=auth_headers
+        )
+        assert response.status_code == 200
+        page = response.json()
+        names.extend(c["name"] for c in page["items"])
+        pages += 1
+        after = page["next_cursor"]
+        if after is None:
+            break
+
+    assert names == ["C0", "C1", "C2", "C3", "C4"]
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_list_chords_rejects_invalid_cursor(
+    client: AsyncClient, auth_headers: dict, song: dict
+) -> None:
+    response = await client.get(
+        f"/api/songs/{song['id']}/chords",
+        params={"limit": 2, "after": "not-a-cursor"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_list_chords_validates_song_ownership(
     client: AsyncClient,
@@ -203,6 +258,26 @@ async def test_create_chord_defaults(client: AsyncClient, auth_headers: dict, so
     assert data["tuning"] == "EADGBE"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "marker",
+    [
+        {"string": 0, "fret": 2**31},
+        {"string": 0, "fret": 25},
+        {"string": 0, "fret": -1},
+        {"string": -1, "fret": 0},
+        {"string": 50, "fret": 0},
+    ],
+)
+async def test_create_chord_rejects_markers_off_the_fretboard(
+    client: AsyncClient, auth_headers: dict, song: dict, marker: dict
+) -> None:
+    response = await client.post(
+        f"/api/songs/{song['id']}/chords", json={"markers": [marker]}, headers=auth_headers
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_create_chord_in_other_users_song(
     client: AsyncClient, other_auth_headers: dict, song: dict
@@ -279,6 +354,59 @@ async def test_update_chord_partial(client: AsyncClient, auth_headers: dict, son
     assert data["markers"] == SAMPLE_MARKERS  # unchanged
 
 
+@pytest.mark.asyncio
+async def test_update_chord_authorizes_in_one_query(
+    client: AsyncClient, auth_headers: dict, song: dict, sql_statements: list[str]
+) -> None:
+    """Resolving chord -> song -> project -> role takes a single round trip."""
+    create_resp = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "Original", "markers": SAMPLE_MARKERS},
+        headers=auth_headers,
+    )
+    chord_id = create_resp.json()["id"]
+    sql_statements.clear()
+
+    response = await client.put(
+        f"/api/chords/{chord_id}", json={"name": "Renamed"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    first_write = next(i for i, s in enumerate(sql_statements) if s.startswith("UPDATE"))
+    assert len(sql_statements[:first_write]) == 1
+
+
+@pytest.mark.asyncio
+async def test_chord_writes_skip_refresh(
+    client: AsyncClient, auth_headers: dict, song: dict, sql_statements: list[str]
+) -> None:
+    """Create and update read server defaults through RETURNING, never re-selecting the row."""
+    sql_statements.clear()
+    create_resp = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "Original", "markers": SAMPLE_MARKERS},
+        headers=auth_headers,
+    )
+    assert create_resp.status_code == 201
+    assert create_resp.json()["created_at"]
+    write = next(i for i, s in enumerate(sql_statements) if s.startswith("INSERT INTO chords"))
+    assert "RETURNING" in sql_statements[write]
+    # Only the position count follows the write
+    assert len(sql_statements[write + 1 :]) == 1
+    assert "count(" in sql_statements[-1]
+
+    sql_statements.clear()
+    response = await client.put(
+        f"/api/chords/{create_resp.json()['id']}", json={"name": "Renamed"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["updated_at"]
+    write = next(i for i, s in enumerate(sql_statements) if s.startswith("UPDATE chords"))
+    assert "RETURNING" in sql_statements[write]
+    assert len(sql_statements[write + 1 :]) == 1
+    assert "count(" in sql_statements[-1]
+
+
 @pytest.mark.asyncio
 async def test_update_chord_not_found(client: AsyncClient, auth_headers: dict) -> None:
     """Returns 404 for non-existent chord."""
@@ -461,3 +589,570 @@ async def test_reorder_chords_forbidden(
         headers=other_auth_headers,
     )
     assert response.status_code == 403
+
+
+# --- Chord Names ---
+
+A_MINOR_MARKERS = [
+    {"string": 0, "fret": 0},
+    {"string": 1, "fret": 1},
+    {"string": 2, "fret": 2},
+    {"string": 3, "fret": 2},
+    {"string": 4, "fret": 0},
+]
+
+
+@pytest.mark.asyncio
+async def test_name_song_chords(client: AsyncClient, auth_headers: dict, song: dict) -> None:
+    """Names each chord from its markers, null fields when nothing matches."""
+    await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "Am", "markers": A_MINOR_MARKERS},
+        headers=auth_headers,
+    )
+    await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "Empty"},
+        headers=auth_headers,
+    )
+
+    response = await client.get(f"/api/songs/{song['id']}/chords/names", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert data[0]["symbol"] == "Am"
+    assert data[0]["root"] == "A"
+    assert data[0]["quality"] == "m"
+    assert data[0]["bass"] == "A"
+    assert data[0]["inversion"] == 0
+    assert data[1]["symbol"] is None
+    assert data[1]["root"] is None
+
+
+@pytest.mark.asyncio
+async def test_name_project_chords(
+    client: AsyncClient, auth_headers: dict, project: dict, song: dict
+) -> None:
+    """Names chords across every song of a project."""
+    second = await client.post(
+        f"/api/projects/{project['id']}/songs",
+        json={"name": "Second Song"},
+        headers=auth_headers,
+    )
+    for song_id in [song["id"], second.json()["id"]]:
+        await client.post(
+            f"/api/songs/{song_id}/chords",
+            json={"markers": A_MINOR_MARKERS, "tuning": "DADGBE"},
+            headers=auth_headers,
+        )
+
+    response = await client.get(f"/api/projects/{project['id']}/chords/names", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert {entry["symbol"] for entry in data} == {"Am"}
+
+
+@pytest.mark.asyncio
+async def test_name_chords_forbidden(
+    client: AsyncClient, other_auth_headers: dict, project: dict, song: dict
+) -> None:
+    """Returns 403 when naming another user's chords."""
+    response = await client.get(f"/api/songs/{song['id']}/chords/names", headers=other_auth_headers)
+    assert response.status_code == 403
+    response = await client.get(
+        f"/api/projects/{project['id']}/chords/names", headers=other_auth_headers
+    )
+    assert response.status_code == 403
+
+
+# --- Voicings ---
+
+
+@pytest.mark.asyncio
+async def test_list_voicings(client: AsyncClient, auth_headers: dict) -> None:
+    """Generated voicings come back easiest first, ready to save as chords."""
+    response = await client.get(
+        "/api/chords/voicings",
+        params={"symbol": "E", "tuning": "BEADGBE", "string_count": 7, "limit": 5},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 5
+    assert data[0]["name"] == "E"
+    assert data[0]["string_count"] == 7
+    assert data[0]["tuning"] == "BEADGBE"
+    assert data[0]["stretch"] <= data[-1]["stretch"]
+
+
+@pytest.mark.asyncio
+async def test_list_voicings_unknown_symbol(client: AsyncClient, auth_headers: dict) -> None:
+    """Returns 400 for a symbol the generator cannot parse."""
+    response = await client.get(
+        "/api/chords/voicings", params={"symbol": "Hmaj"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_voicings_requires_auth(client: AsyncClient) -> None:
+    """Returns 401 without a token."""
+    response = await client.get("/api/chords/voicings", params={"symbol": "A"})
+    assert response.status_code == 401
+
+
+# --- Shape Search ---
+
+A_SHAPE = [
+    {"string": 0, "fret": 0},
+    {"string": 1, "fret": 2},
+    {"string": 2, "fret": 2},
+    {"string": 3, "fret": 2},
+    {"string": 4, "fret": 0},
+]
+B_SHAPE = [{"string": m["string"], "fret": m["fret"] + 2} for m in A_SHAPE]
+
+
+def test_shape_fingerprint_is_position_independent() -> None:
+    a_fingerprint, a_offset = shape_fingerprint(A_SHAPE, "EADGBE", 6)
+    b_fingerprint, b_offset = shape_fingerprint(B_SHAPE, "EADGBE", 6)
+    assert a_fingerprint == b_fingerprint == "40.45.50.55.59.64/x.0.2.2.2.0"
+    assert (a_offset, b_offset) == (0, 2)
+    assert shape_fingerprint(A_SHAPE, "DADGBE", 6)[0] != a_fingerprint
+    assert shape_fingerprint([], "EADGBE", 6) is None
+
+
+@pytest.mark.asyncio
+async def test_search_chords_by_shape(
+    client: AsyncClient,
+    auth_headers: dict,
+    other_auth_headers: dict,
+    project: dict,
+    song: dict,
+    other_song: dict,
+) -> None:
+    """Finds exact and transposed shapes, only in projects the caller can access."""
+    for markers in [A_SHAPE, B_SHAPE, SAMPLE_MARKERS]:
+        await client.post(
+            f"/api/songs/{song['id']}/chords",
+            json={"markers": markers},
+            headers=auth_headers,
+        )
+    await client.post(
+        f"/api/songs/{other_song['id']}/chords",
+        json={"markers": A_SHAPE},
+        headers=other_auth_headers,
+    )
+
+    response = await client.post(
+        "/api/chords/search", json={"markers": A_SHAPE}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["song_id"] == song["id"]
+    assert data[0]["project_id"] == project["id"]
+    assert data[0]["fret_offset"] == 0
+    assert data[0]["position"] == 0
+
+    response = await client.post(
+        "/api/chords/search",
+        json={"markers": B_SHAPE, "transposed": True},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert [match["fret_offset"] for match in response.json()] == [-2, 0]
+    assert [match["position"] for match in response.json()] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_search_chords_includes_shared_projects(
+    client: AsyncClient,
+    auth_headers: dict,
+    other_user: dict,
+    other_auth_headers: dict,
+    project: dict,
+    song: dict,
+) -> None:
+    """Chords in a project shared with the caller are searched once accepted."""
+    await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"markers": A_SHAPE},
+        headers=auth_headers,
+    )
+    search = {"markers": A_SHAPE}
+    response = await client.post("/api/chords/search", json=search, headers=other_auth_headers)
+    assert response.json() == []
+
+    invitation = await client.post(
+        f"/api/projects/{project['id']}/collaborators",
+        json={"identifier": other_user["email"], "role": "viewer"},
+        headers=auth_headers,
+    )
+    await client.patch(
+        f"/api/collaborators/{invitation.json()['id']}",
+        json={"status": "accepted"},
+        headers=other_auth_headers,
+    )
+    response = await client.post("/api/chords/search", json=search, headers=other_auth_headers)
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_updates_with_edited_markers(
+    client: AsyncClient, auth_headers: dict, song: dict
+) -> None:
+    """Editing a chord's markers moves it to its new shape."""
+    created = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"markers": A_SHAPE},
+        headers=auth_headers,
+    )
+    await client.put(
+        f"/api/chords/{created.json()['id']}",
+        json={"markers": SAMPLE_MARKERS},
+        headers=auth_headers,
+    )
+
+    response = await client.post(
+        "/api/chords/search", json={"markers": A_SHAPE}, headers=auth_headers
+    )
+    assert response.json() == []
+    response = await client.post(
+        "/api/chords/search", json={"markers": SAMPLE_MARKERS}, headers=auth_headers
+    )
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_chords_empty_shape(client: AsyncClient, auth_headers: dict) -> None:
+    """Returns 400 for a shape with no markers."""
+    response = await client.post("/api/chords/search", json={"markers": []}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+# --- Rank Keys ---
+
+
+async def create_chords(client: AsyncClient, headers: dict, song: dict, names: list[str]) -> list:
+    ids = []
+    for name in names:
+        response = await client.post(
+            f"/api/songs/{song['id']}/chords",
+            json={"name": name, "markers": SAMPLE_MARKERS},
+            headers=headers,
+        )
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def rank_keys(db_session: AsyncSession, song: dict) -> dict[str, str]:
+    result = await db_session.execute(
+        select(Chord.id, Chord.rank_key).where(Chord.song_id == uuid.UUID(song["id"]))
+    )
+    return {str(chord_id): rank_key for chord_id, rank_key in result}
+
+
+@pytest.mark.asyncio
+async def test_move_chord(client: AsyncClient, auth_headers: dict, song: dict) -> None:
+    """Moves one chord after another, or to the front with a null after_id."""
+    a, b, c = await create_chords(client, auth_headers, song, ["A", "B", "C"])
+
+    response = await client.put(f"/api/chords/{a}/move", json={"after_id": b}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["position"] == 1
+
+    response = await client.put(f"/api/chords/{c}/move", json={}, headers=auth_headers)
+    assert response.json()["position"] == 0
+
+    response = await client.get(f"/api/songs/{song['id']}/chords", headers=auth_headers)
+    assert [(chord["name"], chord["position"]) for chord in response.json()] == [
+        ("C", 0),
+        ("B", 1),
+        ("A", 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_move_chord_writes_one_row(
+    client: AsyncClient, auth_headers: dict, song: dict, db_session: AsyncSession
+) -> None:
+    """Only the moved chord's rank key changes."""
+    ids = await create_chords(client, auth_headers, song, ["A", "B", "C", "D"])
+    before = await rank_keys(db_session, song)
+
+    await client.put(f"/api/chords/{ids[3]}/move", json={"after_id": ids[0]}, headers=auth_headers)
+
+    after = await rank_keys(db_session, song)
+    assert [chord_id for chord_id in ids if before[chord_id] != after[chord_id]] == [ids[3]]
+
+
+@pytest.mark.asyncio
+async def test_move_chord_invalid_after_id(
+    client: AsyncClient, auth_headers: dict, song: dict, other_song: dict
+) -> None:
+    """Returns 400 unless after_id is another chord of the same song."""
+    (a,) = await create_chords(client, auth_headers, song, ["A"])
+    for after_id in [a, str(uuid.uuid4())]:
+        response = await client.put(
+            f"/api/chords/{a}/move", json={"after_id": after_id}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_move_chord_forbidden(
+    client: AsyncClient, auth_headers: dict, other_auth_headers: dict, song: dict
+) -> None:
+    """Returns 403 when moving another user's chord."""
+    (a,) = await create_chords(client, auth_headers, song, ["A"])
+    response = await client.put(f"/api/chords/{a}/move", json={}, headers=other_auth_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_reorder_rewrites_only_moved_chords(
+    client: AsyncClient, auth_headers: dict, song: dict, db_session: AsyncSession
+) -> None:
+    """Moving one chord through the full reorder endpoint still writes one row."""
+    ids = await create_chords(client, auth_headers, song, ["A", "B", "C", "D", "E"])
+    before = await rank_keys(db_session, song)
+
+    order = [ids[4], *ids[:4]]
+    response = await client.put(
+        f"/api/songs/{song['id']}/chords/reorder",
+        json={"chord_ids": order},
+        headers=auth_headers,
+    )
+    assert [chord["id"] for chord in response.json()] == order
+
+    after = await rank_keys(db_session, song)
+    assert [chord_id for chord_id in ids if before[chord_id] != after[chord_id]] == [ids[4]]
+
+
+@pytest.mark.asyncio
+async def test_delete_chord_writes_no_other_rows(
+    client: AsyncClient, auth_headers: dict, song: dict, sql_statements: list[str]
+) -> None:
+    """Deleting a chord leaves every other chord's row alone."""
+    ids = await create_chords(client, auth_headers, song, ["A", "B", "C"])
+    sql_statements.clear()
+
+    await client.delete(f"/api/chords/{ids[0]}", headers=auth_headers)
+
+    assert not [sql for sql in sql_statements if sql.startswith("UPDATE chords")]
+
+
+@pytest.mark.asyncio
+async def test_paginated_positions_continue_across_pages(
+    client: AsyncClient, auth_headers: dict, song: dict
+) -> None:
+    """Positions on later pages count the chords on earlier ones."""
+    await create_chords(client, auth_headers, song, ["C0", "C1", "C2", "C3"])
+    first = await client.get(
+        f"/api/songs/{song['id']}/chords", params={"limit": 2}, headers=auth_headers
+    )
+    second = await client.get(
+        f"/api/songs/{song['id']}/chords",
+        params={"limit": 2, "after": first.json()["next_cursor"]},
+        headers=auth_headers,
+    )
+    assert [chord["position"] for chord in second.json()["items"]] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_long_rank_keys_are_rebalanced(
+    client: AsyncClient,
+    auth_headers: dict,
+    song: dict,
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A write that leaves a key past the limit respaces the song in the background."""
+    monkeypatch.setattr(routers.chords, "CHORD_RANK_MAX_LENGTH", 2)
+    ids = await create_chords(client, auth_headers, song, ["A", "B"])
+    # Keep splitting the same gap until a key outgrows the limit.
+    for _ in range(8):
+        await client.put(
+            f"/api/chords/{ids[-1]}/move", json={"after_id": ids[0]}, headers=auth_headers
+        )
+        ids.append((await create_chords(client, auth_headers, song, [f"X{len(ids)}"]))[0])
+
+    response = await client.get(f"/api/songs/{song['id']}/chords", headers=auth_headers)
+    order = [chord["id"] for chord in response.json()]
+    keys = await rank_keys(db_session, song)
+    assert max(len(key) for key in keys.values()) <= 2
+    assert sorted(keys, key=keys.get) == order
+
+
+@pytest.fixture
+async def file_db(tmp_path: Path) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Route requests to an on-disk database with a connection per session.
+
+    The shared in-memory test database runs every session on one connection, so it cannot
+    show what concurrent transactions do.
+    """
+    file_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stress.db'}")
+    async with file_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(file_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_file_db() -> AsyncGenerator[AsyncSession, None]:
+        async with sessions() as session:
+            yield session
+
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = get_file_db
+    yield sessions
+    app.dependency_overrides.update(previous)
+    await file_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_parallel_creates_get_distinct_positions(
+    client: AsyncClient, file_db: async_sessionmaker[AsyncSession]
+) -> None:
+    """100 concurrent appends to one song all succeed with distinct positions and keys."""
+    user = await client.post(
+        "/api/auth/register", json={"email": "stress@test.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {create_access_token(uuid.UUID(user.json()['id']))}"}
+    project = await client.post("/api/projects", json={"name": "Stress"}, headers=headers)
+    song = await client.post(
+        f"/api/projects/{project.json()['id']}/songs", json={"name": "Stress"}, headers=headers
+    )
+    song = song.json()
+
+    responses = await asyncio.gather(
+        *[
+            client.post(
+                f"/api/songs/{song['id']}/chords",
+                json={"name": f"C{i}", "markers": SAMPLE_MARKERS},
+                headers=headers,
+            )
+            for i in range(100)
+        ]
+    )
+    assert [response.status_code for response in responses] == [201] * 100
+    assert sorted(response.json()["position"] for response in responses) == list(range(100))
+
+    async with file_db() as session:
+        keys = await rank_keys(session, song)
+    assert len(keys) == len(set(keys.values())) == 100
+    listed = await client.get(f"/api/songs/{song['id']}/chords", headers=headers)
+    assert [chord["position"] for chord in listed.json()] == list(range(100))
+
+    ids = list(keys)
+    responses = await asyncio.gather(
+        *[
+            client.put(f"/api/chords/{chord_id}/move", json={"after_id": ids[0]}, headers=headers)
+            for chord_id in ids[2:]
+        ]
+    )
+    assert {response.status_code for response in responses} == {200}
+    async with file_db() as session:
+        keys = await rank_keys(session, song)
+    assert len(set(keys.values())) == 100
+
+
+# --- Bulk ---
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_update_delete(
+    client: AsyncClient, auth_headers: dict, song: dict
+) -> None:
+    """Applies creates, updates and deletes together and reports what changed."""
+    a, b, c = await create_chords(client, auth_headers, song, ["A", "B", "C"])
+    response = await client.post(
+        f"/api/songs/{song['id']}/chords/bulk",
+        json={
+            "ops": [
+                {"op": "create", "name": "D", "markers": A_SHAPE},
+                {"op": "update", "id": a, "name": "A2", "markers": A_SHAPE},
+                {"op": "delete", "id": b},
+                {"op": "create", "name": "E"},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 1
+    assert data["deleted"] == 1
+    assert [(chord["name"], chord["position"]) for chord in data["created"]] == [
+        ("D", 2),
+        ("E", 3),
+    ]
+    assert data["created"][0]["markers"] == A_SHAPE
+    assert data["created"][0]["created_at"]
+
+    listed = await client.get(f"/api/songs/{song['id']}/chords", headers=auth_headers)
+    assert [chord["name"] for chord in listed.json()] == ["A2", "C", "D", "E"]
+    assert listed.json()[0]["markers"] == A_SHAPE
+    assert listed.json()[0]["string_count"] == 6
+
+    # Bulk writes keep the shape index current.
+    search = await client.post(
+        "/api/chords/search", json={"markers": A_SHAPE}, headers=auth_headers
+    )
+    assert sorted(match["name"] for match in search.json()) == ["A2", "D"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_uses_few_statements(
+    client: AsyncClient, auth_headers: dict, song: dict, sql_statements: list[str]
+) -> None:
+    """A 200-chord import is a handful of statements, not a few per chord."""
+    ops = [{"op": "create", "name": f"C{i}", "markers": SAMPLE_MARKERS} for i in range(200)]
+    response = await client.post(
+        f"/api/songs/{song['id']}/chords/bulk", json={"ops": ops}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 200
+    assert [chord["position"] for chord in response.json()["created"]] == list(range(200))
+    assert len(sql_statements) <= 6
+
+
+@pytest.mark.asyncio
+async def test_bulk_validates_before_writing(
+    client: AsyncClient, auth_headers: dict, song: dict, other_song: dict, other_auth_headers: dict
+) -> None:
+    """Unknown or repeated targets reject the whole batch."""
+    (a,) = await create_chords(client, auth_headers, song, ["A"])
+    other = await client.post(
+        f"/api/songs/{other_song['id']}/chords", json={"name": "X"}, headers=other_auth_headers
+    )
+    url = f"/api/songs/{song['id']}/chords/bulk"
+
+    response = await client.post(
+        url,
+        json={"ops": [{"op": "create", "name": "B"}, {"op": "delete", "id": other.json()["id"]}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+
+    response = await client.post(
+        url,
+        json={"ops": [{"op": "update", "id": a, "name": "A2"}, {"op": "delete", "id": a}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+    response = await client.post(url, json={"ops": [{"op": "rename"}]}, headers=auth_headers)
+    assert response.status_code == 422
+
+    listed = await client.get(f"/api/songs/{song['id']}/chords", headers=auth_headers)
+    assert [chord["name"] for chord in listed.json()] == ["A"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_forbidden(client: AsyncClient, other_auth_headers: dict, song: dict) -> None:
+    """Returns 403 for a song the caller cannot edit."""
+    response = await client.post(
+        f"/api/songs/{song['id']}/chords/bulk",
+        json={"ops": [{"op": "create", "name": "A"}]},
+        headers=other_auth_headers,
+    )
+    assert response.status_code == 403
@@ -1,9 +1,13 @@
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.tokens import create_access_token
+from models.collaborator import ProjectCollaborator
 
 
 @pytest.fixture
@@ -214,6 +218,41 @@ async def test_update_collaborator_status_declined(
     assert response.json()["status"] == "declined"
 
 
+@pytest.mark.asyncio
+async def test_collaborator_writes_skip_refresh(
+    client: AsyncClient,
+    owner_headers: dict,
+    invitee_headers: dict,
+    project: dict,
+    invitee: dict,
+    sql_statements: list[str],
+) -> None:
+    """Invite and accept read server defaults through RETURNING, never re-selecting the row."""
+    sql_statements.clear()
+    response = await client.post(
+        f"/api/projects/{project['id']}/collaborators",
+        json={"identifier": invitee["email"], "role": "editor"},
+        headers=owner_headers,
+    )
+    assert response.status_code == 201
+    assert response.json()["created_at"]
+    assert sql_statements[-1].startswith("INSERT INTO project_collaborators")
+    assert "RETURNING" in sql_statements[-1]
+
+    sql_statements.clear()
+    response = await client.patch(
+        f"/api/collaborators/{response.json()['id']}",
+        json={"status": "accepted"},
+        headers=invitee_headers,
+    )
+    assert response.status_code == 200
+    write = next(
+        i for i, s in enumerate(sql_statements) if s.startswith("UPDATE project_collaborators")
+    )
+    assert "RETURNING" in sql_statements[write]
+    assert not any(s.startswith("SELECT") for s in sql_statements[write:])
+
+
 @pytest.mark.asyncio
 async def test_update_collaborator_status_403_non_invitee(
     client: AsyncClient, owner_headers: dict, invitation: dict
@@ -307,6 +346,47 @@ async def test_list_collaborators_admin(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_list_collaborators_paginates_in_invitation_order(
+    client: AsyncClient,
+    owner_headers: dict,
+    project: dict,
+    invitee: dict,
+    third_user: dict,
+    db_session: AsyncSession,
+) -> None:
+    """With a limit, collaborators come back in keyset pages in creation order."""
+    ids = []
+    for user in [invitee, third_user]:
+        resp = await client.post(
+            f"/api/projects/{project['id']}/collaborators",
+            json={"identifier": user["email"], "role": "viewer"},
+            headers=owner_headers,
+        )
+        ids.append(resp.json()["id"])
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    for offset, collab_id in enumerate(ids):
+        await db_session.execute(
+            update(ProjectCollaborator)
+            .where(ProjectCollaborator.id == uuid.UUID(collab_id))
+            .values(created_at=base + timedelta(minutes=offset))
+        )
+    await db_session.commit()
+
+    url = f"/api/projects/{project['id']}/collaborators"
+    first = (await client.get(url, params={"limit": 1}, headers=owner_headers)).json()
+    assert [c["id"] for c in first["items"]] == ids[:1]
+    assert first["items"][0]["invitee_email"] == invitee["email"]
+
+    second = (
+        await client.get(
+            url, params={"limit": 1, "after": first["next_cursor"]}, headers=owner_headers
+        )
+    ).json()
+    assert [c["id"] for c in second["items"]] == ids[1:]
+    assert second["next_cursor"] is None
+
+
 @pytest.mark.asyncio
 async def test_list_collaborators_403_non_owner(
     client: AsyncClient, third_headers: dict, project: dict, invitation: dict
@@ -0,0 +1,84 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database.pool import MeteredQueuePool
+from database.session import engine_options
+
+
+@pytest.fixture
+async def metered_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    """An on-disk SQLite engine with a one-connection metered pool and a short timeout."""
+    metered = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield metered
+    await metered.dispose()
+
+
+def test_engine_options_for_asyncpg() -> None:
+    options = engine_options("postgresql+asyncpg://user:pass@db:5432/app")
+    assert options["poolclass"] is MeteredQueuePool
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= set(
+        options
+    )
+    assert set(options["connect_args"]) == {"prepared_statement_cache_size", "statement_cache_size"}
+
+
+def test_engine_options_leave_sqlite_alone() -> None:
+    assert engine_options("sqlite+aiosqlite://") == {}
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_checkouts(metered_engine: AsyncEngine) -> None:
+    async with metered_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = metered_engine.pool.stats()
+        assert stats["checked_out"] == 1
+        assert stats["pool_size"] == 1
+
+    stats = metered_engine.pool.stats()
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_timeouts_and_wait(metered_engine: AsyncEngine) -> None:
+    """A checkout that waits out pool_timeout is counted and its wait recorded."""
+    async with metered_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with metered_engine.connect():
+                pass
+
+    stats = metered_engine.pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["max_wait_seconds"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_survive_dispose(metered_engine: AsyncEngine) -> None:
+    async with metered_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await metered_engine.dispose()
+
+    async with metered_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert metered_engine.pool.stats()["checkouts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_db_pool(client: AsyncClient, metrics_headers: dict) -> None:
+    response = await client.get("/api/metrics", headers=metrics_headers)
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
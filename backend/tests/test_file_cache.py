@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+
+from cache.file_cache import FileCache
+
+
+def test_write_through_stores_complete_file(tmp_path: Path) -> None:
+    cache = FileCache(tmp_path, max_bytes=1024, suffix=".bin")
+    assert cache.get(("a", 1)) is None
+
+    streamed = list(cache.write_through(("a", 1), [b"ab", b"cd"]))
+    assert streamed == [b"ab", b"cd"]
+
+    path = cache.get(("a", 1))
+    assert path is not None and path.read_bytes() == b"abcd"
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get(("a", 2)) is None
+
+
+def test_abandoned_stream_leaves_no_entry(tmp_path: Path) -> None:
+    cache = FileCache(tmp_path, max_bytes=1024)
+    stream = cache.write_through("key", [b"ab", b"cd"])
+    next(stream)
+    stream.close()
+
+    assert cache.get("key") is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_least_recently_used_files_are_pruned(tmp_path: Path) -> None:
+    cache = FileCache(tmp_path, max_bytes=10)
+    list(cache.write_through("old", [b"x" * 6]))
+    os.utime(cache.get("old"), (0, 0))
+    list(cache.write_through("new", [b"y" * 6]))
+
+    assert cache.get("old") is None
+    assert cache.get("new") is not None
+    assert cache.evictions == 1
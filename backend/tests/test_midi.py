@@ -0,0 +1,108 @@
+import struct
+
+import numpy as np
+import pytest
+
+from music.chords import chord_pitches, parse_tuning
+from music.midi import TICKS_PER_QUARTER, _varlen, check_midi_range, midi_file_chunks
+from music.timeline import build_timeline, chord_grid_from_beats
+
+A_MAJOR = [{"string": 3, "fret": 2}, {"string": 2, "fret": 2}, {"string": 1, "fret": 2}]
+
+
+def test_parse_tuning_places_strings_in_ascending_octaves() -> None:
+    assert parse_tuning("EADGBE") == (40, 45, 50, 55, 59, 64)
+    assert parse_tuning("DADF#AD") == (38, 45, 50, 54, 57, 62)
+
+
+def test_chord_pitches_count_strings_from_the_highest() -> None:
+    assert chord_pitches(A_MAJOR, "EADGBE", 6) == [52, 57, 61]
+    assert chord_pitches([{"string": 5, "fret": 0}, {"string": 0, "fret": 0}], "EADGBE", 6) == [
+        40,
+        64,
+    ]
+    assert chord_pitches([{"string": 9, "fret": 1}], "EADGBE", 6) == []
+
+
+def test_varlen() -> None:
+    assert _varlen(0) == b"\x00"
+    assert _varlen(0x7F) == b"\x7f"
+    assert _varlen(0x80) == b"\x81\x00"
+    assert _varlen(0x0FFFFFFF) == b"\xff\xff\xff\x7f"
+
+
+def _timeline(order: list[int], chords: dict[tuple[int, int], int], numerator: int = 4):
+    keys = list(chords)
+    grid = chord_grid_from_beats(
+        np.array([p for p, _ in keys], dtype=np.int64),
+        np.array([b for _, b in keys], dtype=np.int64),
+        np.array(list(chords.values()), dtype=np.int64),
+        measure_count=max(order) + 1,
+        numerator=numerator,
+    )
+    return build_timeline(np.array(order), grid, 4, 120, {1: 60})
+
+
+def test_midi_file_structure_and_events() -> None:
+    timeline = _timeline([0, 1], {(0, 1): 0, (1, 3): 1})
+    data = b"".join(midi_file_chunks(timeline, [(40, 45), (50,)], 4, 4))
+
+    assert data[:14] == b"MThd" + struct.pack(">IHHH", 6, 0, 1, TICKS_PER_QUARTER)
+    assert data[14:18] == b"MTrk"
+    (length,) = struct.unpack(">I", data[18:22])
+    assert len(data) == 22 + length
+    assert data.endswith(b"\xff\x2f\x00")
+
+    track = data[22:]
+    assert b"\xff\x51\x03\x07\xa1\x20" in track  # 120 bpm
+    assert b"\xff\x51\x03\x0f\x42\x40" in track  # 60 bpm from measure 1
+    assert track.count(b"\x90") == 3 and track.count(b"\x80") == 3
+    # The first chord rings until beat 6 (2 beats at 120 + 2 beats at 60 after the change).
+    assert b"\x87\x40\x80\x28\x00" in track
+
+
+def test_long_songs_stream_in_chunks() -> None:
+    order = list(range(4000))
+    timeline = _timeline(order, {(p, 1): p % 2 for p in order})
+    chunks = list(midi_file_chunks(timeline, [(40, 45, 50), (52, 57, 61)], 4, 4))
+
+    assert len(chunks) > 1
+    data = b"".join(chunks)
+    (length,) = struct.unpack(">I", data[18:22])
+    assert len(data) == 22 + length
+
+
+@pytest.mark.parametrize(
+    ("chord_pitches", "numerator", "denominator"),
+    [([(40, 128)], 4, 4), ([(-1,)], 4, 4), ([], 0, 4), ([], 256, 4), ([], 4, 0), ([], 4, 3)],
+)
+def test_check_midi_range_rejects_unwritable_values(
+    chord_pitches: list, numerator: int, denominator: int
+) -> None:
+    with pytest.raises(ValueError):
+        check_midi_range(_timeline([0, 1], {}), chord_pitches, numerator, denominator)
+
+
+def test_check_midi_range_accepts_the_full_range() -> None:
+    check_midi_range(_timeline([0, 1], {}), [(0, 127)], 255, 4)
+    grid = chord_grid_from_beats(
+        np.array([], dtype=np.int64),
+        np.array([], dtype=np.int64),
+        np.array([], dtype=np.int64),
+        measure_count=1,
+        numerator=3,
+    )
+    check_midi_range(build_timeline(np.array([0]), grid, 128, 120), [], 3, 128)
+
+
+def test_check_midi_range_rejects_tempos_beyond_the_tempo_event() -> None:
+    grid = chord_grid_from_beats(
+        np.array([], dtype=np.int64),
+        np.array([], dtype=np.int64),
+        np.array([], dtype=np.int64),
+        measure_count=2,
+        numerator=4,
+    )
+    check_midi_range(build_timeline(np.array([0, 1]), grid, 4, 120, {1: 3.6}), [], 4, 4)
+    with pytest.raises(ValueError):
+        check_midi_range(build_timeline(np.array([0, 1]), grid, 4, 120, {1: 2}), [], 4, 4)
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from music.playback import expand_repeats
+
+
+def measure(
+    repeat_start: bool = False, repeat_end: bool = False, ending: int | None = None
+) -> SimpleNamespace:
+    return SimpleNamespace(repeat_start=repeat_start, repeat_end=repeat_end, ending_number=ending)
+
+
+def test_no_repeats_plays_in_order() -> None:
+    assert expand_repeats([measure(), measure(), measure()]) == [0, 1, 2]
+    assert expand_repeats([]) == []
+
+
+def test_simple_repeat_plays_section_twice() -> None:
+    measures = [measure(), measure(repeat_start=True), measure(repeat_end=True), measure()]
+    assert expand_repeats(measures) == [0, 1, 2, 1, 2, 3]
+
+
+def test_repeat_end_without_start_repeats_from_previous_section() -> None:
+    measures = [measure(), measure(repeat_end=True), measure(), measure(repeat_end=True)]
+    assert expand_repeats(measures) == [0, 1, 0, 1, 2, 3, 2, 3]
+
+
+def test_first_and_second_endings() -> None:
+    measures = [
+        measure(repeat_start=True),
+        measure(),
+        measure(repeat_end=True, ending=1),
+        measure(ending=2),
+        measure(),
+    ]
+    assert expand_repeats(measures) == [0, 1, 2, 0, 1, 3, 4]
+
+
+def test_multi_measure_endings_and_third_pass() -> None:
+    measures = [
+        measure(repeat_start=True),
+        measure(ending=1),
+        measure(repeat_end=True, ending=1),
+        measure(repeat_end=True, ending=2),
+        measure(ending=3),
+    ]
+    assert expand_repeats(measures) == [0, 1, 2, 0, 3, 0, 4]
+
+
+def test_nested_repeats_replay_on_each_outer_pass() -> None:
+    measures = [
+        measure(repeat_start=True),
+        measure(repeat_start=True),
+        measure(repeat_end=True),
+        measure(repeat_end=True),
+        measure(),
+    ]
+    assert expand_repeats(measures) == [0, 1, 2, 1, 2, 3, 0, 1, 2, 1, 2, 3, 4]
+
+
+def test_long_song_expands_in_linear_time() -> None:
+    sections = [
+        [
+            measure(repeat_start=True),
+            measure(),
+            measure(repeat_end=True, ending=1),
+            measure(ending=2),
+        ]
+        for _ in range(25_000)
+    ]
+    measures = [m for section in sections for m in section]
+    order = expand_repeats(measures)
+    assert len(order) == 6 * 25_000
+    assert order[:7] == [0, 1, 2, 0, 1, 3, 4]
+
+
+def test_deeply_nested_repeats_stop_at_the_limit() -> None:
+    # Each nesting level doubles the result: 2**62 measures unbounded.
+    measures = [measure(repeat_start=True)] * 60 + [measure(repeat_end=True)] * 60
+    with pytest.raises(ValueError):
+        expand_repeats(measures, limit=10_000)
+    assert len(expand_repeats(measures[:3] + measures[-3:], limit=28)) == 28
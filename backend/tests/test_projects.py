@@ -1,9 +1,13 @@
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.tokens import create_access_token
+from models.project import Project
 
 
 @pytest.fixture
@@ -166,6 +170,28 @@ async def test_update_project(client: AsyncClient, auth_headers: dict) -> None:
     assert response.json()["name"] == "New Name"
 
 
+@pytest.mark.asyncio
+async def test_project_writes_return_timestamps_without_refresh(
+    client: AsyncClient, auth_headers: dict, sql_statements: list[str]
+) -> None:
+    """Create and update read created_at/updated_at back through RETURNING, not a SELECT."""
+    sql_statements.clear()
+    create_resp = await client.post("/api/projects", json={"name": "Old"}, headers=auth_headers)
+    assert create_resp.status_code == 201
+    assert create_resp.json()["created_at"]
+    assert sql_statements[-1].startswith("INSERT INTO projects")
+    assert "RETURNING" in sql_statements[-1]
+
+    sql_statements.clear()
+    response = await client.put(
+        f"/api/projects/{create_resp.json()['id']}", json={"name": "New"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["updated_at"]
+    assert sql_statements[-1].startswith("UPDATE projects")
+    assert "RETURNING" in sql_statements[-1]
+
+
 @pytest.mark.asyncio
 async def test_update_project_not_found(client: AsyncClient, auth_headers: dict) -> None:
     """Returns 404 for non-existent project."""
@@ -231,3 +257,77 @@ async def test_delete_project_forbidden(
     # Verify it still exists
     get_resp = await client.get(f"/api/projects/{project_id}", headers=auth_headers)
     assert get_resp.status_code == 200
+
+
+# --- Paginated listing ---
+
+
+async def _set_updated_at(db: AsyncSession, project_ids: list[str]) -> None:
+    """Give projects distinct updated_at values, newest first in the given order."""
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    for offset, project_id in enumerate(reversed(project_ids)):
+        await db.execute(
+            update(Project)
+            .where(Project.id == uuid.UUID(project_id))
+            .values(updated_at=base + timedelta(minutes=offset))
+        )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_list_projects_paginates_owned_and_shared(
+    client: AsyncClient,
+    auth_headers: dict,
+    other_auth_headers: dict,
+    registered_user: dict,
+    db_session: AsyncSession,
+) -> None:
+    """Keyset pages merge owned and shared projects in updated_at order."""
+    ids = []
+    for name in ["P0", "P1", "P2"]:
+        resp = await client.post("/api/projects", json={"name": name}, headers=auth_headers)
+        ids.append(resp.json()["id"])
+    shared_resp = await client.post(
+        "/api/projects", json={"name": "Shared"}, headers=other_auth_headers
+    )
+    shared = shared_resp.json()
+    invite_resp = await client.post(
+        f"/api/projects/{shared['id']}/collaborators",
+        json={"identifier": registered_user["email"], "role": "viewer"},
+        headers=other_auth_headers,
+    )
+    await client.patch(
+        f"/api/collaborators/{invite_resp.json()['id']}",
+        json={"status": "accepted"},
+        headers=auth_headers,
+    )
+    # Newest first: P2, Shared, P1, P0
+    await _set_updated_at(db_session, [ids[2], shared["id"], ids[1], ids[0]])
+
+    first = await client.get("/api/projects", params={"limit": 2}, headers=auth_headers)
+    assert first.status_code == 200
+    page = first.json()
+    assert [p["name"] for p in page["items"]] == ["P2", "Shared"]
+    assert page["items"][1]["my_role"] == "viewer"
+    assert page["items"][1]["shared_by"] == "other@test.com"
+    assert page["next_cursor"] is not None
+
+    second = await client.get(
+        "/api/projects",
+        params={"limit": 2, "after": page["next_cursor"]},
+        headers=auth_headers,
+    )
+    page = second.json()
+    assert [p["name"] for p in page["items"]] == ["P1", "P0"]
+    assert page["items"][0]["my_role"] == "owner"
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_projects_rejects_invalid_cursor(
+    client: AsyncClient, auth_headers: dict
+) -> None:
+    response = await client.get(
+        "/api/projects", params={"limit": 2, "after": "garbage"}, headers=auth_headers
+    )
+    assert response.status_code == 400
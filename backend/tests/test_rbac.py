@@ -5,6 +5,7 @@ import uuid
 import pytest
 from httpx import AsyncClient
 
+from auth.project_access import role_cache
 from auth.tokens import create_access_token
 
 # --- Shared fixtures ---
@@ -441,3 +442,106 @@ async def test_viewer_cannot_remove_collaborator(
         headers=viewer_headers,
     )
     assert response.status_code == 403
+
+
+# --- Role cache ---
+
+
+@pytest.mark.asyncio
+async def test_repeated_project_reads_use_role_cache(
+    client: AsyncClient,
+    owner_headers: dict,
+    project: dict,
+    viewer_user: dict,
+    viewer_headers: dict,
+    sql_statements: list[str],
+) -> None:
+    """A warm role lookup skips the project/collaborator queries entirely."""
+    await _accept_invitation(
+        client, project["id"], viewer_user["email"], "viewer", owner_headers, viewer_headers
+    )
+    await client.get(f"/api/projects/{project['id']}/songs", headers=viewer_headers)
+    sql_statements.clear()
+
+    response = await client.get(f"/api/projects/{project['id']}/songs", headers=viewer_headers)
+    assert response.status_code == 200
+    assert not any("project_collaborators" in s for s in sql_statements)
+    assert len(sql_statements) == 1
+    assert role_cache.hits >= 1
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_role_cache(
+    client: AsyncClient,
+    owner_headers: dict,
+    project: dict,
+    editor_user: dict,
+    editor_headers: dict,
+) -> None:
+    """Downgrading a collaborator takes effect on their very next request."""
+    collab_id = await _accept_invitation(
+        client, project["id"], editor_user["email"], "editor", owner_headers, editor_headers
+    )
+    create_resp = await client.post(
+        f"/api/projects/{project['id']}/songs", json={"name": "One"}, headers=editor_headers
+    )
+    assert create_resp.status_code == 201
+
+    patch_resp = await client.patch(
+        f"/api/projects/{project['id']}/collaborators/{collab_id}",
+        json={"role": "viewer"},
+        headers=owner_headers,
+    )
+    assert patch_resp.status_code == 200
+
+    response = await client.post(
+        f"/api/projects/{project['id']}/songs", json={"name": "Two"}, headers=editor_headers
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_removal_invalidates_role_cache(
+    client: AsyncClient,
+    owner_headers: dict,
+    project: dict,
+    viewer_user: dict,
+    viewer_headers: dict,
+) -> None:
+    """A removed collaborator loses access immediately."""
+    collab_id = await _accept_invitation(
+        client, project["id"], viewer_user["email"], "viewer", owner_headers, viewer_headers
+    )
+    list_resp = await client.get(f"/api/projects/{project['id']}/songs", headers=viewer_headers)
+    assert list_resp.status_code == 200
+
+    delete_resp = await client.delete(
+        f"/api/projects/{project['id']}/collaborators/{collab_id}", headers=owner_headers
+    )
+    assert delete_resp.status_code == 204
+
+    response = await client.get(f"/api/projects/{project['id']}/songs", headers=viewer_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_project_delete_invalidates_role_cache(
+    client: AsyncClient,
+    owner_headers: dict,
+    project: dict,
+    viewer_user: dict,
+    viewer_headers: dict,
+) -> None:
+    """Deleting a project drops every cached role on it."""
+    await _accept_invitation(
+        client, project["id"], viewer_user["email"], "viewer", owner_headers, viewer_headers
+    )
+    await client.get(f"/api/projects/{project['id']}/songs", headers=viewer_headers)
+    invalidations_before = role_cache.invalidations
+
+    delete_resp = await client.delete(f"/api/projects/{project['id']}", headers=owner_headers)
+    assert delete_resp.status_code == 204
+    assert role_cache.invalidations >= invalidations_before + 2
+
+    response = await client.get(f"/api/projects/{project['id']}/songs", headers=viewer_headers)
+    assert response.status_code == 404
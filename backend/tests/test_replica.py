@@ -0,0 +1,198 @@
+import time
+import uuid
+from collections.abc import AsyncGenerator, Callable
+
+import pytest
+from fastapi import Request
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import database.replica
+from auth.tokens import create_access_token
+from database.replica import (
+    STICKY_COOKIE,
+    ReplicaLagMonitor,
+    ReplicaRouter,
+    ReplicaStickinessMiddleware,
+    get_read_db,
+)
+from main import app
+from models.base import Base
+
+
+class FixedLagMonitor(ReplicaLagMonitor):
+    """Reports ``lag`` instead of asking the replica; raises when ``lag`` is None."""
+
+    def __init__(self, lag: float | None, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(None, interval=60, clock=clock)
+        self.fixed_lag = lag
+        self.measurements = 0
+
+    async def _measure(self) -> float:
+        self.measurements += 1
+        if self.fixed_lag is None:
+            raise ConnectionError("replica unreachable")
+        return self.fixed_lag
+
+
+@pytest.fixture
+async def replica_session() -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """A separate, empty database standing in for a replica that has replayed nothing."""
+    replica_engine = create_async_engine("sqlite+aiosqlite://")
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    await replica_engine.dispose()
+
+
+@pytest.fixture
+def use_replica(
+    monkeypatch: pytest.MonkeyPatch, replica_session: async_sessionmaker[AsyncSession]
+) -> Callable[[float | None], ReplicaRouter]:
+    """Route get_read_db through a ReplicaRouter whose replica reports the given lag."""
+
+    def install(lag: float | None = 0.0) -> ReplicaRouter:
+        router = ReplicaRouter(replica_session, FixedLagMonitor(lag), max_lag=1.0)
+        monkeypatch.setattr(database.replica, "replica_router", router)
+        return router
+
+    return install
+
+
+@pytest.fixture
+async def sticky_client() -> AsyncGenerator[AsyncClient, None]:
+    transport = ASGITransport(app=ReplicaStickinessMiddleware(app))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+async def auth_headers(client: AsyncClient) -> dict[str, str]:
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": "replica@test.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    token = create_access_token(uuid.UUID(response.json()["id"]))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica(
+    client: AsyncClient, auth_headers: dict, use_replica: Callable
+) -> None:
+    router = use_replica(0.0)
+    await client.post("/api/projects", json={"name": "Primary only"}, headers=auth_headers)
+
+    response = await client.get("/api/projects", headers=auth_headers)
+    assert response.status_code == 200
+    # The replica has not seen the project
+    assert response.json() == []
+    assert router.replica_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_own_write(
+    sticky_client: AsyncClient, auth_headers: dict, use_replica: Callable
+) -> None:
+    router = use_replica(0.0)
+    created = await sticky_client.post(
+        "/api/projects", json={"name": "Just written"}, headers=auth_headers
+    )
+    assert STICKY_COOKIE in created.cookies
+
+    response = await sticky_client.get("/api/projects", headers=auth_headers)
+    assert [project["name"] for project in response.json()] == ["Just written"]
+    assert router.sticky_reads == 1
+    assert router.replica_reads == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_stick(sticky_client: AsyncClient, auth_headers: dict) -> None:
+    response = await sticky_client.post("/api/projects", json={"name": ""}, headers=auth_headers)
+    assert response.status_code == 422
+    assert STICKY_COOKIE not in response.cookies
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(
+    client: AsyncClient, auth_headers: dict, use_replica: Callable
+) -> None:
+    router = use_replica(5.0)
+    await client.post("/api/projects", json={"name": "Behind"}, headers=auth_headers)
+
+    response = await client.get("/api/projects", headers=auth_headers)
+    assert [project["name"] for project in response.json()] == ["Behind"]
+    assert router.lagging_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary(
+    client: AsyncClient, auth_headers: dict, use_replica: Callable
+) -> None:
+    router = use_replica(None)
+    response = await client.get("/api/projects", headers=auth_headers)
+    assert response.status_code == 200
+    assert router.lagging_reads == 1
+    assert router.stats()["lag_check_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lag_is_measured_once_per_interval() -> None:
+    now = [0.0]
+    monitor = FixedLagMonitor(0.5, clock=lambda: now[0])
+
+    assert await monitor.lag() == 0.5
+    now[0] = 59.0
+    assert await monitor.lag() == 0.5
+    assert monitor.measurements == 1
+
+    now[0] = 60.0
+    await monitor.lag()
+    assert monitor.measurements == 2
+
+
+@pytest.mark.asyncio
+async def test_access_is_checked_on_the_primary(
+    client: AsyncClient, auth_headers: dict, use_replica: Callable
+) -> None:
+    router = use_replica(0.0)
+    project = await client.post("/api/projects", json={"name": "P"}, headers=auth_headers)
+    song = await client.post(
+        f"/api/projects/{project.json()['id']}/songs", json={"name": "S"}, headers=auth_headers
+    )
+    song_id = song.json()["id"]
+
+    # The replica knows neither the project nor the song, yet access is granted and
+    # only the listing itself is read from the replica.
+    response = await client.get(f"/api/songs/{song_id}/chords", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == []
+    response = await client.get(f"/api/projects/{project.json()['id']}/songs", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == []
+    assert router.replica_reads == 2
+
+    response = await client.get(f"/api/songs/{song_id}", headers=auth_headers)
+    assert response.json()["name"] == "S"
+
+
+async def _read_session(db: AsyncSession) -> AsyncSession:
+    reads = get_read_db(Request({"type": "http", "headers": []}), db)
+    session = await anext(reads)
+    await reads.aclose()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_primary_reads_reuse_the_request_session(
+    db_session: AsyncSession, use_replica: Callable
+) -> None:
+    """Falling back to the primary yields the request's get_db session, not a second one."""
+    assert await _read_session(db_session) is db_session  # no replica configured
+    use_replica(5.0)
+    assert await _read_session(db_session) is db_session
+    use_replica(None)
+    assert await _read_session(db_session) is db_session
+    use_replica(0.0)
+    assert await _read_session(db_session) is not db_session
@@ -1,9 +1,20 @@
+import json
 import uuid
+from datetime import UTC, datetime
+from pathlib import Path
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+import database.sequence_writes
 from auth.tokens import create_access_token
+from database.sequence_reads import load_sequence_document, render_sequence_document
+from models.sequence import Sequence, SequenceMeasure
+from routers.sequence import audio_cache, midi_cache
+from schemas.sequence import SequenceResponse
 
 
 @pytest.fixture
@@ -295,6 +306,111 @@ async def test_update_sequence_replaces_existing_measures(
     assert len(data["measures"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_update_sequence_bulk_inserts_rows(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict, sql_statements: list[str]
+) -> None:
+    """PUT writes all measures in one INSERT and all beats in another, whatever the size."""
+    measures = [
+        {"position": i, "beats": [{"beat_position": b, "chord_id": None} for b in range(1, 5)]}
+        for i in range(50)
+    ]
+    response = await client.put(
+        f"/api/songs/{song['id']}/sequence", json={"measures": measures}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert len(response.json()["measures"]) == 50
+    assert all(len(m["beats"]) == 4 for m in response.json()["measures"])
+
+    inserts = [s for s in sql_statements if s.startswith("INSERT")]
+    assert len(inserts) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_sequence_writes_only_changed_rows(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """PUT diffs against the stored tree and reports how many rows it wrote."""
+    url = f"/api/songs/{song['id']}/sequence"
+    measures = [
+        {"position": i, "beats": [{"beat_position": b, "chord_id": None} for b in range(1, 5)]}
+        for i in range(3)
+    ]
+    first = await client.put(url, json={"measures": measures}, headers=auth_headers)
+    assert first.headers["X-Rows-Written"] == "15"
+
+    unchanged = await client.put(url, json={"measures": measures}, headers=auth_headers)
+    assert unchanged.headers["X-Rows-Written"] == "0"
+    assert unchanged.json()["measures"] == first.json()["measures"]
+
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "G", "markers": [{"string": 0, "fret": 3}]},
+        headers=auth_headers,
+    )
+    measures[0]["beats"][0]["chord_id"] = chord.json()["id"]  # 1 beat updated
+    measures[1]["ending_number"] = 1  # 1 measure updated
+    measures[1]["beats"].pop()  # 1 beat deleted
+    measures.pop(2)  # 1 measure and 4 beats deleted
+    measures.append({"position": 5, "beats": [{"beat_position": 1}]})  # 2 rows inserted
+    response = await client.put(url, json={"measures": measures}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["X-Rows-Written"] == "10"
+
+    data = response.json()["measures"]
+    assert [m["position"] for m in data] == [0, 1, 5]
+    assert data[0]["id"] == first.json()["measures"][0]["id"]
+    assert data[0]["beats"][0]["chord_id"] == chord.json()["id"]
+    assert data[0]["beats"][0]["id"] == first.json()["measures"][0]["beats"][0]["id"]
+    assert data[1]["ending_number"] == 1
+    assert [b["beat_position"] for b in data[1]["beats"]] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_update_sequence_deletes_in_chunks(
+    client: AsyncClient,
+    auth_headers: dict,
+    song: dict,
+    sequence: dict,
+    sql_statements: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Removed rows are deleted a bounded number of ids at a time."""
+    monkeypatch.setattr(database.sequence_writes, "_DELETE_CHUNK_SIZE", 5)
+    url = f"/api/songs/{song['id']}/sequence"
+    measures = [
+        {"position": i, "beats": [{"beat_position": b, "chord_id": None} for b in range(1, 5)]}
+        for i in range(3)
+    ]
+    await client.put(url, json={"measures": measures}, headers=auth_headers)
+    sql_statements.clear()
+
+    response = await client.put(url, json={"measures": []}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["X-Rows-Written"] == "15"
+    assert response.json()["measures"] == []
+    deletes = [s for s in sql_statements if s.startswith("DELETE")]
+    # 12 beats in chunks of 5, then 3 measures
+    assert len(deletes) == 4
+
+
+@pytest.mark.asyncio
+async def test_update_sequence_replace_rewrites_all_rows(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """replace=true deletes and reinserts every row even when nothing changed."""
+    url = f"/api/songs/{song['id']}/sequence"
+    measures = [{"position": 0, "beats": [{"beat_position": 1}, {"beat_position": 2}]}]
+    first = await client.put(url, json={"measures": measures}, headers=auth_headers)
+
+    response = await client.put(
+        url, params={"replace": "true"}, json={"measures": measures}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Rows-Written"] == "6"
+    assert response.json()["measures"][0]["id"] != first.json()["measures"][0]["id"]
+
+
 @pytest.mark.asyncio
 async def test_update_sequence_not_found(
     client: AsyncClient, auth_headers: dict, song: dict
@@ -388,3 +504,652 @@ async def test_delete_sequence_forbidden(
     # Verify it still exists
     get_resp = await client.get(f"/api/songs/{song['id']}/sequence", headers=auth_headers)
     assert get_resp.status_code == 200
+
+
+# --- PATCH sequence ---
+
+
+async def _put_measures(client: AsyncClient, song: dict, headers: dict, count: int) -> None:
+    """Store `count` measures whose ending_number records their original position."""
+    measures = [
+        {"position": i, "ending_number": i, "beats": [{"beat_position": 1, "chord_id": None}]}
+        for i in range(count)
+    ]
+    response = await client.put(
+        f"/api/songs/{song['id']}/sequence", json={"measures": measures}, headers=headers
+    )
+    assert response.status_code == 200
+
+
+async def _patch(client: AsyncClient, song: dict, headers: dict, *ops: dict):
+    return await client.patch(
+        f"/api/songs/{song['id']}/sequence", json={"ops": list(ops)}, headers=headers
+    )
+
+
+@pytest.mark.asyncio
+async def test_patch_sequence_set_and_clear_beat(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """set_beat updates or creates a beat row; clear_beat keeps the row with no chord."""
+    await _put_measures(client, song, auth_headers, 1)
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "G", "markers": [{"string": 0, "fret": 3}]},
+        headers=auth_headers,
+    )
+    chord_id = chord.json()["id"]
+
+    response = await _patch(
+        client,
+        song,
+        auth_headers,
+        {"op": "set_beat", "measure_position": 0, "beat_position": 1, "chord_id": chord_id},
+        {"op": "set_beat", "measure_position": 0, "beat_position": 3, "chord_id": chord_id},
+        {"op": "clear_beat", "measure_position": 0, "beat_position": 1},
+    )
+    assert response.status_code == 200
+    beats = response.json()["measures"][0]["beats"]
+    assert [(b["beat_position"], b["chord_id"]) for b in beats] == [(1, None), (3, chord_id)]
+
+
+@pytest.mark.asyncio
+async def test_patch_sequence_insert_delete_and_move_measures(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Structural ops keep measure positions contiguous."""
+    await _put_measures(client, song, auth_headers, 4)
+
+    response = await _patch(
+        client,
+        song,
+        auth_headers,
+        {"op": "insert_measure", "position": 1, "ending_number": 9, "beats": []},
+        {"op": "delete_measure", "position": 3},
+        {"op": "move_measure", "from_position": 0, "to_position": 3},
+        {"op": "move_measure", "from_position": 2, "to_position": 0},
+    )
+    assert response.status_code == 200
+    measures = response.json()["measures"]
+    assert [m["position"] for m in measures] == [0, 1, 2, 3]
+    # [0,1,2,3] -> insert [0,9,1,2,3] -> delete [0,9,1,3] -> move [9,1,3,0] -> move [3,9,1,0]
+    assert [m["ending_number"] for m in measures] == [3, 9, 1, 0]
+    assert [len(m["beats"]) for m in measures] == [1, 0, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_patch_sequence_rejects_positions_past_the_end(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """insert_measure and move_measure cannot leave a gap after the last measure."""
+    await _put_measures(client, song, auth_headers, 2)
+
+    for op in (
+        {"op": "insert_measure", "position": 3, "beats": []},
+        {"op": "insert_measure", "position": 10**9, "beats": []},
+        {"op": "move_measure", "from_position": 0, "to_position": 2},
+    ):
+        response = await _patch(client, song, auth_headers, op)
+        assert response.status_code == 422, op
+
+    # Counting follows earlier ops in the batch
+    response = await _patch(
+        client,
+        song,
+        auth_headers,
+        {"op": "insert_measure", "position": 2, "beats": []},
+        {"op": "move_measure", "from_position": 0, "to_position": 2},
+    )
+    assert response.status_code == 200
+    assert [m["position"] for m in response.json()["measures"]] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_patch_sequence_repeat_and_ending(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """set_repeat only touches the flags it is given; set_ending can clear the ending."""
+    await _put_measures(client, song, auth_headers, 2)
+
+    response = await _patch(
+        client,
+        song,
+        auth_headers,
+        {"op": "set_repeat", "position": 0, "repeat_start": True},
+        {"op": "set_repeat", "position": 1, "repeat_end": True},
+        {"op": "set_ending", "position": 1, "ending_number": None},
+    )
+    assert response.status_code == 200
+    m0, m1 = response.json()["measures"]
+    assert (m0["repeat_start"], m0["repeat_end"], m0["ending_number"]) == (True, False, 0)
+    assert (m1["repeat_start"], m1["repeat_end"], m1["ending_number"]) == (False, True, None)
+
+
+@pytest.mark.asyncio
+async def test_patch_sequence_missing_measure_rolls_back(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """An op on a missing measure returns 404 and none of the batch is applied."""
+    await _put_measures(client, song, auth_headers, 1)
+
+    response = await _patch(
+        client,
+        song,
+        auth_headers,
+        {"op": "set_repeat", "position": 0, "repeat_start": True},
+        {"op": "delete_measure", "position": 5},
+    )
+    assert response.status_code == 404
+
+    get_resp = await client.get(f"/api/songs/{song['id']}/sequence", headers=auth_headers)
+    assert get_resp.json()["measures"][0]["repeat_start"] is False
+
+
+@pytest.mark.asyncio
+async def test_patch_sequence_forbidden(
+    client: AsyncClient, other_auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Returns 403 when patching another user's song's sequence."""
+    response = await _patch(
+        client, song, other_auth_headers, {"op": "delete_measure", "position": 0}
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_patch_sequence_not_found(
+    client: AsyncClient, auth_headers: dict, song: dict
+) -> None:
+    """Returns 404 when the song has no sequence."""
+    response = await _patch(client, song, auth_headers, {"op": "delete_measure", "position": 0})
+    assert response.status_code == 404
+
+
+# --- Versioning and conditional requests ---
+
+
+@pytest.mark.asyncio
+async def test_sequence_version_increments_on_writes(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Writes that change something bump the version and ETag; no-op saves do not."""
+    url = f"/api/songs/{song['id']}/sequence"
+    assert sequence["version"] == 1
+
+    put = await client.put(url, json={"measures": [{"position": 0}]}, headers=auth_headers)
+    assert put.json()["version"] == 2
+
+    noop = await client.put(url, json={"measures": [{"position": 0}]}, headers=auth_headers)
+    assert noop.json()["version"] == 2
+    assert noop.headers["ETag"] == put.headers["ETag"]
+
+    settings = await client.put(
+        url,
+        json={"time_signature_numerator": 3, "measures": [{"position": 0}]},
+        headers=auth_headers,
+    )
+    assert settings.json()["version"] == 3
+
+    patch = await client.patch(
+        url, json={"ops": [{"op": "delete_measure", "position": 0}]}, headers=auth_headers
+    )
+    assert patch.json()["version"] == 4
+    assert patch.headers["ETag"] != settings.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_if_none_match(
+    client: AsyncClient,
+    auth_headers: dict,
+    song: dict,
+    sequence: dict,
+    sql_statements: list[str],
+) -> None:
+    """A current ETag gets 304 without loading measures; a stale one gets the body."""
+    url = f"/api/songs/{song['id']}/sequence"
+    first = await client.get(url, headers=auth_headers)
+    etag = first.headers["ETag"]
+    sql_statements.clear()
+
+    cached = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+    assert not any("sequence_measure" in s for s in sql_statements)
+
+    await client.put(url, json={"measures": [{"position": 0}]}, headers=auth_headers)
+    fresh = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert len(fresh.json()["measures"]) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bulk", [False, True])
+async def test_deleting_referenced_chord_changes_sequence_etag(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict, bulk: bool
+) -> None:
+    """Deleting a chord clears its beats, so the sequence gets a new ETag."""
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "G", "markers": [{"string": 0, "fret": 3}]},
+        headers=auth_headers,
+    )
+    chord_id = chord.json()["id"]
+    url = f"/api/songs/{song['id']}/sequence"
+    measures = [{"position": 0, "beats": [{"beat_position": 1, "chord_id": chord_id}]}]
+    await client.put(url, json={"measures": measures}, headers=auth_headers)
+    etag = (await client.get(url, headers=auth_headers)).headers["ETag"]
+
+    if bulk:
+        response = await client.post(
+            f"/api/songs/{song['id']}/chords/bulk",
+            json={"ops": [{"op": "delete", "id": chord_id}]},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+    else:
+        response = await client.delete(f"/api/chords/{chord_id}", headers=auth_headers)
+        assert response.status_code == 204
+
+    fresh = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_update_sequence_if_match(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """PUT and PATCH with a stale If-Match are rejected with 412 and change nothing."""
+    url = f"/api/songs/{song['id']}/sequence"
+    etag = (await client.get(url, headers=auth_headers)).headers["ETag"]
+
+    saved = await client.put(
+        url,
+        json={"measures": [{"position": 0}]},
+        headers={**auth_headers, "If-Match": etag},
+    )
+    assert saved.status_code == 200
+
+    stale_put = await client.put(
+        url, json={"measures": []}, headers={**auth_headers, "If-Match": etag}
+    )
+    assert stale_put.status_code == 412
+
+    stale_patch = await client.patch(
+        url,
+        json={"ops": [{"op": "delete_measure", "position": 0}]},
+        headers={**auth_headers, "If-Match": etag},
+    )
+    assert stale_patch.status_code == 412
+
+    current = await client.get(url, headers=auth_headers)
+    assert len(current.json()["measures"]) == 1
+    assert current.headers["ETag"] == saved.headers["ETag"]
+
+
+# --- Serialization ---
+
+
+@pytest.mark.asyncio
+async def test_sequence_document_matches_response_model(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict, db_session: AsyncSession
+) -> None:
+    """The column-level renderer produces exactly what SequenceResponse would."""
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "G", "markers": [{"string": 0, "fret": 3}]},
+        headers=auth_headers,
+    )
+    measures = [
+        {
+            "position": i,
+            "repeat_start": i == 0,
+            "ending_number": 1 if i == 2 else None,
+            "beats": [
+                {"beat_position": b, "chord_id": chord.json()["id"] if b == 1 else None}
+                for b in range(1, 5)
+            ],
+        }
+        for i in range(3)
+    ]
+    await client.put(
+        f"/api/songs/{song['id']}/sequence", json={"measures": measures}, headers=auth_headers
+    )
+
+    song_id = uuid.UUID(song["id"])
+    orm = await db_session.scalar(
+        select(Sequence)
+        .where(Sequence.song_id == song_id)
+        .options(selectinload(Sequence.measures).selectinload(SequenceMeasure.beats))
+    )
+    expected = SequenceResponse.model_validate(orm).model_dump_json()
+    document = await load_sequence_document(db_session, song_id)
+    assert json.loads(render_sequence_document(document)) == json.loads(expected)
+
+
+def test_render_sequence_document_formats_like_pydantic() -> None:
+    """UUIDs and aware datetimes are encoded with the same strings pydantic emits."""
+    document = {
+        "id": uuid.uuid4(),
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=UTC),
+        "updated_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+    }
+    expected = json.loads(
+        SequenceResponse.model_validate(
+            {
+                **document,
+                "song_id": document["id"],
+                "time_signature_numerator": 4,
+                "time_signature_denominator": 4,
+                "measures_per_line": 4,
+                "version": 1,
+                "measures": [],
+            }
+        ).model_dump_json()
+    )
+    rendered = json.loads(render_sequence_document(document))
+    assert rendered == {key: expected[key] for key in document}
+
+
+# --- Playback ---
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_playback(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict, metrics_headers: dict
+) -> None:
+    """Playback unrolls repeats and endings and is cached per sequence version."""
+    url = f"/api/songs/{song['id']}/sequence"
+    measures = [
+        {"position": 0, "repeat_start": True},
+        {"position": 1, "repeat_end": True, "ending_number": 1},
+        {"position": 2, "ending_number": 2},
+    ]
+    await client.put(url, json={"measures": measures}, headers=auth_headers)
+
+    response = await client.get(f"{url}/playback", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["positions"] == [0, 1, 0, 2]
+    assert data["version"] == 2
+
+    await client.get(f"{url}/playback", headers=auth_headers)
+    stats = (await client.get("/api/metrics", headers=metrics_headers)).json()["playback_cache"]
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    await client.patch(
+        url,
+        json={"ops": [{"op": "set_ending", "position": 1, "ending_number": None}]},
+        headers=auth_headers,
+    )
+    response = await client.get(f"{url}/playback", headers=auth_headers)
+    assert response.json()["positions"] == [0, 1, 0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_playback_too_long(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Deeply nested repeats are refused instead of unrolled into billions of measures."""
+    url = f"/api/songs/{song['id']}/sequence"
+    measures = [{"position": p, "repeat_start": True, "beats": []} for p in range(30)] + [
+        {"position": p, "repeat_end": True, "beats": []} for p in range(30, 60)
+    ]
+    response = await client.put(url, json={"measures": measures}, headers=auth_headers)
+    assert response.status_code == 200
+
+    for path in ("/playback", "/timeline", ".mid", ".wav"):
+        response = await client.get(f"{url}{path}", headers=auth_headers)
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_playback_forbidden(
+    client: AsyncClient, other_auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Returns 403 for another user's song."""
+    response = await client.get(
+        f"/api/songs/{song['id']}/sequence/playback", headers=other_auth_headers
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_timeline(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """The timeline lists every played beat with its time and chord."""
+    url = f"/api/songs/{song['id']}/sequence"
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "G", "markers": [{"string": 0, "fret": 3}]},
+        headers=auth_headers,
+    )
+    chord_id = chord.json()["id"]
+    measures = [
+        {"position": 0, "repeat_end": True, "beats": [{"beat_position": 1, "chord_id": chord_id}]},
+        {"position": 1, "beats": [{"beat_position": 2, "chord_id": chord_id}]},
+    ]
+    await client.put(
+        url,
+        json={"time_signature_numerator": 2, "measures": measures},
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        f"{url}/timeline",
+        params={"tempo": 60, "tempo_change": ["1:120"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    beats = data["beats"]
+    assert beats["position"] == [0, 0, 0, 0, 1, 1]
+    assert beats["beat_position"] == [1, 2, 1, 2, 1, 2]
+    assert beats["start"] == [0.0, 1.0, 2.0, 3.0, 4.0, 4.5]
+    assert beats["chord_id"] == [chord_id, None, chord_id, None, None, chord_id]
+    assert data["total_duration"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_timeline_invalid_tempo_change(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Malformed tempo changes are rejected with 400."""
+    for value in ("abc", "1:0", "-1:100", "1"):
+        response = await client.get(
+            f"/api/songs/{song['id']}/sequence/timeline",
+            params={"tempo_change": value},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_timeline_sparse_positions(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Far-apart and negative positions are laid out without sizing arrays by them."""
+    url = f"/api/songs/{song['id']}/sequence"
+    measures = [{"position": -3, "beats": []}, {"position": 2_000_000_000, "beats": []}]
+    response = await client.put(
+        url,
+        json={"time_signature_numerator": 1, "measures": measures},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        f"{url}/timeline",
+        params={"tempo": 60, "tempo_change": ["2000000000:120"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["beats"]["position"] == [-3, 2_000_000_000]
+    assert data["total_duration"] == 1.5
+
+
+@pytest.mark.asyncio
+async def test_get_sequence_timeline_unknown_tempo_change_position(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """A tempo change at a position that is not a measure is rejected with 422."""
+    response = await client.get(
+        f"/api/songs/{song['id']}/sequence/timeline",
+        params={"tempo_change": "100000000000:100"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_sequence_midi(
+    client: AsyncClient,
+    auth_headers: dict,
+    song: dict,
+    sequence: dict,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The MIDI export streams a file once, then serves it from the disk cache."""
+    monkeypatch.setattr(midi_cache, "directory", tmp_path)
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "E5", "markers": [{"string": 5, "fret": 0}, {"string": 4, "fret": 2}]},
+        headers=auth_headers,
+    )
+    beats = [{"beat_position": 1, "chord_id": chord.json()["id"]}]
+    measures = [{"position": 0, "repeat_end": True, "beats": beats}]
+    await client.put(
+        f"/api/songs/{song['id']}/sequence", json={"measures": measures}, headers=auth_headers
+    )
+    url = f"/api/songs/{song['id']}/sequence.mid"
+
+    first = await client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "audio/midi"
+    assert first.content.startswith(b"MThd")
+    # Two note-ons (E2, B2) for each of the two passes.
+    assert first.content.count(bytes([0x90, 40])) == 2
+    assert first.content.count(bytes([0x90, 47])) == 2
+    hits = midi_cache.hits
+
+    second = await client.get(url, headers=auth_headers)
+    assert second.content == first.content
+    assert midi_cache.hits == hits + 1
+
+    await client.put(
+        f"/api/chords/{chord.json()['id']}",
+        json={"markers": [{"string": 5, "fret": 3}]},
+        headers=auth_headers,
+    )
+    revoiced = await client.get(url, headers=auth_headers)
+    assert revoiced.content.count(bytes([0x90, 43])) == 2
+    assert len(list(tmp_path.glob("*.mid"))) == 2
+
+
+@pytest.mark.asyncio
+async def test_export_sequence_midi_rejects_pitches_out_of_range(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """A chord sounding above MIDI's highest note is rejected before streaming starts."""
+    # Nine strings tuned an octave apart put the open top string at pitch 132.
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={
+            "name": "X",
+            "markers": [{"string": 0, "fret": 0}],
+            "string_count": 9,
+            "tuning": "CCCCCCCCC",
+        },
+        headers=auth_headers,
+    )
+    beats = [{"beat_position": 1, "chord_id": chord.json()["id"]}]
+    await client.put(
+        f"/api/songs/{song['id']}/sequence",
+        json={"measures": [{"position": 0, "beats": beats}]},
+        headers=auth_headers,
+    )
+
+    response = await client.get(f"/api/songs/{song['id']}/sequence.mid", headers=auth_headers)
+    assert response.status_code == 422
+    assert "outside the MIDI range" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_export_sequence_midi_rejects_tempos_too_slow_for_midi(
+    client: AsyncClient, auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """A tempo the 3-byte MIDI tempo event cannot hold is rejected before streaming."""
+    await client.put(
+        f"/api/songs/{song['id']}/sequence",
+        json={"measures": [{"position": 0, "beats": []}]},
+        headers=auth_headers,
+    )
+    response = await client.get(
+        f"/api/songs/{song['id']}/sequence.mid", params={"tempo": 2}, headers=auth_headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_sequence_midi_forbidden(
+    client: AsyncClient, other_auth_headers: dict, song: dict, sequence: dict
+) -> None:
+    """Returns 403 for another user's song."""
+    response = await client.get(f"/api/songs/{song['id']}/sequence.mid", headers=other_auth_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_export_sequence_audio(
+    client: AsyncClient,
+    auth_headers: dict,
+    song: dict,
+    sequence: dict,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """WAV and raw PCM renders share samples and are cached per render parameters."""
+    monkeypatch.setattr(audio_cache, "directory", tmp_path)
+    chord = await client.post(
+        f"/api/songs/{song['id']}/chords",
+        json={"name": "E5", "markers": [{"string": 5, "fret": 0}, {"string": 4, "fret": 2}]},
+        headers=auth_headers,
+    )
+    beats = [{"beat_position": 1, "chord_id": chord.json()["id"]}]
+    await client.put(
+        f"/api/songs/{song['id']}/sequence",
+        json={"measures": [{"position": 0, "beats": beats}]},
+        headers=auth_headers,
+    )
+    url = f"/api/songs/{song['id']}/sequence"
+    params = {"tempo": 240, "sample_rate": 8000}
+
+    wav = await client.get(f"{url}.wav", params=params, headers=auth_headers)
+    assert wav.status_code == 200
+    assert wav.headers["content-type"] == "audio/wav"
+    assert wav.content[:4] == b"RIFF"
+    # One 4/4 measure at 240 bpm is one second.
+    assert len(wav.content) == 44 + 2 * 8000
+
+    pcm = await client.get(f"{url}.pcm", params=params, headers=auth_headers)
+    assert pcm.content == wav.content[44:]
+
+    hits = audio_cache.hits
+    again = await client.get(f"{url}.wav", params=params, headers=auth_headers)
+    assert again.content == wav.content
+    assert audio_cache.hits == hits + 1
+
+    slower = await client.get(f"{url}.wav", params={**params, "tempo": 120}, headers=auth_headers)
+    assert len(slower.content) == 44 + 2 * 16000
+
+    # At 0.001 bpm the four beats would last 67 hours.
+    for container in ("wav", "pcm"):
+        response = await client.get(
+            f"{url}.{container}", params={**params, "tempo": 0.001}, headers=auth_headers
+        )
+        assert response.status_code == 422
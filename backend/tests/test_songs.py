@@ -1,9 +1,13 @@
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.tokens import create_access_token
+from models.song import Song
 
 
 @pytest.fixture
@@ -93,6 +97,40 @@ async def test_list_songs_returns_project_songs(
     assert names == {"Song A", "Song B"}
 
 
+@pytest.mark.asyncio
+async def test_list_songs_paginates_by_updated_at(
+    client: AsyncClient, auth_headers: dict, project: dict, db_session: AsyncSession
+) -> None:
+    """With a limit, songs come back in keyset pages, most recently updated first."""
+    ids = []
+    for name in ["S0", "S1", "S2"]:
+        resp = await client.post(
+            f"/api/projects/{project['id']}/songs", json={"name": name}, headers=auth_headers
+        )
+        ids.append(resp.json()["id"])
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    for offset, song_id in enumerate(ids):
+        await db_session.execute(
+            update(Song)
+            .where(Song.id == uuid.UUID(song_id))
+            .values(updated_at=base + timedelta(minutes=offset))
+        )
+    await db_session.commit()
+
+    url = f"/api/projects/{project['id']}/songs"
+    first = (await client.get(url, params={"limit": 2}, headers=auth_headers)).json()
+    assert [s["name"] for s in first["items"]] == ["S2", "S1"]
+    assert first["next_cursor"]
+
+    second = (
+        await client.get(
+            url, params={"limit": 2, "after": first["next_cursor"]}, headers=auth_headers
+        )
+    ).json()
+    assert [s["name"] for s in second["items"]] == ["S0"]
+    assert second["next_cursor"] is None
+
+
 @pytest.mark.asyncio
 async def test_list_songs_validates_project_ownership(
     client: AsyncClient, other_auth_headers: dict, project: dict
@@ -233,6 +271,30 @@ async def test_update_song(client: AsyncClient, auth_headers: dict, project: dic
     assert response.json()["name"] == "New Name"
 
 
+@pytest.mark.asyncio
+async def test_song_writes_return_timestamps_without_refresh(
+    client: AsyncClient, auth_headers: dict, project: dict, sql_statements: list[str]
+) -> None:
+    """Create and update read created_at/updated_at back through RETURNING, not a SELECT."""
+    sql_statements.clear()
+    create_resp = await client.post(
+        f"/api/projects/{project['id']}/songs", json={"name": "Old Name"}, headers=auth_headers
+    )
+    assert create_resp.status_code == 201
+    assert create_resp.json()["created_at"]
+    assert sql_statements[-1].startswith("INSERT INTO songs")
+    assert "RETURNING" in sql_statements[-1]
+
+    sql_statements.clear()
+    response = await client.put(
+        f"/api/songs/{create_resp.json()['id']}", json={"name": "New Name"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["updated_at"]
+    assert sql_statements[-1].startswith("UPDATE songs")
+    assert "RETURNING" in sql_statements[-1]
+
+
 @pytest.mark.asyncio
 async def test_update_song_not_found(client: AsyncClient, auth_headers: dict) -> None:
     """Returns 404 for non-existent song."""
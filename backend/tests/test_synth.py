@@ -0,0 +1,72 @@
+import struct
+
+import numpy as np
+import pytest
+
+import music.synth
+from music.synth import pcm_chunks, pluck, sample_count, wav_chunks
+from music.timeline import build_timeline, chord_grid_from_beats
+
+SAMPLE_RATE = 8000
+
+
+def _timeline(measures: int, chords: dict[int, int]):
+    grid = chord_grid_from_beats(
+        np.array(list(chords), dtype=np.int64),
+        np.ones(len(chords), dtype=np.int64),
+        np.array(list(chords.values()), dtype=np.int64),
+        measure_count=measures,
+        numerator=4,
+    )
+    return build_timeline(np.arange(measures), grid, 4, 120)
+
+
+def test_pluck_is_reproducible_and_decays() -> None:
+    first = pluck(45, SAMPLE_RATE, SAMPLE_RATE)
+    assert np.array_equal(first, pluck(45, SAMPLE_RATE, SAMPLE_RATE))
+    assert len(first) == SAMPLE_RATE
+    early, late = np.abs(first[:800]).mean(), np.abs(first[-800:]).mean()
+    assert late < early / 2
+
+
+def test_wav_header_matches_streamed_samples() -> None:
+    timeline = _timeline(3, {1: 0})
+    data = b"".join(wav_chunks(timeline, [(40, 47, 52)], SAMPLE_RATE))
+
+    assert data[:4] == b"RIFF" and data[8:16] == b"WAVEfmt "
+    (riff_size,) = struct.unpack("<I", data[4:8])
+    (data_size,) = struct.unpack("<I", data[40:44])
+    assert riff_size == len(data) - 8
+    assert data_size == len(data) - 44 == 2 * sample_count(timeline, SAMPLE_RATE)
+
+
+def test_pcm_is_silent_until_the_first_chord() -> None:
+    timeline = _timeline(2, {1: 0})
+    samples = np.frombuffer(b"".join(pcm_chunks(timeline, [(52,)], SAMPLE_RATE)), "<i2")
+
+    first_chord = round(timeline.start[4] * SAMPLE_RATE)
+    assert not samples[:first_chord].any()
+    assert samples[first_chord:].any()
+
+
+def test_chunks_stay_bounded_for_long_songs() -> None:
+    timeline = _timeline(400, {0: 0, 200: 1})
+    chunks = list(pcm_chunks(timeline, [(40,), (45,)], SAMPLE_RATE))
+    assert max(map(len, chunks)) <= 2 * 16384
+    assert sum(map(len, chunks)) == 2 * sample_count(timeline, SAMPLE_RATE)
+
+
+def test_evicted_strums_render_the_same(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Three chords taking turns, so a one-strum cache re-synthesizes on every change.
+    timeline = _timeline(9, {measure: measure % 3 for measure in range(9)})
+    pitches = [(40,), (45,), (50,)]
+    expected = b"".join(pcm_chunks(timeline, pitches, SAMPLE_RATE))
+
+    synthesized = []
+    strum = music.synth.strum
+    monkeypatch.setattr(music.synth, "_STRUM_CACHE_SIZE", 1)
+    monkeypatch.setattr(
+        music.synth, "strum", lambda chord, rate: synthesized.append(chord) or strum(chord, rate)
+    )
+    assert b"".join(pcm_chunks(timeline, pitches, SAMPLE_RATE)) == expected
+    assert len(synthesized) == 9
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from music.timeline import NO_CHORD, build_timeline, chord_grid_from_beats
+
+
+def grid(measures: int, numerator: int, chords: dict[tuple[int, int], int]) -> np.ndarray:
+    keys = list(chords)
+    return chord_grid_from_beats(
+        np.array([position for position, _ in keys], dtype=np.int64),
+        np.array([beat for _, beat in keys], dtype=np.int64),
+        np.array(list(chords.values()), dtype=np.int64),
+        measure_count=measures,
+        numerator=numerator,
+    )
+
+
+def test_beats_are_laid_out_at_constant_tempo() -> None:
+    timeline = build_timeline(np.array([0, 1]), grid(2, 4, {(0, 1): 0, (1, 3): 1}), 4, 120)
+    assert timeline.start.tolist() == [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5]
+    assert timeline.duration.tolist() == [0.5] * 8
+    assert timeline.beat_position.tolist() == [1, 2, 3, 4] * 2
+    assert timeline.chord.tolist() == [0, -1, -1, -1, -1, -1, 1, -1]
+    assert timeline.total_duration == 4.0
+
+
+def test_denominator_scales_beat_length() -> None:
+    timeline = build_timeline(np.array([0]), grid(1, 6, {}), 8, 120)
+    assert timeline.duration.tolist() == [0.25] * 6
+
+
+def test_tempo_changes_follow_playback_order() -> None:
+    # Playback 0 1 0 2 with a change at position 1: the repeat of 0 keeps the new tempo.
+    timeline = build_timeline(np.array([0, 1, 0, 2]), grid(3, 1, {}), 4, 60, {1: 120, 2: 30})
+    assert timeline.duration.tolist() == [1.0, 0.5, 0.5, 2.0]
+    assert timeline.start.tolist() == [0.0, 1.0, 1.5, 2.0]
+    assert timeline.measure_index.tolist() == [0, 1, 2, 3]
+    assert timeline.position.tolist() == [0, 1, 0, 2]
+
+
+def test_beats_beyond_numerator_are_dropped() -> None:
+    chord_grid = grid(1, 3, {(0, 4): 7, (0, 3): 2})
+    assert chord_grid.tolist() == [[NO_CHORD, NO_CHORD, 2]]
+
+
+def test_empty_sequence() -> None:
+    timeline = build_timeline(np.array([], dtype=np.int64), grid(0, 4, {}), 4, 120)
+    assert len(timeline.start) == 0
+    assert timeline.total_duration == 0.0
+
+
+def test_long_song_is_vectorized() -> None:
+    order = np.tile(np.arange(1000), 10)
+    timeline = build_timeline(order, grid(1000, 4, {}), 4, 120, {500: 60})
+    assert len(timeline.start) == 40_000
+    # 120 bpm until the first change, then 60 bpm for the rest of the song.
+    assert timeline.total_duration == pytest.approx(500 * 2.0 + 9_500 * 4.0)
+
+
+def test_positions_label_compact_indexes() -> None:
+    timeline = build_timeline(
+        np.array([1, 0]), grid(2, 1, {}), 4, 120, positions=np.array([-5, 10**12])
+    )
+    assert timeline.position.tolist() == [10**12, -5]
+
+
+def test_tempo_change_outside_the_grid_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        build_timeline(np.array([0]), grid(1, 4, {}), 4, 120, {10**11: 60})
@@ -0,0 +1,180 @@
+import uuid
+
+import jwt
+import pytest
+from httpx import AsyncClient
+
+from auth.project_access import role_cache
+from auth.tokens import ALGORITHM, SECRET_KEY, create_access_token
+from models.collaborator import ProjectRole
+
+
+@pytest.fixture
+async def owner(client: AsyncClient) -> dict:
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": "claims_owner@test.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+async def owner_headers(owner: dict) -> dict[str, str]:
+    token = create_access_token(uuid.UUID(owner["id"]))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def editor(client: AsyncClient) -> dict:
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": "claims_editor@test.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+async def editor_headers(editor: dict) -> dict[str, str]:
+    token = create_access_token(uuid.UUID(editor["id"]))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def project(client: AsyncClient, owner_headers: dict) -> dict:
+    response = await client.post(
+        "/api/projects", json={"name": "Claims Project"}, headers=owner_headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+async def collab_id(
+    client: AsyncClient, owner_headers: dict, editor: dict, editor_headers: dict, project: dict
+) -> str:
+    invite_resp = await client.post(
+        f"/api/projects/{project['id']}/collaborators",
+        json={"identifier": editor["email"], "role": "editor"},
+        headers=owner_headers,
+    )
+    assert invite_resp.status_code == 201
+    patch_resp = await client.patch(
+        f"/api/collaborators/{invite_resp.json()['id']}",
+        json={"status": "accepted"},
+        headers=editor_headers,
+    )
+    assert patch_resp.status_code == 200
+    return invite_resp.json()["id"]
+
+
+async def _login(client: AsyncClient, email: str) -> dict[str, str]:
+    response = await client.post(
+        "/api/auth/login", json={"email": email, "password": "password123"}
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_login_embeds_project_roles_when_enabled(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    editor: dict,
+    project: dict,
+    collab_id: str,
+) -> None:
+    monkeypatch.setattr("routers.auth.ACCESS_TOKEN_ROLE_CLAIMS", True)
+    headers = await _login(client, editor["email"])
+
+    payload = jwt.decode(
+        headers["Authorization"].removeprefix("Bearer "), SECRET_KEY, algorithms=[ALGORITHM]
+    )
+    assert payload["prj"] == {uuid.UUID(project["id"]).hex: "e"}
+    assert payload["mv"] == 1
+
+
+@pytest.mark.asyncio
+async def test_login_omits_project_roles_by_default(
+    client: AsyncClient, editor: dict, project: dict, collab_id: str
+) -> None:
+    headers = await _login(client, editor["email"])
+    payload = jwt.decode(
+        headers["Authorization"].removeprefix("Bearer "), SECRET_KEY, algorithms=[ALGORITHM]
+    )
+    assert "prj" not in payload
+    assert "mv" not in payload
+
+
+@pytest.mark.asyncio
+async def test_role_claims_authorize_without_permission_queries(
+    client: AsyncClient,
+    editor: dict,
+    project: dict,
+    collab_id: str,
+    sql_statements: list[str],
+) -> None:
+    token = create_access_token(
+        uuid.UUID(editor["id"]), {uuid.UUID(project["id"]): ProjectRole.editor}, 1
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.get("/api/auth/me", headers=headers)
+    role_cache.clear()
+    sql_statements.clear()
+
+    response = await client.get(f"/api/projects/{project['id']}/songs", headers=headers)
+    assert response.status_code == 200
+    assert not any("project_collaborators" in s for s in sql_statements)
+    assert role_cache.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_role_claims_fall_back_to_database(
+    client: AsyncClient,
+    owner_headers: dict,
+    editor: dict,
+    project: dict,
+    collab_id: str,
+) -> None:
+    token = create_access_token(
+        uuid.UUID(editor["id"]), {uuid.UUID(project["id"]): ProjectRole.editor}, 1
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    patch_resp = await client.patch(
+        f"/api/projects/{project['id']}/collaborators/{collab_id}",
+        json={"role": "viewer"},
+        headers=owner_headers,
+    )
+    assert patch_resp.status_code == 200
+
+    response = await client.post(
+        f"/api/projects/{project['id']}/songs", json={"name": "Nope"}, headers=headers
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_refresh_reissues_current_role_claims(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    owner_headers: dict,
+    editor: dict,
+    project: dict,
+    collab_id: str,
+) -> None:
+    monkeypatch.setattr("routers.auth.ACCESS_TOKEN_ROLE_CLAIMS", True)
+    login_resp = await client.post(
+        "/api/auth/login", json={"email": editor["email"], "password": "password123"}
+    )
+    await client.delete(
+        f"/api/projects/{project['id']}/collaborators/{collab_id}", headers=owner_headers
+    )
+
+    response = await client.post(
+        "/api/auth/refresh", json={"refresh_token": login_resp.json()["refresh_token"]}
+    )
+    payload = jwt.decode(response.json()["access_token"], SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["prj"] == {}
+    assert payload["mv"] == 2
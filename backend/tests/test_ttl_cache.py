@@ -0,0 +1,58 @@
+from cache.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_returns_stored_value_and_counts_hits() -> None:
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_invalidate_removes_entry() -> None:
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    assert cache.invalidate("a") is True
+    assert cache.invalidate("a") is False
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_invalidate_where_removes_matching_entries() -> None:
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set(("u1", "p1"), "owner")
+    cache.set(("u2", "p1"), "viewer")
+    cache.set(("u1", "p2"), "editor")
+    assert cache.invalidate_where(lambda key: key[1] == "p1") == 2
+    assert cache.get(("u1", "p2")) == "editor"
+    assert len(cache) == 1
@@ -0,0 +1,82 @@
+import pytest
+
+from music.recognition import identify_voicing
+from music.voicings import MAX_FINGERS, MAX_STRETCH, generate_voicings, parse_symbol
+
+
+def test_parse_symbol() -> None:
+    root, spellings, bass = parse_symbol("Am7/G")
+    assert (root, bass) == (9, 7)
+    assert spellings[0] == (0, 3, 7, 10)
+    assert parse_symbol("C6/9")[1] == [(0, 2, 4, 7, 9)]
+    assert parse_symbol("Bb")[0] == 10
+
+
+@pytest.mark.parametrize("symbol", ["", "H", "Cxyz", "C/H", "am"])
+def test_parse_symbol_rejects_unknown(symbol: str) -> None:
+    with pytest.raises(ValueError):
+        parse_symbol(symbol)
+
+
+def test_standard_tuning_open_shapes_rank_near_the_top() -> None:
+    a_major = [voicing.frets for voicing in generate_voicings("A", "EADGBE", 6)]
+    assert a_major[0] == (None, 0, 2, 2, 2, 0)
+    c_major = [voicing.frets for voicing in generate_voicings("C", "EADGBE", 6)[:5]]
+    assert (None, 3, 2, 0, 1, 0) in c_major
+
+
+@pytest.mark.parametrize(
+    ("symbol", "tuning", "string_count"),
+    [
+        ("G", "EADGBE", 6),
+        ("Cmaj7", "EADGBE", 6),
+        ("C/E", "EADGBE", 6),
+        ("D", "DADGBE", 6),
+        ("E", "BEADGBE", 7),
+        ("C13", "F#BEADGBE", 8),
+    ],
+)
+def test_every_voicing_is_playable_and_names_back(
+    symbol: str, tuning: str, string_count: int
+) -> None:
+    voicings = generate_voicings(symbol, tuning, string_count)
+    assert voicings
+    for voicing in voicings:
+        assert len(voicing.frets) == string_count
+        assert voicing.stretch <= MAX_STRETCH
+        assert voicing.fingers <= MAX_FINGERS
+        identity = identify_voicing(voicing.markers, tuning, string_count)
+        assert identity is not None
+        assert identity.symbol == symbol
+    ranks = [(voicing.stretch, voicing.fingers) for voicing in voicings]
+    assert ranks == sorted(ranks)
+
+
+def test_fret_window() -> None:
+    for voicing in generate_voicings("F", "EADGBE", 6, 5, 9):
+        assert all(fret == 0 or 5 <= fret <= 9 for fret in voicing.frets if fret is not None)
+
+
+def test_markers_and_starting_fret() -> None:
+    voicing = generate_voicings("A", "EADGBE", 6)[0]
+    assert voicing.markers == [
+        {"string": 4, "fret": 0},
+        {"string": 3, "fret": 2},
+        {"string": 2, "fret": 2},
+        {"string": 1, "fret": 2},
+        {"string": 0, "fret": 0},
+    ]
+    assert voicing.starting_fret == 0
+    high = next(v for v in generate_voicings("A", "EADGBE", 6, 9, 14) if 0 not in v.frets)
+    assert high.starting_fret == min(fret for fret in high.frets if fret) - 1
+
+
+def test_results_are_memoized() -> None:
+    assert generate_voicings("Dm", "EADGBE", 6) is generate_voicings("Dm", "EADGBE", 6)
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        generate_voicings("A", "EAD", 6)
+    with pytest.raises(ValueError):
+        generate_voicings("A", "EADGBE", 6, 9, 5)
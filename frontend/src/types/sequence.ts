@@ -36,6 +36,7 @@ export interface SequenceApiResponse {
   time_signature_numerator: number
   time_signature_denominator: number
   measures_per_line: number
+  version: number
   created_at: string
   updated_at: string
   measures: SequenceMeasureApiResponse[]